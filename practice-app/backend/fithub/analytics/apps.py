@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'analytics'
+
+    # Import and register the signals when the app is ready
+    def ready(self):
+        import analytics.signals  # Keeps the system counters and daily rollups up to date
@@ -0,0 +1,32 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.metrics import backfill_daily, last_backfilled_date, reset_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuilds the daily analytics rollups from created_at/deleted_on and recounts the '
+        'system counters. By default only days from the last rolled-up day on are recomputed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day to recompute (YYYY-MM-DD)')
+        parser.add_argument('--full', action='store_true', help='Recompute every day')
+
+    def handle(self, *args, **options):
+        if options['full']:
+            since = None
+        elif options['since']:
+            try:
+                since = datetime.date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+        else:
+            since = last_backfilled_date()
+
+        rows = backfill_daily(since)
+        reset_counters()
+        start = since.isoformat() if since else 'the beginning'
+        self.stdout.write(self.style.SUCCESS(f'Wrote {rows} daily rollups from {start} and reset the counters'))
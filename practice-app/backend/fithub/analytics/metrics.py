@@ -0,0 +1,141 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from forum.models import ForumPost, ForumPostComment, ForumPostCommentVote, ForumPostVote
+from ingredients.models import Ingredient
+from qa.models import AnswerVote, QuestionVote
+from recipes.models import Recipe
+
+from .models import DailyRollup, SystemCounter
+
+# Metric name -> models whose rows it counts
+SOURCES = {
+    'users': (get_user_model(),),
+    'recipes': (Recipe,),
+    'ingredients': (Ingredient,),
+    'posts': (ForumPost,),
+    'comments': (ForumPostComment,),
+    'votes': (ForumPostVote, ForumPostCommentVote, QuestionVote, AnswerVote),
+}
+
+# Metrics with a live total in SystemCounter
+COUNTERS = ('users', 'recipes', 'ingredients', 'posts', 'comments')
+
+# Metrics with new_<name>/removed_<name> rows in DailyRollup, plus post views
+DAILY = ('users', 'recipes', 'posts', 'comments', 'votes')
+VIEWS = 'views'
+
+METRIC_BY_MODEL = {model: name for name, models in SOURCES.items() for model in models}
+
+
+def live_count(name):
+    return sum(
+        model.objects.filter(deleted_on__isnull=True).count()
+        for model in SOURCES[name]
+    )
+
+
+def read_counters():
+    """All system counters; a missing counter is seeded from a full count once"""
+    values = dict(SystemCounter.objects.filter(name__in=COUNTERS).values_list('name', 'value'))
+    for name in COUNTERS:
+        if name not in values:
+            counter, _ = SystemCounter.objects.get_or_create(name=name, defaults={'value': live_count(name)})
+            values[name] = counter.value
+    return values
+
+
+def adjust_counter(name, delta):
+    if name not in COUNTERS or not delta:
+        return
+    if not SystemCounter.objects.filter(name=name).update(value=F('value') + delta):
+        # First change since the table was emptied: the full count already includes it
+        SystemCounter.objects.get_or_create(name=name, defaults={'value': live_count(name)})
+
+
+def bump_daily(metric, delta=1, day=None):
+    day = day or timezone.localdate()
+    rollups = DailyRollup.objects.filter(date=day, metric=metric)
+    if rollups.update(value=F('value') + delta):
+        return
+    _, created = DailyRollup.objects.get_or_create(date=day, metric=metric, defaults={'value': delta})
+    if not created:
+        # Another request created the row in the meantime
+        rollups.update(value=F('value') + delta)
+
+
+def record_created(name, count=1):
+    adjust_counter(name, count)
+    if name in DAILY:
+        bump_daily(f'new_{name}', count)
+
+
+def record_removed(name, count=1):
+    adjust_counter(name, -count)
+    if name in DAILY:
+        bump_daily(f'removed_{name}', count)
+
+
+def record_restored(name, count=1):
+    # The removal stays in the day it happened, only the live total changes
+    adjust_counter(name, count)
+
+
+def record_view():
+    bump_daily(VIEWS)
+
+
+def _daily_metrics():
+    return [f'{prefix}_{name}' for name in DAILY for prefix in ('new', 'removed')]
+
+
+def last_backfilled_date():
+    return (
+        DailyRollup.objects.filter(metric__in=_daily_metrics())
+        .order_by('-date').values_list('date', flat=True).first()
+    )
+
+
+def backfill_daily(since=None):
+    """
+    Recompute the new_*/removed_* rollups from created_at and deleted_on, for
+    every day from `since` on (all days when None). View rollups have no
+    history to rebuild from and are left alone. Returns the rows written.
+    """
+    values = {}
+    for name in DAILY:
+        for model in SOURCES[name]:
+            for field, prefix in (('created_at', 'new'), ('deleted_on', 'removed')):
+                rows = model.objects.filter(**{f'{field}__isnull': False})
+                if since is not None:
+                    rows = rows.filter(**{f'{field}__date__gte': since})
+                per_day = (
+                    rows.order_by()
+                    .annotate(day=TruncDate(field))
+                    .values('day')
+                    .annotate(total=Count('pk'))
+                    .values_list('day', 'total')
+                )
+                for day, total in per_day:
+                    key = (f'{prefix}_{name}', day)
+                    values[key] = values.get(key, 0) + total
+
+    stale = DailyRollup.objects.filter(metric__in=_daily_metrics())
+    if since is not None:
+        stale = stale.filter(date__gte=since)
+    with transaction.atomic():
+        stale.delete()
+        DailyRollup.objects.bulk_create(
+            [DailyRollup(metric=metric, date=day, value=value) for (metric, day), value in values.items()],
+            batch_size=500,
+        )
+    return len(values)
+
+
+def reset_counters():
+    """Recount every system counter from the tables"""
+    for name in COUNTERS:
+        SystemCounter.objects.update_or_create(name=name, defaults={'value': live_count(name)})
@@ -1,3 +1,30 @@
 from django.db import models
 
-# Create your models here.
+
+class SystemCounter(models.Model):
+    """
+    Running total of live (not soft-deleted) rows of a tracked model.
+    Maintained by analytics.signals, rebuilt by the backfill_analytics command.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class DailyRollup(models.Model):
+    """Value of one metric (e.g. new_recipes, views) for one day"""
+    date = models.DateField()
+    metric = models.CharField(max_length=50)
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'date'], name='unique_daily_rollup')
+        ]
+        ordering = ['date']
+
+    def __str__(self):
+        return f"{self.metric} on {self.date}: {self.value}"
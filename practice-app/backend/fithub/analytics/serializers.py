@@ -6,3 +6,10 @@ class AnalyticsSerializer(serializers.Serializer):
     ingredients_count = serializers.IntegerField()
     posts_count = serializers.IntegerField()
     comments_count = serializers.IntegerField()
+    # Only present when a range is requested
+    range = serializers.CharField(required=False)
+    series = serializers.DictField(
+        child=serializers.ListField(child=serializers.DictField()),
+        required=False,
+        help_text="Per-metric list of {date, value} points, one per day of the range"
+    )
@@ -0,0 +1,47 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from utils.cascade import rows_restored, rows_soft_deleted
+
+from .metrics import METRIC_BY_MODEL, record_created, record_removed, record_restored
+
+
+def track_save(sender, instance, created, update_fields=None, **kwargs):
+    name = METRIC_BY_MODEL[sender]
+    if created:
+        if instance.deleted_on is None:
+            record_created(name)
+        return
+    if update_fields is not None and 'deleted_on' not in update_fields:
+        return
+    # Soft delete or restore of an instance loaded from the database
+    if not instance.has_loaded_value('deleted_on'):
+        return
+    was_live = instance.get_loaded_value('deleted_on') is None
+    is_live = instance.deleted_on is None
+    if was_live and not is_live:
+        record_removed(name)
+    elif is_live and not was_live:
+        record_restored(name)
+
+
+def track_delete(sender, instance, **kwargs):
+    if instance.deleted_on is None:
+        record_removed(METRIC_BY_MODEL[sender])
+
+
+for model in METRIC_BY_MODEL:
+    post_save.connect(track_save, sender=model, dispatch_uid=f'analytics_save_{model._meta.label}')
+    post_delete.connect(track_delete, sender=model, dispatch_uid=f'analytics_delete_{model._meta.label}')
+
+
+@receiver(rows_soft_deleted)
+def track_bulk_soft_delete(sender, count, **kwargs):
+    if sender in METRIC_BY_MODEL:
+        record_removed(METRIC_BY_MODEL[sender], count)
+
+
+@receiver(rows_restored)
+def track_bulk_restore(sender, count, **kwargs):
+    if sender in METRIC_BY_MODEL:
+        record_restored(METRIC_BY_MODEL[sender], count)
@@ -1,10 +1,19 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
 from recipes.models import Recipe
 from ingredients.models import Ingredient
 from forum.models import ForumPost, ForumPostComment
+from analytics.metrics import read_counters
+from analytics.models import DailyRollup, SystemCounter
 
 User = get_user_model()
 
@@ -55,3 +64,63 @@ class AnalyticsViewTest(TestCase):
         self.assertEqual(response.data['ingredients_count'], 3)
         self.assertEqual(response.data['posts_count'], 2)
         self.assertEqual(response.data['comments_count'], 3)
+
+
+class AnalyticsCounterTest(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='counter', password='password')
+        self.post = ForumPost.objects.create(title='Post', author=self.user)
+
+    def test_endpoint_reads_counters_without_counting(self):
+        self.client.get('/analytics/analytics/')  # seeds any missing counter
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/analytics/analytics/')
+        self.assertEqual(response.data['posts_count'], 1)
+        self.assertFalse([q for q in ctx.captured_queries if 'COUNT(' in q['sql']])
+
+    def test_counters_follow_creates_and_soft_deletes(self):
+        comment = ForumPostComment.objects.create(content='Comment', author=self.user, post=self.post)
+        ForumPostComment.objects.create(content='Reply', author=self.user, post=self.post, parent_comment=comment)
+        self.assertEqual(read_counters()['comments'], 2)
+
+        self.post.delete()
+        counters = read_counters()
+        self.assertEqual((counters['posts'], counters['comments']), (0, 0))
+
+        self.post.restore()
+        counters = read_counters()
+        self.assertEqual((counters['posts'], counters['comments']), (1, 2))
+
+    def test_range_returns_daily_series(self):
+        today = timezone.localdate()
+        ForumPostComment.objects.create(content='Comment', author=self.user, post=self.post)
+        self.client.get(f'/forum/posts/{self.post.id}/')
+
+        response = self.client.get('/analytics/analytics/', {'range': '7d'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['range'], '7d')
+        posts = response.data['series']['new_posts']
+        self.assertEqual(len(posts), 7)
+        self.assertEqual(posts[-1], {'date': today.isoformat(), 'value': 1})
+        self.assertEqual(response.data['series']['new_comments'][-1]['value'], 1)
+        self.assertEqual(response.data['series']['views'][-1]['value'], 1)
+
+    def test_invalid_range(self):
+        for value in ('abc', '0d', '1000d'):
+            response = self.client.get('/analytics/analytics/', {'range': value})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_backfill_rebuilds_rollups_and_counters(self):
+        yesterday = timezone.now() - datetime.timedelta(days=1)
+        Recipe.objects.create(name='Old', creator=self.user, prep_time=1, cook_time=1, meal_type='lunch')
+        Recipe.objects.update(created_at=yesterday)
+        DailyRollup.objects.all().delete()
+        SystemCounter.objects.all().delete()
+
+        call_command('backfill_analytics', '--full', stdout=StringIO())
+
+        rollup = DailyRollup.objects.get(metric='new_recipes')
+        self.assertEqual((rollup.date, rollup.value), (yesterday.date(), 1))
+        self.assertEqual(SystemCounter.objects.get(name='recipes').value, 1)
@@ -4,48 +4,75 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from django.contrib.auth import get_user_model
-from recipes.models import Recipe
-from ingredients.models import Ingredient
-from forum.models import ForumPost, ForumPostComment
+from django.utils import timezone
+from .metrics import COUNTERS, DAILY, VIEWS, read_counters
+from .models import DailyRollup
 from .serializers import AnalyticsSerializer
 from rest_framework.decorators import permission_classes
+import datetime
+import re
 
-User = get_user_model()
+MAX_RANGE_DAYS = 366
+RANGE_PATTERN = re.compile(r'^(\d+)d?$')
 
 @permission_classes([IsAuthenticatedOrReadOnly])
 class AnalyticsView(APIView):
     """
     GET /analytics
     Returns anonymized system-level statistics.
+    Totals come from SystemCounter and time series from DailyRollup,
+    so no request counts the content tables.
     """
 
     @swagger_auto_schema(
-        operation_description="Get aggregated counts of users, recipes, ingredients, posts, and comments.",
+        operation_description="Get aggregated counts of users, recipes, ingredients, posts, and comments. "
+                              "With range, also daily series of new/removed users, recipes, posts, comments, votes and views.",
+        manual_parameters=[
+            openapi.Parameter(
+                'range', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description=f"Number of days to include, e.g. 7d or 30d (at most {MAX_RANGE_DAYS})"
+            ),
+        ],
         responses={
             200: openapi.Response(
                 description="Aggregated system statistics",
                 schema=AnalyticsSerializer
-            )
+            ),
+            400: "Invalid range"
         }
     )
     def get(self, request):
-        data = {
-            "users_count": self.count_non_deleted(User),
-            "recipes_count": self.count_non_deleted(Recipe),
-            "ingredients_count": self.count_non_deleted(Ingredient),
-            "posts_count": self.count_non_deleted(ForumPost),
-            "comments_count": self.count_non_deleted(ForumPostComment),
-        }
+        counters = read_counters()
+        data = {f"{name}_count": counters[name] for name in COUNTERS}
+
+        range_param = request.query_params.get('range')
+        if range_param:
+            match = RANGE_PATTERN.match(range_param)
+            days = int(match.group(1)) if match else 0
+            if not 1 <= days <= MAX_RANGE_DAYS:
+                return Response(
+                    {"detail": f"range must be a number of days between 1 and {MAX_RANGE_DAYS}, e.g. 30d."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            data["range"] = f"{days}d"
+            data["series"] = self.get_series(days)
 
         serializer = AnalyticsSerializer(data)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-    def count_non_deleted(self, model):
-        """
-        Returns count of non-deleted objects for models with soft delete.
-        Falls back to total count if 'deleted_on' is not a field.
-        """
-        if hasattr(model, 'deleted_on'):
-            return model.objects.filter(deleted_on__isnull=True).count()
-        return model.objects.count()
\ No newline at end of file
+    def get_series(self, days):
+        """Daily rollups of the last `days` days, with missing days as zero"""
+        end = timezone.localdate()
+        dates = [end - datetime.timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+        metrics = [f"{prefix}_{name}" for name in DAILY for prefix in ('new', 'removed')] + [VIEWS]
+
+        values = {
+            (metric, day): value
+            for metric, day, value in DailyRollup.objects.filter(
+                metric__in=metrics, date__gte=dates[0], date__lte=end
+            ).values_list('metric', 'date', 'value')
+        }
+        return {
+            metric: [{"date": day.isoformat(), "value": values.get((metric, day), 0)} for day in dates]
+            for metric in metrics
+        }
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    # Import and register the signals when the app is ready
+    def ready(self):
+        import api.signals  # This connects the signals in signals.py
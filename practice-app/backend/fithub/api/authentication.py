@@ -0,0 +1,167 @@
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+AUTH_VERSION_PREFIX = 'auth_version'
+
+
+def _version_key(user_id):
+    return f"{AUTH_VERSION_PREFIX}:{user_id}"
+
+
+def auth_version(user_id):
+    """The user's credential version in the shared cache, created on first use"""
+    shared = caches['shared']
+    key = _version_key(user_id)
+    version = shared.get(key)
+    if version is None:
+        shared.add(key, uuid.uuid4().hex, timeout=None)
+        version = shared.get(key)
+    return version
+
+
+def bump_auth_version(user_id):
+    caches['shared'].set(_version_key(user_id), uuid.uuid4().hex, timeout=None)
+
+
+class PrincipalCache:
+    """
+    Small in-process LRU mapping credentials to authenticated users.
+
+    Entries expire after AUTH_CACHE_TTL seconds and at most AUTH_CACHE_MAX_SIZE
+    are kept. Each entry remembers the user's auth version (see auth_version)
+    and is only served while the shared cache still holds that version, so a
+    logout, password change or deactivation handled by one worker stops the
+    credential on every worker. The version is rechecked at most once per
+    AUTH_VERSION_CHECK_INTERVAL seconds, so most hits need no shared read;
+    other workers see a change within that interval.
+    """
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user, auth, version, checked_at = entry
+            now = time.monotonic()
+            if expires_at <= now:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+        if now - checked_at >= settings.AUTH_VERSION_CHECK_INTERVAL:
+            current = auth_version(user.pk) == version
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    if current:
+                        self._entries[key] = (expires_at, user, auth, version, time.monotonic())
+                    else:
+                        self._discard(key)
+            if not current:
+                return None
+        # Hand out a copy so a view mutating request.user cannot leak into the cache
+        return copy.copy(user), auth
+
+    def set(self, key, user, auth=None, version=None):
+        """Cache user under key; pass the auth version read before loading user when known"""
+        if version is None:
+            version = auth_version(user.pk)
+        now = time.monotonic()
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (now + settings.AUTH_CACHE_TTL, copy.copy(user), auth, version, now)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > settings.AUTH_CACHE_MAX_SIZE:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1].pk
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+principal_cache = PrincipalCache()
+
+
+def invalidate_cached_principal(user_id):
+    """
+    Forget every cached credential of a user (logout, password reset, update),
+    in this worker right away and in the others through a new auth version.
+    The version is replaced again on commit, so a worker that loaded the user
+    while the change was still uncommitted drops it as well.
+    """
+    principal_cache.invalidate_user(user_id)
+    bump_auth_version(user_id)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: bump_auth_version(user_id))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that skips the token and user SELECT on cache hits"""
+
+    def authenticate_credentials(self, key):
+        cache_key = f"token:{key}"
+        cached = principal_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        principal_cache.set(cache_key, user, token)
+        return (user, token)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that serves the user lookup from the principal cache"""
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        cache_key = f"jwt:{user_id}"
+        cached = principal_cache.get(cache_key)
+        if cached is None:
+            # Read the version first: a change committed during the lookup then shows as a mismatch
+            version = auth_version(user_id)
+            user = super().get_user(validated_token)
+            principal_cache.set(cache_key, user, version=version)
+            return user
+
+        user, _ = cached
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    "The user's password has been changed.", code="password_changed"
+                )
+        return user
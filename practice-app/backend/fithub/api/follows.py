@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Coalesce
+
+from api.models import RegisteredUser
+
+Follow = RegisteredUser.followedUsers.through
+
+FOLLOWED_IDS_CACHE_PREFIX = 'followed_ids'
+
+
+def _followed_ids_key(user_id):
+    return f"{FOLLOWED_IDS_CACHE_PREFIX}:{user_id}"
+
+
+def get_followed_user_ids(user_id):
+    """Ids of the users that user_id follows, served from the shared cache"""
+    shared = caches['shared']
+    key = _followed_ids_key(user_id)
+    followed_ids = shared.get(key)
+    if followed_ids is None:
+        followed_ids = list(
+            Follow.objects.filter(from_registereduser_id=user_id)
+            .values_list('to_registereduser_id', flat=True)
+        )
+        shared.set(key, followed_ids, timeout=settings.FOLLOW_CACHE_TTL)
+    return followed_ids
+
+
+def invalidate_followed_user_ids(*user_ids):
+    """
+    Drop the cached ids in every worker. Inside a transaction they are
+    dropped again on commit, in case another worker cached the old rows meanwhile.
+    """
+    keys = [_followed_ids_key(user_id) for user_id in user_ids]
+    caches['shared'].delete_many(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: caches['shared'].delete_many(keys))
+
+
+def toggle_follow(follower_id, target_id):
+    """
+    Follow target_id, or unfollow it if already followed.
+
+    The edge is removed or inserted once and both counters move in a single
+    UPDATE. Returns "followed" or "unfollowed".
+    """
+    with transaction.atomic():
+        deleted, _ = Follow.objects.filter(
+            from_registereduser_id=follower_id, to_registereduser_id=target_id
+        ).delete()
+        if deleted:
+            delta, status_msg = -1, "unfollowed"
+        else:
+            try:
+                with transaction.atomic():
+                    Follow.objects.create(
+                        from_registereduser_id=follower_id, to_registereduser_id=target_id
+                    )
+                delta = 1
+            except IntegrityError:
+                # A concurrent request created the same edge first
+                delta = 0
+            status_msg = "followed"
+
+        if delta:
+            # Never below zero, like recipeCount: counts rebuilt late may already be low
+            following_floor = {'followingCount__gt': 0} if delta < 0 else {}
+            followers_floor = {'followersCount__gt': 0} if delta < 0 else {}
+            RegisteredUser.objects.filter(pk__in=[follower_id, target_id]).update(
+                followingCount=models.Case(
+                    models.When(pk=follower_id, **following_floor, then=models.F('followingCount') + delta),
+                    default=models.F('followingCount'),
+                ),
+                followersCount=models.Case(
+                    models.When(pk=target_id, **followers_floor, then=models.F('followersCount') + delta),
+                    default=models.F('followersCount'),
+                ),
+            )
+
+    invalidate_followed_user_ids(follower_id)
+    return status_msg
+
+
+def recount_follows(user_ids=None):
+    """Rebuild followersCount/followingCount from the follow table in one UPDATE"""
+    def edge_count(column):
+        return Coalesce(
+            models.Subquery(
+                Follow.objects.filter(**{column: models.OuterRef('pk')})
+                .order_by()
+                .values(column)
+                .annotate(total=models.Count('pk'))
+                .values('total')
+            ),
+            0,
+        )
+
+    users = RegisteredUser.objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    return users.update(
+        followersCount=edge_count('to_registereduser'),
+        followingCount=edge_count('from_registereduser'),
+    )
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import LoginAttempt
+from api.throttling import flush_login_audit
+
+
+class Command(BaseCommand):
+    help = 'Deletes LoginAttempt rows older than the retention period in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.LOGIN_ATTEMPT_RETENTION_DAYS,
+            help='Keep attempts from the last N days'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Rows deleted per DELETE statement'
+        )
+
+    def handle(self, *args, **options):
+        flush_login_audit()
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        stale = LoginAttempt.objects.filter(timestamp__lt=cutoff).order_by('pk')
+
+        deleted = 0
+        while True:
+            # Bounded batches keep each DELETE short and its locks small
+            ids = list(stale.values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            count, _ = LoginAttempt.objects.filter(pk__in=ids).delete()
+            deleted += count
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} login attempts older than {options["days"]} days'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api.summary import COUNTER_FIELDS, recount_content
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds postCount, commentCount, questionCount and answerCount for all users'
+
+    def handle(self, *args, **kwargs):
+        for model, (_, counter) in COUNTER_FIELDS.items():
+            updated = recount_content(model)
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {counter} for {updated} users'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.follows import recount_follows
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds followersCount and followingCount for all users from the follow table'
+
+    def handle(self, *args, **kwargs):
+        updated = recount_follows()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt follow counts for {updated} users'))
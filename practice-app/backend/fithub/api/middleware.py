@@ -1,36 +1,69 @@
 from django.utils import timezone
 from rest_framework.authtoken.models import Token
 from django.conf import settings
-from rest_framework.response import Response
+from django.core.cache import cache
+from django.http import JsonResponse
 from rest_framework import status
 import datetime
 
+SESSION_ACTIVITY_CACHE_PREFIX = 'session_activity'
+
+
+def session_activity_key(user_id):
+    return f"{SESSION_ACTIVITY_CACHE_PREFIX}:{user_id}"
+
+
+def clear_session_activity(user_id):
+    """Drop the cached last-seen entry so the next request re-reads the token"""
+    cache.delete(session_activity_key(user_id))
+
+
+def _load_session_activity(user):
+    # Cold cache: read the token once and seed the entry from its timestamp
+    token = Token.objects.filter(user=user).only('key', 'created').first()
+    if token is None:
+        return {'key': None}
+    return {'key': token.key, 'last_seen': token.created, 'written': token.created}
+
+
 class SessionTimeoutMiddleware:
+    """
+    Sliding session expiry backed by the cache.
+
+    The last-seen time of each user's token is kept in the cache and the
+    expiry check is served from there. The timestamp is only written back
+    to the token row once every SESSION_ACTIVITY_WRITE_INTERVAL seconds.
+    """
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         if request.user.is_authenticated:
-            # Get the user's token
-            try:
-                token = Token.objects.get(user=request.user)
-                last_activity = token.created
+            key = session_activity_key(request.user.pk)
+            activity = cache.get(key)
+            if activity is None:
+                activity = _load_session_activity(request.user)
 
+            if activity['key'] is not None:
+                now = timezone.now()
                 # Check if the token has expired (30 minutes)
-                if (timezone.now() - last_activity) > datetime.timedelta(seconds=settings.SESSION_COOKIE_AGE):
+                if (now - activity['last_seen']) > datetime.timedelta(seconds=settings.SESSION_COOKIE_AGE):
                     # Delete the token
-                    token.delete()
-                    return Response(
+                    Token.objects.filter(key=activity['key']).delete()
+                    cache.delete(key)
+                    return JsonResponse(
                         {"detail": "Session expired. Please login again."},
                         status=status.HTTP_401_UNAUTHORIZED
                     )
-                
-                # Update token creation time to reset timeout
-                token.created = timezone.now()
-                token.save()
-            
-            except Token.DoesNotExist:
-                pass
+
+                # Reset the timeout, persisting it only once per write interval
+                activity['last_seen'] = now
+                write_interval = datetime.timedelta(seconds=settings.SESSION_ACTIVITY_WRITE_INTERVAL)
+                if (now - activity['written']) >= write_interval:
+                    Token.objects.filter(key=activity['key']).update(created=now)
+                    activity['written'] = now
+
+            cache.set(key, activity, timeout=settings.SESSION_COOKIE_AGE)
 
         response = self.get_response(request)
         return response
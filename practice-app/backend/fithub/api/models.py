@@ -134,6 +134,14 @@ class RegisteredUser(AbstractUser, TimestampedModel):
         related_name='followers',
         blank=True,
     )
+    # Denormalized sizes of the follow graph, maintained by api/follows.py
+    followersCount = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    followingCount = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    # Denormalized sizes of the user's live content, maintained by api/summary.py
+    postCount = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    commentCount = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    questionCount = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    answerCount = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     
     # Recipe relationships (assuming Recipe is in 'recipes' app)
     bookmarkRecipes = models.ManyToManyField(
@@ -207,8 +215,17 @@ class PasswordResetToken(models.Model):
 
 class LoginAttempt(models.Model):
     user = models.ForeignKey('RegisteredUser', on_delete=models.CASCADE)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: rows are buffered and bulk inserted, so the time of the attempt is set explicitly
+    timestamp = models.DateTimeField(default=timezone.now)
     successful = models.BooleanField(default=False)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'timestamp']),
+            models.Index(fields=['ip_address', 'timestamp']),
+            models.Index(fields=['timestamp']),
+        ]
 
     @classmethod
     def get_recent_attempts(cls, user, minutes=15):
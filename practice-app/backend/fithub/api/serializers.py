@@ -1,6 +1,6 @@
 # serializers.py
 from rest_framework import serializers
-from .models import LoginAttempt, RegisteredUser, Dietitian
+from .models import RegisteredUser, Dietitian
 from django.contrib.auth.models import User
 from .models import PasswordResetCode, PasswordResetToken
 from django.utils.crypto import get_random_string
@@ -11,6 +11,7 @@ from recipes.models import Recipe  # Import from recipes app
 from .models import RegisteredUser, RecipeRating, HealthRating, Dietitian
 from forum.models import ForumPost, ForumPostComment
 from qa.models import Question, Answer
+from .throttling import get_client_ip, record_login_attempt
 
 User = get_user_model()
 
@@ -77,7 +78,11 @@ class LoginSerializer(serializers.Serializer):
             raise serializers.ValidationError('Invalid email or password.')
 
         if not user.check_password(password):
-            LoginAttempt.objects.create(user=user, successful=False)
+            record_login_attempt(
+                user,
+                successful=False,
+                ip_address=get_client_ip(self.context.get('request'))
+            )
             raise serializers.ValidationError('Invalid email or password.')
 
         if not user.is_active:
@@ -180,10 +185,12 @@ class RegisteredUserSerializer(serializers.ModelSerializer):
             'profileVisibility', 'recipeCount', 'avgRecipeRating',
             'typeOfCook', 'followedUsers', 'bookmarkRecipes', 'likedRecipes', 'language', 
             'preferredDateFormat','date_of_birth', 'nationality', 'preferredCurrency', 
-            'accessibilityNeeds'
+            'accessibilityNeeds', 'followersCount', 'followingCount'
         ]
         extra_kwargs = {
             'password': {'write_only': True},  # Hide password in responses
+            'followersCount': {'read_only': True},
+            'followingCount': {'read_only': True},
             'username': {'required': False},
             'email': {'required': False},
         }
@@ -193,6 +200,45 @@ class RegisteredUserSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Rating must be between 0.0 and 5.0.")
         return value
 
+class RegisteredUserListSerializer(serializers.ModelSerializer):
+    """
+    Compact user representation for list endpoints.
+
+    Relationship lists are replaced by counts; the lists themselves are served
+    by the paginated /api/users/{id}/bookmarks/, liked-recipes/, followers/
+    and following/ endpoints.
+    """
+    bookmarkCount = serializers.IntegerField(read_only=True)
+    likedCount = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = RegisteredUser
+        fields = [
+            'id', 'username', 'usertype', 'profileVisibility', 'recipeCount',
+            'avgRecipeRating', 'typeOfCook', 'followersCount', 'followingCount',
+            'bookmarkCount', 'likedCount'
+        ]
+        read_only_fields = fields
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Minimal user entry used by the followers/following pages"""
+    profilePhoto = serializers.ImageField(read_only=True)
+
+    class Meta:
+        model = RegisteredUser
+        fields = ['id', 'username', 'usertype', 'typeOfCook', 'recipeCount', 'followersCount', 'profilePhoto']
+        read_only_fields = fields
+
+
+class UserRecipeSummarySerializer(serializers.ModelSerializer):
+    """Minimal recipe entry used by the bookmarks/liked-recipes pages"""
+    class Meta:
+        model = Recipe
+        fields = ['id', 'name', 'meal_type', 'creator', 'like_count', 'cost_per_serving', 'created_at']
+        read_only_fields = fields
+
+
 #UNDER CONSTRUCTION
 class RecipeRatingSerializer(serializers.ModelSerializer):
     recipe_id = serializers.PrimaryKeyRelatedField(
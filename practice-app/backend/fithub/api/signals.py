@@ -0,0 +1,124 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from api.models import RegisteredUser
+from api.middleware import clear_session_activity
+from api.authentication import invalidate_cached_principal
+from api.throttling import reset_login_failures
+from api.follows import Follow, invalidate_followed_user_ids, recount_follows
+from api.summary import COUNTER_FIELDS, adjust_content_count, invalidate_user_summary, recount_content
+from recipes.models import Recipe
+from utils.cascade import rows_restored, rows_soft_deleted
+
+
+# Drop the cached session activity whenever the user's token changes
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def reset_session_activity_on_token_change(sender, instance, **kwargs):
+    clear_session_activity(instance.user_id)
+
+
+# Logging out deletes the token, so it must stop authenticating right away
+@receiver(post_delete, sender=Token)
+def invalidate_principal_on_token_delete(sender, instance, **kwargs):
+    invalidate_cached_principal(instance.user_id)
+
+
+# Any save (profile update, password reset, soft delete) refreshes the cached user
+@receiver(post_save, sender=RegisteredUser)
+@receiver(post_delete, sender=RegisteredUser)
+def invalidate_principal_on_user_change(sender, instance, **kwargs):
+    invalidate_cached_principal(instance.pk)
+
+
+# A new account must never inherit cached entries left under a reused id
+@receiver(post_save, sender=RegisteredUser)
+def reset_user_caches_on_create(sender, instance, created, **kwargs):
+    if created:
+        clear_session_activity(instance.pk)
+        reset_login_failures(instance.pk)
+        invalidate_followed_user_ids(instance.pk)
+        invalidate_user_summary(instance.pk)
+
+
+# Keep follow counters right when the M2M managers are used directly
+# (followedUsers.add/remove/clear or followers.add/remove/clear)
+@receiver(m2m_changed, sender=Follow)
+def update_follow_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        column = 'from_registereduser_id' if reverse else 'to_registereduser_id'
+        owner = 'to_registereduser_id' if reverse else 'from_registereduser_id'
+        instance._follow_clear_ids = set(
+            Follow.objects.filter(**{owner: instance.pk}).values_list(column, flat=True)
+        )
+        return
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_follow_clear_ids', set())
+    elif action not in ('post_add', 'post_remove'):
+        return
+    if not pk_set and action != 'post_clear':
+        return
+
+    affected = {instance.pk, *pk_set}
+    recount_follows(affected)
+    invalidate_followed_user_ids(*affected)
+
+
+# Per-user content counters and the cached profile summary
+def track_content_save(sender, instance, created, update_fields=None, **kwargs):
+    owner, _ = COUNTER_FIELDS[sender]
+    owner_id = getattr(instance, f'{owner}_id')
+    if created:
+        if instance.deleted_on is None:
+            adjust_content_count(sender, owner_id, 1)
+        return
+    if update_fields is not None and 'deleted_on' not in update_fields:
+        return
+    if not instance.has_loaded_value('deleted_on'):
+        invalidate_user_summary(owner_id)
+        return
+    was_live = instance.get_loaded_value('deleted_on') is None
+    is_live = instance.deleted_on is None
+    if was_live != is_live:
+        adjust_content_count(sender, owner_id, 1 if is_live else -1)
+
+
+def track_content_delete(sender, instance, **kwargs):
+    owner, _ = COUNTER_FIELDS[sender]
+    if instance.deleted_on is None:
+        adjust_content_count(sender, getattr(instance, f'{owner}_id'), -1)
+
+
+for content_model in COUNTER_FIELDS:
+    post_save.connect(track_content_save, sender=content_model,
+                      dispatch_uid=f'content_count_save_{content_model._meta.label}')
+    post_delete.connect(track_content_delete, sender=content_model,
+                        dispatch_uid=f'content_count_delete_{content_model._meta.label}')
+
+
+# Bulk soft deletes and restores (utils.cascade) touch many authors at once
+@receiver(rows_soft_deleted)
+@receiver(rows_restored)
+def recount_content_after_cascade(sender, rows, **kwargs):
+    if sender not in COUNTER_FIELDS:
+        return
+    owner, _ = COUNTER_FIELDS[sender]
+    owner_ids = list(rows.order_by().values_list(f'{owner}_id', flat=True).distinct())
+    recount_content(sender, owner_ids)
+    invalidate_user_summary(*owner_ids)
+
+
+# recipeCount is kept by recipes/signals.py, only the cached summary needs dropping
+@receiver(post_save, sender=Recipe)
+def invalidate_summary_on_recipe_change(sender, instance, created, update_fields=None, **kwargs):
+    # Only new recipes and soft deletes or restores change the summary; ratings and counters do not
+    if not created and update_fields is not None and 'deleted_on' not in update_fields:
+        return
+    if (created or not instance.has_loaded_value('deleted_on')
+            or instance.get_loaded_value('deleted_on') != instance.deleted_on):
+        invalidate_user_summary(instance.creator_id)
+
+
+@receiver(post_delete, sender=Recipe)
+def invalidate_summary_on_recipe_delete(sender, instance, **kwargs):
+    invalidate_user_summary(instance.creator_id)
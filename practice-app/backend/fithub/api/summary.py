@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+
+from api.models import RegisteredUser
+from forum.models import ForumPost, ForumPostComment
+from qa.models import Answer, Question
+from recipes.models import Recipe
+
+USER_SUMMARY_CACHE_PREFIX = 'user_summary'
+
+# Summary name -> (model, owner field, counter field on RegisteredUser)
+CONTENT_TYPES = {
+    'recipes': (Recipe, 'creator', 'recipeCount'),
+    'posts': (ForumPost, 'author', 'postCount'),
+    'comments': (ForumPostComment, 'author', 'commentCount'),
+    'questions': (Question, 'author', 'questionCount'),
+    'answers': (Answer, 'author', 'answerCount'),
+}
+
+# Counters kept by this module; recipeCount is maintained by recipes/signals.py
+COUNTER_FIELDS = {
+    model: (owner, counter)
+    for name, (model, owner, counter) in CONTENT_TYPES.items()
+    if name != 'recipes'
+}
+
+# Same thresholds as recipes.views.get_user_recipe_count
+RECIPE_BADGES = ((10, "Experienced Home Cook"), (5, "Home Cook"))
+
+
+def _summary_key(user_id, include_ids):
+    return f"{USER_SUMMARY_CACHE_PREFIX}:{user_id}:{'ids' if include_ids else 'counts'}"
+
+
+def invalidate_user_summary(*user_ids):
+    """
+    Drop the cached summaries in every worker. Inside a transaction they are
+    dropped again on commit, in case another worker cached the old rows meanwhile.
+    """
+    keys = [
+        _summary_key(user_id, include_ids)
+        for user_id in user_ids
+        for include_ids in (False, True)
+    ]
+    caches['shared'].delete_many(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: caches['shared'].delete_many(keys))
+
+
+def adjust_content_count(model, owner_id, delta):
+    owner, counter = COUNTER_FIELDS[model]
+    users = RegisteredUser.objects.filter(pk=owner_id)
+    if delta < 0:
+        # Never below zero, like recipeCount: content older than the counter is not in it
+        users = users.filter(**{f'{counter}__gt': 0})
+    users.update(**{counter: models.F(counter) + delta})
+    invalidate_user_summary(owner_id)
+
+
+def recount_content(model, user_ids=None):
+    """Rebuild one content counter from the table in one UPDATE (all users when user_ids is None)"""
+    owner, counter = COUNTER_FIELDS[model]
+    live = Coalesce(
+        models.Subquery(
+            model._base_manager.filter(**{owner: models.OuterRef('pk')}, deleted_on__isnull=True)
+            .order_by().values(owner).annotate(total=models.Count('pk')).values('total')[:1]
+        ),
+        models.Value(0),
+    )
+    users = RegisteredUser.objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    return users.update(**{counter: live})
+
+
+def get_user_summary(user_id, include_ids=False):
+    """
+    Content counts of a user, plus the newest ids of each type when include_ids is set.
+    Served from the shared cache; returns None when the user does not exist.
+    """
+    shared = caches['shared']
+    key = _summary_key(user_id, include_ids)
+    summary = shared.get(key)
+    if summary is not None:
+        return summary
+
+    counters = [counter for _, _, counter in CONTENT_TYPES.values()]
+    row = RegisteredUser.objects.filter(pk=user_id).values(*counters).first()
+    if row is None:
+        return None
+
+    counts = {name: row[counter] for name, (_, _, counter) in CONTENT_TYPES.items()}
+    summary = {
+        'user_id': user_id,
+        'counts': counts,
+        'badge': next((badge for threshold, badge in RECIPE_BADGES if counts['recipes'] >= threshold), None),
+    }
+    if include_ids:
+        size = settings.USER_SUMMARY_IDS_PAGE_SIZE
+        summary['ids'] = {
+            name: list(
+                model.objects.filter(**{f'{owner}_id': user_id}, deleted_on__isnull=True)
+                .order_by('-id').values_list('id', flat=True)[:size]
+            )
+            for name, (model, owner, _) in CONTENT_TYPES.items()
+        }
+    shared.set(key, summary, timeout=settings.USER_SUMMARY_CACHE_TTL)
+    return summary
@@ -0,0 +1,132 @@
+"""
+Test cases for the cached token and JWT authentication backends
+"""
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import (
+    CachedTokenAuthentication, CachedJWTAuthentication, auth_version, bump_auth_version, principal_cache
+)
+from api.models import RegisteredUser
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Token lookups are served from the principal cache after the first hit"""
+
+    def setUp(self):
+        principal_cache.clear()
+        self.user = RegisteredUser.objects.create_user(
+            username='authuser',
+            email='auth@test.com',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.backend = CachedTokenAuthentication()
+
+    def test_second_lookup_needs_no_query(self):
+        self.backend.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = self.backend.authenticate_credentials(self.token.key)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(token.key, self.token.key)
+
+    @override_settings(AUTH_VERSION_CHECK_INTERVAL=0)
+    def test_lookup_after_the_check_interval_reads_the_auth_version(self):
+        self.backend.authenticate_credentials(self.token.key)
+        # The shared test cache is database backed; the token and user are not read again
+        with self.assertNumQueries(1):
+            self.backend.authenticate_credentials(self.token.key)
+
+    def test_cached_user_is_a_copy(self):
+        """Mutating request.user must not change what later requests see"""
+        self.backend.authenticate_credentials(self.token.key)
+        user, _ = self.backend.authenticate_credentials(self.token.key)
+        user.first_name = 'changed'
+        user, _ = self.backend.authenticate_credentials(self.token.key)
+        self.assertNotEqual(user.first_name, 'changed')
+
+    def test_token_delete_invalidates_cache(self):
+        self.backend.authenticate_credentials(self.token.key)
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.backend.authenticate_credentials(self.token.key)
+
+    def test_user_update_invalidates_cache(self):
+        self.backend.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.backend.authenticate_credentials(self.token.key)
+
+    @override_settings(AUTH_VERSION_CHECK_INTERVAL=0)
+    def test_change_on_another_worker_invalidates_cache(self):
+        """Another worker only shares the auth version, not this process's entries"""
+        self.backend.authenticate_credentials(self.token.key)
+        RegisteredUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        bump_auth_version(self.user.pk)
+        with self.assertRaises(AuthenticationFailed):
+            self.backend.authenticate_credentials(self.token.key)
+
+    @override_settings(AUTH_VERSION_CHECK_INTERVAL=0)
+    def test_logout_on_another_worker_invalidates_cache(self):
+        self.backend.authenticate_credentials(self.token.key)
+        other_worker = principal_cache.get(f"token:{self.token.key}")
+        version = auth_version(self.user.pk)
+        self.token.delete()
+        # Another worker still holds the entry it cached before the logout
+        principal_cache.set(f"token:{self.token.key}", *other_worker, version=version)
+        with self.assertRaises(AuthenticationFailed):
+            self.backend.authenticate_credentials(self.token.key)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """JWT user lookups are cached and refreshed on user saves"""
+
+    def setUp(self):
+        principal_cache.clear()
+        self.user = RegisteredUser.objects.create_user(
+            username='jwtuser',
+            email='jwt@test.com',
+            password='testpass123'
+        )
+        self.backend = CachedJWTAuthentication()
+        self.validated_token = AccessToken.for_user(self.user)
+
+    def test_second_lookup_needs_no_query(self):
+        self.backend.get_user(self.validated_token)
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.validated_token)
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_user_update_refreshes_snapshot(self):
+        self.backend.get_user(self.validated_token)
+        self.user.first_name = 'Updated'
+        self.user.save()
+        user = self.backend.get_user(self.validated_token)
+        self.assertEqual(user.first_name, 'Updated')
+
+
+class LogoutInvalidatesCacheTests(APITestCase):
+    """A token stops working as soon as logout_view deletes it"""
+
+    def setUp(self):
+        principal_cache.clear()
+        self.user = RegisteredUser.objects.create_user(
+            username='logoutuser',
+            email='logout@test.com',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+
+    def test_token_rejected_after_logout(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        response = self.client.post(reverse('logout_view'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(reverse('logout_view'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
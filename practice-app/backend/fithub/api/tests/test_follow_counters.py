@@ -0,0 +1,155 @@
+"""
+Test cases for stored follower/following counters and the cached
+followed-ids set used by the activity stream
+"""
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.follows import FOLLOWED_IDS_CACHE_PREFIX, Follow, get_followed_user_ids, toggle_follow
+from api.models import RegisteredUser
+
+
+class FollowToggleTests(APITestCase):
+    """Follow toggles keep both counters in step with the follow table"""
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username='follower',
+            email='follower@test.com',
+            password='testpass123'
+        )
+        self.target = RegisteredUser.objects.create_user(
+            username='target',
+            email='target@test.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('registereduser-follow')
+
+    def test_follow_and_unfollow_update_counters(self):
+        response = self.client.post(self.url, {'user_id': self.target.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'followed')
+        self.assertEqual(response.data['current_followers_count'], 1)
+
+        self.user.refresh_from_db()
+        self.target.refresh_from_db()
+        self.assertEqual(self.user.followingCount, 1)
+        self.assertEqual(self.target.followersCount, 1)
+        self.assertTrue(self.user.followedUsers.filter(pk=self.target.pk).exists())
+
+        response = self.client.post(self.url, {'user_id': self.target.id}, format='json')
+        self.assertEqual(response.data['status'], 'unfollowed')
+        self.assertEqual(response.data['current_followers_count'], 0)
+
+        self.user.refresh_from_db()
+        self.target.refresh_from_db()
+        self.assertEqual(self.user.followingCount, 0)
+        self.assertEqual(self.target.followersCount, 0)
+
+    def test_unfollow_never_drives_counters_negative(self):
+        """Edges older than the counters start from a stored 0"""
+        Follow.objects.create(from_registereduser=self.user, to_registereduser=self.target)
+        RegisteredUser.objects.filter(pk__in=[self.user.pk, self.target.pk]).update(followingCount=0, followersCount=0)
+
+        self.assertEqual(toggle_follow(self.user.pk, self.target.pk), 'unfollowed')
+        self.user.refresh_from_db()
+        self.target.refresh_from_db()
+        self.assertEqual(self.user.followingCount, 0)
+        self.assertEqual(self.target.followersCount, 0)
+
+    def _statements(self, func):
+        with CaptureQueriesContext(connection) as ctx:
+            func()
+        # Writes to the shared cache table are not part of the toggle itself
+        cache_table = settings.CACHES['shared']['LOCATION']
+        return [
+            q['sql'].split()[0] for q in ctx.captured_queries
+            if 'SAVEPOINT' not in q['sql'] and cache_table not in q['sql']
+        ]
+
+    def test_toggle_writes_edge_and_counters_once(self):
+        follow = self._statements(lambda: toggle_follow(self.user.id, self.target.id))
+        self.assertEqual(follow, ['DELETE', 'INSERT', 'UPDATE'])
+        unfollow = self._statements(lambda: toggle_follow(self.user.id, self.target.id))
+        self.assertEqual(unfollow, ['DELETE', 'UPDATE'])
+
+    def test_direct_m2m_changes_update_counters(self):
+        self.user.followedUsers.add(self.target)
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.followersCount, 1)
+
+        self.target.followers.clear()
+        self.user.refresh_from_db()
+        self.target.refresh_from_db()
+        self.assertEqual(self.user.followingCount, 0)
+        self.assertEqual(self.target.followersCount, 0)
+
+
+class FollowedIdsCacheTests(TestCase):
+    """Followed ids are cached per user and refreshed on toggle"""
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username='reader',
+            email='reader@test.com',
+            password='testpass123'
+        )
+        self.author = RegisteredUser.objects.create_user(
+            username='author',
+            email='author@test.com',
+            password='testpass123'
+        )
+
+    def test_cached_ids_need_no_follow_query(self):
+        get_followed_user_ids(self.user.id)
+        # Only the shared cache read
+        with self.assertNumQueries(1):
+            self.assertEqual(get_followed_user_ids(self.user.id), [])
+
+    def test_toggle_invalidates_cached_ids(self):
+        get_followed_user_ids(self.user.id)
+        toggle_follow(self.user.id, self.author.id)
+        self.assertEqual(get_followed_user_ids(self.user.id), [self.author.id])
+
+    def test_toggle_reaches_other_workers(self):
+        get_followed_user_ids(self.user.id)
+        toggle_follow(self.user.id, self.author.id)
+        # A worker that did not handle the toggle still has the old ids in its local cache
+        cache.clear()
+        cache.set(f"{FOLLOWED_IDS_CACHE_PREFIX}:{self.user.id}", [])
+        self.assertEqual(get_followed_user_ids(self.user.id), [self.author.id])
+
+
+class RebuildFollowCountsCommandTests(TestCase):
+    """The rebuild command recomputes counters from the follow table"""
+
+    def test_rebuild_fixes_drifted_counters(self):
+        user = RegisteredUser.objects.create_user(
+            username='drift',
+            email='drift@test.com',
+            password='testpass123'
+        )
+        other = RegisteredUser.objects.create_user(
+            username='other',
+            email='other@test.com',
+            password='testpass123'
+        )
+        user.followedUsers.add(other)
+        RegisteredUser.objects.update(followersCount=7, followingCount=7)
+
+        call_command('rebuild_follow_counts', stdout=StringIO())
+
+        user.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((user.followersCount, user.followingCount), (0, 1))
+        self.assertEqual((other.followersCount, other.followingCount), (1, 0))
@@ -0,0 +1,167 @@
+"""
+Test cases for the cache-backed login throttle, the batched audit log
+and the prune_login_attempts command
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import LoginAttempt, RegisteredUser
+from api.throttling import (
+    flush_login_audit, is_login_locked, login_audit, record_login_attempt, LOGIN_FAILURES_CACHE_PREFIX
+)
+
+
+class LoginThrottleTests(APITestCase):
+    """Lockout decisions come from the sliding window, not a COUNT query"""
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username='throttleuser',
+            email='throttle@test.com',
+            password='testpass123'
+        )
+        self.url = reverse('login_view')
+        caches['shared'].delete(f"{LOGIN_FAILURES_CACHE_PREFIX}:ip:127.0.0.1")
+
+    def _login(self, password):
+        return self.client.post(self.url, {
+            'email': self.user.email,
+            'password': password
+        }, format='json')
+
+    def test_lockout_after_limit_failures(self):
+        for _ in range(settings.LOGIN_ATTEMPT_LIMIT):
+            response = self._login('wrongpass')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self._login('testpass123')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_failed_login_records_single_row(self):
+        self._login('wrongpass')
+        attempts = LoginAttempt.objects.filter(user=self.user)
+        self.assertEqual(attempts.count(), 1)
+        self.assertFalse(attempts.get().successful)
+        self.assertEqual(attempts.get().ip_address, '127.0.0.1')
+
+    def test_warm_window_needs_no_count_query(self):
+        is_login_locked(self.user)
+        # One read of the shared cache, which is database backed in tests
+        with self.assertNumQueries(1):
+            self.assertFalse(is_login_locked(self.user))
+
+    def test_recorded_failures_rebuild_a_warm_window(self):
+        """Every failure drops the shared window, so it is rebuilt from LoginAttempt"""
+        self.assertFalse(is_login_locked(self.user))
+        for _ in range(settings.LOGIN_ATTEMPT_LIMIT):
+            record_login_attempt(self.user, successful=False, ip_address='10.0.0.1')
+        self.assertTrue(is_login_locked(self.user))
+        self.assertEqual(LoginAttempt.objects.filter(user=self.user, successful=False).count(), settings.LOGIN_ATTEMPT_LIMIT)
+
+    def test_failures_outside_window_are_ignored(self):
+        old = timezone.now() - timedelta(minutes=settings.LOGIN_ATTEMPT_TIMEOUT + 1)
+        LoginAttempt.objects.bulk_create([
+            LoginAttempt(user=self.user, successful=False, timestamp=old)
+            for _ in range(settings.LOGIN_ATTEMPT_LIMIT)
+        ])
+        response = self._login('testpass123')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(LOGIN_ATTEMPT_IP_LIMIT=3)
+    def test_lockout_by_address(self):
+        other = RegisteredUser.objects.create_user(
+            username='otheruser',
+            email='other@test.com',
+            password='testpass123'
+        )
+        for user in (self.user, other, self.user):
+            self.client.post(self.url, {'email': user.email, 'password': 'wrongpass'}, format='json')
+
+        response = self.client.post(self.url, {
+            'email': other.email,
+            'password': 'testpass123'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class LoginAuditBufferTests(TestCase):
+    """Successful attempts are written in batches, failures right away"""
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username='audituser',
+            email='audit@test.com',
+            password='testpass123'
+        )
+        self.addCleanup(login_audit.flush)
+
+    @override_settings(LOGIN_AUDIT_BATCH_SIZE=3, LOGIN_AUDIT_FLUSH_INTERVAL=3600)
+    def test_rows_written_once_batch_is_full(self):
+        record_login_attempt(self.user, successful=True)
+        record_login_attempt(self.user, successful=True)
+        self.assertEqual(LoginAttempt.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            record_login_attempt(self.user, successful=True)
+        self.assertEqual(LoginAttempt.objects.count(), 3)
+
+    @override_settings(LOGIN_AUDIT_BATCH_SIZE=10, LOGIN_AUDIT_FLUSH_INTERVAL=3600)
+    def test_failures_are_not_buffered(self):
+        record_login_attempt(self.user, successful=False)
+        self.assertEqual(LoginAttempt.objects.filter(successful=False).count(), 1)
+
+    @override_settings(LOGIN_AUDIT_BATCH_SIZE=10, LOGIN_AUDIT_FLUSH_INTERVAL=3600)
+    def test_flush_writes_pending_rows(self):
+        record_login_attempt(self.user, successful=True)
+        self.assertEqual(flush_login_audit(), 1)
+        self.assertEqual(LoginAttempt.objects.count(), 1)
+
+    @override_settings(LOGIN_AUDIT_BATCH_SIZE=10, LOGIN_AUDIT_FLUSH_INTERVAL=3600)
+    def test_failed_flush_keeps_the_batch(self):
+        record_login_attempt(self.user, successful=True)
+        with patch.object(LoginAttempt.objects, 'bulk_create', side_effect=RuntimeError('database down')):
+            with self.assertRaises(RuntimeError):
+                flush_login_audit()
+        self.assertEqual(flush_login_audit(), 1)
+        self.assertEqual(LoginAttempt.objects.count(), 1)
+
+    @override_settings(LOGIN_AUDIT_BATCH_SIZE=10, LOGIN_AUDIT_FLUSH_INTERVAL=3600)
+    def test_first_buffered_row_schedules_a_flush(self):
+        with patch('api.throttling.threading.Timer') as timer:
+            record_login_attempt(self.user, successful=True)
+            record_login_attempt(self.user, successful=True)
+        timer.assert_called_once_with(3600, login_audit._flush_from_timer)
+        timer.return_value.start.assert_called_once_with()
+
+
+class PruneLoginAttemptsCommandTests(TestCase):
+    """Old attempts are removed in batches"""
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username='pruneuser',
+            email='prune@test.com',
+            password='testpass123'
+        )
+
+    def test_prune_removes_only_old_rows(self):
+        old = timezone.now() - timedelta(days=40)
+        LoginAttempt.objects.bulk_create(
+            [LoginAttempt(user=self.user, timestamp=old) for _ in range(5)]
+            + [LoginAttempt(user=self.user)]
+        )
+        out = StringIO()
+        call_command('prune_login_attempts', '--days=30', '--batch-size=2', stdout=out)
+
+        self.assertEqual(LoginAttempt.objects.count(), 1)
+        self.assertIn('Deleted 5', out.getvalue())
@@ -0,0 +1,95 @@
+"""
+Test cases for the batch vote-state endpoint and the optional my_vote
+field on forum and q/a list endpoints
+"""
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import RegisteredUser
+from forum.models import ForumPost, ForumPostVote, ForumPostComment, ForumPostCommentVote
+from qa.models import Question, QuestionVote
+
+
+class MyVotesEndpointTests(APITestCase):
+    """GET /api/my-votes/ returns vote types for many items at once"""
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username='voter',
+            email='voter@test.com',
+            password='testpass123'
+        )
+        self.other = RegisteredUser.objects.create_user(
+            username='othervoter',
+            email='othervoter@test.com',
+            password='testpass123'
+        )
+        self.posts = [
+            ForumPost.objects.create(author=self.other, title=f'Post {i}', content='Body')
+            for i in range(3)
+        ]
+        self.comment = ForumPostComment.objects.create(
+            author=self.other, content='Comment', post=self.posts[0]
+        )
+        self.question = Question.objects.create(author=self.other, title='Question', content='Body')
+
+        ForumPostVote.objects.create(user=self.user, post=self.posts[0], vote_type='up')
+        ForumPostVote.objects.create(user=self.user, post=self.posts[1], vote_type='down')
+        ForumPostVote.objects.create(user=self.other, post=self.posts[2], vote_type='up')
+        ForumPostVote.objects.create(
+            user=self.user, post=self.posts[2], vote_type='down', deleted_on=timezone.now()
+        )
+        ForumPostCommentVote.objects.create(user=self.user, comment=self.comment, vote_type='up')
+        QuestionVote.objects.create(user=self.user, post=self.question, vote_type='down')
+
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('my-votes')
+
+    def test_returns_live_votes_of_current_user(self):
+        post_ids = ','.join(str(p.id) for p in self.posts)
+        response = self.client.get(self.url, {
+            'post_ids': post_ids,
+            'comment_ids': str(self.comment.id),
+            'question_ids': str(self.question.id),
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['posts'], {
+            str(self.posts[0].id): 'up',
+            str(self.posts[1].id): 'down',
+        })
+        self.assertEqual(response.data['comments'], {str(self.comment.id): 'up'})
+        self.assertEqual(response.data['questions'], {str(self.question.id): 'down'})
+        self.assertEqual(response.data['answers'], {})
+
+    def test_one_query_per_requested_vote_table(self):
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {
+                'post_ids': str(self.posts[0].id),
+                'question_ids': str(self.question.id),
+            })
+
+    def test_rejects_malformed_ids(self):
+        response = self.client.get(self.url, {'post_ids': '1,abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_too_many_ids(self):
+        response = self.client.get(self.url, {'post_ids': ','.join(str(i) for i in range(101))})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url, {'post_ids': '1'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_embeds_my_vote_on_request(self):
+        url = reverse('forum-post-list')
+        response = self.client.get(url, {'include_my_vote': 'true'})
+        votes = {item['id']: item['my_vote'] for item in response.data['results']}
+        self.assertEqual(votes[self.posts[0].id], 'up')
+        self.assertEqual(votes[self.posts[1].id], 'down')
+        self.assertIsNone(votes[self.posts[2].id])
+
+        response = self.client.get(url)
+        self.assertNotIn('my_vote', response.data['results'][0])
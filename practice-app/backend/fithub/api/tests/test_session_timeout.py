@@ -0,0 +1,72 @@
+"""
+Test cases for the cache-backed sliding expiry in SessionTimeoutMiddleware
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from api.middleware import SessionTimeoutMiddleware, clear_session_activity
+from api.models import RegisteredUser
+
+
+class SessionTimeoutMiddlewareTests(TestCase):
+    """Expiry checks are served from the cache and writes are coalesced"""
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username='sessionuser',
+            email='session@test.com',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.factory = RequestFactory()
+        self.middleware = SessionTimeoutMiddleware(lambda request: HttpResponse('ok'))
+
+    def _call(self):
+        request = self.factory.get('/api/')
+        request.user = self.user
+        return self.middleware(request)
+
+    def test_warm_cache_needs_no_queries(self):
+        """Only the first request reads the token; later ones hit the cache"""
+        with self.assertNumQueries(1):
+            self._call()
+        with self.assertNumQueries(0):
+            response = self._call()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_last_seen_written_back_after_interval(self):
+        """The token row is refreshed once the write interval has passed"""
+        stale = timezone.now() - timedelta(seconds=settings.SESSION_ACTIVITY_WRITE_INTERVAL + 5)
+        Token.objects.filter(key=self.token.key).update(created=stale)
+        clear_session_activity(self.user.pk)
+
+        with self.assertNumQueries(2):
+            self._call()
+        self.token.refresh_from_db()
+        self.assertGreater(self.token.created, stale)
+
+    def test_expired_session_deletes_token(self):
+        """A token idle for longer than the session age is removed"""
+        expired = timezone.now() - timedelta(seconds=settings.SESSION_COOKIE_AGE + 5)
+        Token.objects.filter(key=self.token.key).update(created=expired)
+        clear_session_activity(self.user.pk)
+
+        response = self._call()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+
+    def test_token_delete_clears_cached_activity(self):
+        """Logging out drops the cached entry so a new token is picked up"""
+        self._call()
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+
+        with self.assertNumQueries(1):
+            self._call()
+        self.assertTrue(Token.objects.filter(key=new_token.key).exists())
@@ -0,0 +1,119 @@
+"""
+Test cases for the compact user list and the paginated relationship
+sub-endpoints (bookmarks, liked-recipes, followers, following)
+"""
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import RegisteredUser
+from recipes.models import Recipe
+
+
+class UserListCountsTests(APITestCase):
+    """The list endpoint returns counts with a fixed number of queries"""
+
+    def setUp(self):
+        self.users = [
+            RegisteredUser.objects.create_user(
+                username=f'user{i}',
+                email=f'user{i}@test.com',
+                password='testpass123'
+            )
+            for i in range(3)
+        ]
+        self.recipe = Recipe.objects.create(
+            name='Soup', steps=['boil'], prep_time=5, cook_time=10,
+            meal_type='lunch', creator=self.users[0]
+        )
+        self.users[1].bookmarkRecipes.add(self.recipe)
+        self.users[1].likedRecipes.add(self.recipe)
+        self.users[1].followedUsers.add(self.users[0])
+
+    def test_list_has_counts_not_id_lists(self):
+        response = self.client.get(reverse('registereduser-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entry = next(u for u in response.data['results'] if u['id'] == self.users[1].id)
+        self.assertNotIn('bookmarkRecipes', entry)
+        self.assertEqual(entry['bookmarkCount'], 1)
+        self.assertEqual(entry['likedCount'], 1)
+        self.assertEqual(entry['followingCount'], 1)
+
+    def test_list_query_count_is_constant(self):
+        # COUNT for the paginator and one SELECT for the page
+        with self.assertNumQueries(2):
+            self.client.get(reverse('registereduser-list'))
+
+        for i in range(3, 8):
+            user = RegisteredUser.objects.create_user(
+                username=f'user{i}', email=f'user{i}@test.com', password='testpass123'
+            )
+            user.bookmarkRecipes.add(self.recipe)
+        with self.assertNumQueries(2):
+            self.client.get(reverse('registereduser-list'))
+
+    def test_detail_keeps_id_lists(self):
+        response = self.client.get(reverse('registereduser-detail', args=[self.users[1].id]))
+        self.assertEqual(response.data['bookmarkRecipes'], [self.recipe.id])
+        self.assertEqual(response.data['followedUsers'], [self.users[0].id])
+
+
+class UserRelationEndpointsTests(APITestCase):
+    """Relationship lists are served page by page"""
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username='owner',
+            email='owner@test.com',
+            password='testpass123'
+        )
+        self.others = [
+            RegisteredUser.objects.create_user(
+                username=f'other{i}',
+                email=f'other{i}@test.com',
+                password='testpass123'
+            )
+            for i in range(3)
+        ]
+        self.recipes = [
+            Recipe.objects.create(
+                name=f'Recipe {i}', steps=['mix'], prep_time=5, cook_time=5,
+                meal_type='dinner', creator=self.others[0]
+            )
+            for i in range(3)
+        ]
+        self.user.bookmarkRecipes.add(*self.recipes)
+        self.user.likedRecipes.add(self.recipes[0])
+        self.user.followedUsers.add(self.others[0])
+        self.others[1].followedUsers.add(self.user)
+        self.others[2].followedUsers.add(self.user)
+
+    def test_bookmarks_paginated(self):
+        url = reverse('registereduser-bookmarks', args=[self.user.id])
+        response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['results'][0]['id'], self.recipes[2].id)
+
+    def test_liked_recipes(self):
+        url = reverse('registereduser-liked-recipes', args=[self.user.id])
+        response = self.client.get(url)
+        self.assertEqual([r['id'] for r in response.data['results']], [self.recipes[0].id])
+
+    def test_followers_and_following(self):
+        followers = self.client.get(reverse('registereduser-followers', args=[self.user.id]))
+        following = self.client.get(reverse('registereduser-following', args=[self.user.id]))
+        self.assertEqual(
+            [u['id'] for u in followers.data['results']],
+            [self.others[1].id, self.others[2].id]
+        )
+        self.assertEqual([u['id'] for u in following.data['results']], [self.others[0].id])
+        # The web client's followers list shows these fields (followService.getFollowers)
+        self.assertLessEqual(
+            {'id', 'username', 'profilePhoto', 'typeOfCook', 'usertype'}, set(followers.data['results'][0])
+        )
+
+    def test_unknown_user_returns_404(self):
+        response = self.client.get(reverse('registereduser-bookmarks', args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,124 @@
+"""
+Test cases for the per-user content counters and the cached summary endpoint
+"""
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import RegisteredUser
+from api.summary import USER_SUMMARY_CACHE_PREFIX
+from forum.models import ForumPost, ForumPostComment
+from qa.models import Answer, Question
+from recipes.models import Recipe
+
+
+class UserSummaryTests(APITestCase):
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username='author',
+            email='author@test.com',
+            password='testpass123'
+        )
+        self.other = RegisteredUser.objects.create_user(
+            username='replier',
+            email='replier@test.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('user-summary', args=[self.user.id])
+
+    def create_content(self):
+        self.recipe = Recipe.objects.create(
+            name="Summary Recipe", steps=["mix"], prep_time=1, cook_time=1,
+            meal_type="lunch", creator=self.user
+        )
+        self.post = ForumPost.objects.create(author=self.user, title="Post", content="content")
+        self.comment = ForumPostComment.objects.create(author=self.user, content="comment", post=self.post)
+        self.question = Question.objects.create(author=self.user, title="Question", content="content")
+        self.answer = Answer.objects.create(author=self.user, content="answer", post=self.question)
+
+    def test_summary_counts_and_ids(self):
+        self.create_content()
+        response = self.client.get(self.url, {'include_ids': 'true'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['counts'],
+            {'recipes': 1, 'posts': 1, 'comments': 1, 'questions': 1, 'answers': 1}
+        )
+        self.assertEqual(response.data['ids']['answers'], [self.answer.id])
+        self.assertIsNone(response.data['badge'])
+
+    def test_summary_without_ids(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('ids', response.data)
+
+    def test_summary_is_cached(self):
+        self.client.get(self.url)
+        # Only the shared cache read
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_invalidation_reaches_other_workers(self):
+        stale = self.client.get(self.url).data
+        self.create_content()
+        # A worker that did not handle the writes still has the old summary in its local cache
+        cache.clear()
+        cache.set(f"{USER_SUMMARY_CACHE_PREFIX}:{self.user.id}:counts", stale)
+        self.assertEqual(self.client.get(self.url).data['counts']['posts'], 1)
+
+    def test_unknown_user(self):
+        response = self.client.get(reverse('user-summary', args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cache_invalidated_on_create_and_delete(self):
+        self.client.get(self.url)
+        self.create_content()
+        self.assertEqual(self.client.get(self.url).data['counts']['comments'], 1)
+
+        self.comment.delete()
+        self.recipe.delete()
+        counts = self.client.get(self.url).data['counts']
+        self.assertEqual((counts['comments'], counts['recipes']), (0, 0))
+
+    def test_cascade_updates_every_author(self):
+        self.create_content()
+        ForumPostComment.objects.create(author=self.other, content="reply", post=self.post)
+        self.assertEqual(RegisteredUser.objects.get(pk=self.other.pk).commentCount, 1)
+        other_url = reverse('user-summary', args=[self.other.id])
+        self.client.get(other_url)
+
+        self.post.delete()
+        self.assertEqual(self.client.get(other_url).data['counts']['comments'], 0)
+        counts = self.client.get(self.url).data['counts']
+        self.assertEqual((counts['posts'], counts['comments']), (0, 0))
+
+        self.post.restore()
+        self.assertEqual(self.client.get(other_url).data['counts']['comments'], 1)
+
+    def test_delete_never_drives_counters_negative(self):
+        """Content older than the counters starts from a stored 0"""
+        self.create_content()
+        RegisteredUser.objects.filter(pk=self.user.pk).update(commentCount=0, answerCount=0)
+
+        # A hard delete and a soft delete through save(), the two decrementing paths
+        Answer.objects.filter(pk=self.answer.pk).delete()
+        self.comment.deleted_on = timezone.now()
+        self.comment.save()
+        user = RegisteredUser.objects.get(pk=self.user.pk)
+        self.assertEqual((user.commentCount, user.answerCount), (0, 0))
+
+    def test_rebuild_command(self):
+        self.create_content()
+        RegisteredUser.objects.update(postCount=0, commentCount=5)
+
+        call_command('rebuild_content_counts', stdout=StringIO())
+
+        user = RegisteredUser.objects.get(pk=self.user.pk)
+        self.assertEqual((user.postCount, user.commentCount), (1, 1))
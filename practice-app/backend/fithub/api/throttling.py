@@ -0,0 +1,169 @@
+"""
+Login lockouts and the login audit log.
+
+Lockout decisions read sliding windows of recent failure times, per user and
+per client address, kept in the shared cache so every worker sees the same
+windows. Failed attempts are written to LoginAttempt right away and drop the
+cached windows they belong to; the next check rebuilds a window from those
+rows, so failures handled by other workers always count. Successful attempts
+only feed the audit log and are written in batches.
+"""
+import atexit
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.utils import timezone
+
+from api.models import LoginAttempt
+
+logger = logging.getLogger(__name__)
+
+LOGIN_FAILURES_CACHE_PREFIX = 'login_failures'
+
+
+def _window():
+    return timedelta(minutes=settings.LOGIN_ATTEMPT_TIMEOUT)
+
+
+def _user_key(user_id):
+    return f"{LOGIN_FAILURES_CACHE_PREFIX}:user:{user_id}"
+
+
+def _ip_key(ip_address):
+    return f"{LOGIN_FAILURES_CACHE_PREFIX}:ip:{ip_address}"
+
+
+def get_client_ip(request):
+    """Address of the peer; forwarded headers are not trusted for lockouts"""
+    if request is None:
+        return None
+    return request.META.get('REMOTE_ADDR') or None
+
+
+def _recent(timestamps, now):
+    threshold = now - _window()
+    return [ts for ts in timestamps if ts > threshold]
+
+
+def _window_failures(key, now, **filters):
+    shared = caches['shared']
+    failures = shared.get(key)
+    if failures is None:
+        failures = list(
+            LoginAttempt.objects.filter(
+                successful=False, timestamp__gt=now - _window(), **filters
+            ).values_list('timestamp', flat=True)
+        )
+        shared.set(key, failures, timeout=settings.LOGIN_ATTEMPT_TIMEOUT * 60)
+    return _recent(failures, now)
+
+
+def _user_failures(user_id, now):
+    return _window_failures(_user_key(user_id), now, user_id=user_id)
+
+
+def _ip_failures(ip_address, now):
+    return _window_failures(_ip_key(ip_address), now, ip_address=ip_address)
+
+
+def is_ip_locked(ip_address):
+    if not ip_address:
+        return False
+    return len(_ip_failures(ip_address, timezone.now())) >= settings.LOGIN_ATTEMPT_IP_LIMIT
+
+
+def is_login_locked(user, ip_address=None):
+    """True when the user or the client address has too many recent failures"""
+    if len(_user_failures(user.pk, timezone.now())) >= settings.LOGIN_ATTEMPT_LIMIT:
+        return True
+    return is_ip_locked(ip_address)
+
+
+def record_login_attempt(user, successful, ip_address=None):
+    """Write a failure and drop its windows, or queue a success for the audit log"""
+    attempt = LoginAttempt(user=user, successful=successful, ip_address=ip_address, timestamp=timezone.now())
+    if successful:
+        login_audit.append(attempt)
+        return
+    attempt.save()
+    keys = [_user_key(user.pk)]
+    if ip_address:
+        keys.append(_ip_key(ip_address))
+    caches['shared'].delete_many(keys)
+
+
+def reset_login_failures(user_id):
+    caches['shared'].delete(_user_key(user_id))
+
+
+class LoginAuditBuffer:
+    """
+    Buffer of successful LoginAttempt rows written with bulk_create.
+
+    A batch is flushed once it holds LOGIN_AUDIT_BATCH_SIZE rows, by a timer
+    LOGIN_AUDIT_FLUSH_INTERVAL seconds after its first row, and when the
+    process exits. A batch that fails to write is kept for the next flush.
+    Rows still buffered when a process is killed are lost.
+    """
+    def __init__(self):
+        self._pending = []
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def append(self, attempt):
+        with self._lock:
+            self._pending.append(attempt)
+            due = len(self._pending) >= settings.LOGIN_AUDIT_BATCH_SIZE
+            if not due and self._timer is None:
+                self._timer = threading.Timer(settings.LOGIN_AUDIT_FLUSH_INTERVAL, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not batch:
+            return 0
+        try:
+            LoginAttempt.objects.bulk_create(batch)
+        except Exception:
+            with self._lock:
+                self._pending[:0] = batch
+            raise
+        return len(batch)
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Could not write buffered login attempts; keeping them for the next flush')
+        finally:
+            # The timer thread's connection would otherwise stay open
+            connections.close_all()
+
+
+login_audit = LoginAuditBuffer()
+
+
+def flush_login_audit():
+    """Write any buffered login attempts to the database"""
+    return login_audit.flush()
+
+
+@atexit.register
+def _flush_login_audit_at_exit():
+    try:
+        login_audit.flush()
+    except Exception:
+        logger.exception('Could not write %d buffered login attempts at exit', len(login_audit._pending))
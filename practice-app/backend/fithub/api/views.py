@@ -19,14 +19,24 @@ from rest_framework.authtoken.models import Token
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from .models import RegisteredUser, RecipeRating, HealthRating
+from .follows import get_followed_user_ids, toggle_follow
+from .summary import get_user_summary
+from .throttling import get_client_ip, is_ip_locked, is_login_locked, record_login_attempt
 from recipes.models import Recipe  # Import from recipes app
 from forum.models import ForumPost, ForumPostComment  # Import for posts and comments
 from qa.models import Question, Answer  # Import for questions and answers
+from forum.models import ForumPostVote, ForumPostCommentVote
+from qa.models import QuestionVote, AnswerVote
+from utils.votes import MAX_VOTE_LOOKUP_IDS, get_user_votes, parse_id_list
 from rest_framework import serializers
 import copy
 from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework.permissions import BasePermission
 from .serializers import HealthRatingSerializer
+from .serializers import RegisteredUserListSerializer, UserSummarySerializer, UserRecipeSummarySerializer
+from utils.pagination import StandardPagination
 
 
 from .serializers import (UserRegistrationSerializer, LoginSerializer, RequestPasswordResetCodeSerializer,
@@ -292,8 +302,6 @@ class ResetPasswordView(APIView):
             return Response({"detail": "Password has been successfully reset."}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-from .models import LoginAttempt
-
 class login_view(APIView):
     @swagger_auto_schema(
         request_body=LoginSerializer(),
@@ -305,7 +313,17 @@ class login_view(APIView):
         }
     )
     def post(self, request):
-        serializer = LoginSerializer(data=request.data)
+        ip_address = get_client_ip(request)
+        if is_ip_locked(ip_address):
+            return Response(
+                {
+                    "error": "Too many failed login attempts from this address. "
+                            f"Please try again in {settings.LOGIN_ATTEMPT_TIMEOUT} minutes."
+                },
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
+
+        serializer = LoginSerializer(data=request.data, context={'request': request})
         if not serializer.is_valid():
             # Check if the error is related to authentication (inactive, deleted, invalid credentials)
             # These should return 401 instead of 400
@@ -342,13 +360,8 @@ class login_view(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Check for too many failed attempts
-        recent_attempts = LoginAttempt.get_recent_attempts(
-            user, 
-            minutes=settings.LOGIN_ATTEMPT_TIMEOUT
-        )
-        
-        if recent_attempts >= settings.LOGIN_ATTEMPT_LIMIT:
+        # Check for too many failed attempts (sliding window kept in the cache)
+        if is_login_locked(user, ip_address):
             return Response(
                 {
                     "error": "Account temporarily locked due to too many failed attempts. "
@@ -360,7 +373,7 @@ class login_view(APIView):
         # Attempt authentication
         if serializer.validated_data.get('user') == user:
             # Successful login
-            LoginAttempt.objects.create(user=user, successful=True)
+            record_login_attempt(user, successful=True, ip_address=ip_address)
             token, _ = Token.objects.get_or_create(user=user)
             return Response({
                 'token': token.key,
@@ -370,9 +383,7 @@ class login_view(APIView):
                 'usertype': user.usertype,
             })
         else:
-            # Failed login
-            LoginAttempt.objects.create(user=user, successful=False)
-            print("Failed login attempt recorded.")
+            # Failed login (the serializer has already recorded the attempt)
             return Response(
                 {"error": "Invalid credentials"},
                 status=status.HTTP_401_UNAUTHORIZED
@@ -765,6 +776,77 @@ def get_user_answer_ids(request, user_id):
     return Response({"answer_ids": answer_ids}, status=status.HTTP_200_OK)
 
 
+@swagger_auto_schema(
+    method='GET',
+    operation_description="Content counts of a user (recipes, posts, comments, questions, answers) in one call, "
+                          "optionally with the newest ids of each type",
+    manual_parameters=[
+        openapi.Parameter(
+            name='user_id',
+            in_=openapi.IN_PATH,
+            description="User ID",
+            type=openapi.TYPE_INTEGER,
+            required=True
+        ),
+        openapi.Parameter(
+            name='include_ids',
+            in_=openapi.IN_QUERY,
+            description=f"Also return up to {settings.USER_SUMMARY_IDS_PAGE_SIZE} newest ids per content type",
+            type=openapi.TYPE_BOOLEAN,
+            required=False
+        )
+    ],
+    responses={
+        200: openapi.Response(
+            description="User content summary",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'user_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                    'counts': openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        additional_properties=openapi.Schema(type=openapi.TYPE_INTEGER),
+                        description='Number of live items per content type'
+                    ),
+                    'badge': openapi.Schema(type=openapi.TYPE_STRING, x_nullable=True),
+                    'ids': openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        additional_properties=openapi.Schema(
+                            type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)
+                        ),
+                        description='Newest ids per content type (only with include_ids=true)'
+                    ),
+                }
+            )
+        ),
+        404: openapi.Response(
+            description="User not found",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'error': openapi.Schema(type=openapi.TYPE_STRING)
+                }
+            )
+        )
+    }
+)
+@api_view(['GET'])
+def user_summary(request, user_id):
+    """
+    Everything a profile screen needs about a user's content in one round trip.
+    Counts come from the denormalized counters on RegisteredUser and the whole
+    response is cached per user until their content changes.
+    """
+    include_ids = request.query_params.get('include_ids', '').lower() == 'true'
+    summary = get_user_summary(user_id, include_ids=include_ids)
+    if summary is None:
+        return Response(
+            {"error": "User not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return Response(summary, status=status.HTTP_200_OK)
+
+
 @swagger_auto_schema(
     method='GET',
     operation_description="Get activity stream from all followed users",
@@ -848,8 +930,8 @@ def activity_stream(request):
     
     user = request.user
     
-    # Get list of followed user IDs
-    followed_user_ids = user.followedUsers.values_list('id', flat=True)
+    # Get list of followed user IDs (cached, invalidated on follow toggles)
+    followed_user_ids = get_followed_user_ids(user.id)
     
     if not followed_user_ids:
         # Return empty result if not following anyone
@@ -1030,6 +1112,81 @@ def activity_stream(request):
     })
 
 
+_vote_map_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    additional_properties=openapi.Schema(type=openapi.TYPE_STRING, enum=['up', 'down']),
+    description="Maps each voted id to its vote type; ids without a vote are omitted"
+)
+
+@swagger_auto_schema(
+    method='GET',
+    operation_description="Get the authenticated user's votes for a batch of forum posts, "
+                          "forum comments, questions and answers (one request per screen).",
+    manual_parameters=[
+        openapi.Parameter(name, openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                          description=f"Comma-separated ids (max {MAX_VOTE_LOOKUP_IDS})")
+        for name in ('post_ids', 'comment_ids', 'question_ids', 'answer_ids')
+    ],
+    responses={
+        200: openapi.Response(
+            description="Vote types keyed by id",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'posts': _vote_map_schema,
+                    'comments': _vote_map_schema,
+                    'questions': _vote_map_schema,
+                    'answers': _vote_map_schema,
+                }
+            )
+        ),
+        400: openapi.Response(description="Malformed id list or too many ids"),
+        401: openapi.Response(description="Unauthorized - authentication required")
+    },
+    security=[{"Bearer": []}],
+    tags=['User Actions']
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_votes(request):
+    """
+    Batch replacement for the per-item vote GET endpoints.
+    Runs at most one query per vote table.
+    """
+    lookups = {
+        'posts': ('post_ids', ForumPostVote, 'post'),
+        'comments': ('comment_ids', ForumPostCommentVote, 'comment'),
+        'questions': ('question_ids', QuestionVote, 'post'),
+        'answers': ('answer_ids', AnswerVote, 'comment'),
+    }
+
+    result = {}
+    for key, (param, vote_model, target_field) in lookups.items():
+        try:
+            ids = parse_id_list(request.query_params.get(param))
+        except ValueError as e:
+            return Response({"error": f"{param} {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        votes = get_user_votes(vote_model, target_field, request.user, ids)
+        result[key] = {str(target_id): vote_type for target_id, vote_type in votes.items()}
+
+    return Response(result, status=status.HTTP_200_OK)
+
+def _relation_count(through):
+    """Correlated COUNT over a user's M2M through table, 0 when empty"""
+    return Coalesce(
+        Subquery(
+            through.objects.filter(registereduser_id=OuterRef('pk'))
+            .order_by()
+            .values('registereduser_id')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0,
+    )
+
+_page_param = openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Page number")
+_page_size_param = openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Items per page (max 100)")
+
 class RegisteredUserViewSet(viewsets.ModelViewSet):
     parser_classes = [JSONParser, MultiPartParser, FormParser]
     queryset = RegisteredUser.objects.all()
@@ -1040,7 +1197,78 @@ class RegisteredUserViewSet(viewsets.ModelViewSet):
         # Use registration serializer for create to include password + image upload
         if self.action == 'create':
             return UserRegistrationSerializer
+        # Lists carry counts instead of unbounded relationship id lists
+        if self.action == 'list':
+            return RegisteredUserListSerializer
         return RegisteredUserSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # One query per page: follow counts are stored, the rest are subqueries
+            queryset = queryset.annotate(
+                bookmarkCount=_relation_count(RegisteredUser.bookmarkRecipes.through),
+                likedCount=_relation_count(RegisteredUser.likedRecipes.through),
+            ).order_by('pk')
+        return queryset
+
+    def _paginated_relation(self, request, queryset, serializer_class):
+        paginator = StandardPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = serializer_class(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        method='get',
+        operation_description="Paginated list of the recipes bookmarked by the user",
+        manual_parameters=[_page_param, _page_size_param],
+        responses={200: UserRecipeSummarySerializer(many=True)},
+        tags=["User Profile"]
+    )
+    @action(detail=True, methods=['get'])
+    def bookmarks(self, request, pk=None):
+        user = self.get_object()
+        recipes = Recipe.objects.filter(bookmarked_by=user).order_by('-pk')
+        return self._paginated_relation(request, recipes, UserRecipeSummarySerializer)
+
+    @swagger_auto_schema(
+        method='get',
+        operation_description="Paginated list of the recipes liked by the user",
+        manual_parameters=[_page_param, _page_size_param],
+        responses={200: UserRecipeSummarySerializer(many=True)},
+        tags=["User Profile"]
+    )
+    @action(detail=True, methods=['get'], url_path='liked-recipes')
+    def liked_recipes(self, request, pk=None):
+        user = self.get_object()
+        recipes = Recipe.objects.filter(liked_by=user).order_by('-pk')
+        return self._paginated_relation(request, recipes, UserRecipeSummarySerializer)
+
+    @swagger_auto_schema(
+        method='get',
+        operation_description="Paginated list of the users following the user",
+        manual_parameters=[_page_param, _page_size_param],
+        responses={200: UserSummarySerializer(many=True)},
+        tags=["User Profile"]
+    )
+    @action(detail=True, methods=['get'])
+    def followers(self, request, pk=None):
+        user = self.get_object()
+        users = RegisteredUser.objects.filter(followedUsers=user).order_by('pk')
+        return self._paginated_relation(request, users, UserSummarySerializer)
+
+    @swagger_auto_schema(
+        method='get',
+        operation_description="Paginated list of the users the user follows",
+        manual_parameters=[_page_param, _page_size_param],
+        responses={200: UserSummarySerializer(many=True)},
+        tags=["User Profile"]
+    )
+    @action(detail=True, methods=['get'])
+    def following(self, request, pk=None):
+        user = self.get_object()
+        users = RegisteredUser.objects.filter(followers=user).order_by('pk')
+        return self._paginated_relation(request, users, UserSummarySerializer)
     
     @swagger_auto_schema(tags=["User Profile"])
     def list(self, request, *args, **kwargs):
@@ -1205,27 +1433,16 @@ class RegisteredUserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Check if already following (using either side of the relationship)
-        already_following = current_user.followedUsers.filter(pk=target_user.pk).exists()
+        # Toggle the edge and both stored counters
+        status_msg = toggle_follow(current_user.id, target_user.id)
+        followers_count = RegisteredUser.objects.filter(pk=target_user.pk).values_list(
+            'followersCount', flat=True
+        ).get()
 
-        if already_following:
-            # Remove from both sides of the relationship
-            current_user.followedUsers.remove(target_user)
-            target_user.followers.remove(current_user)
-            status_msg = "unfollowed"
-        else:
-            # Add to both sides of the relationship
-            current_user.followedUsers.add(target_user)
-            target_user.followers.add(current_user)
-            status_msg = "followed"
-
-        # Refresh to get updated count
-        target_user.refresh_from_db()
-        
         return Response({
             "status": status_msg,
             "target_user_id": target_user.id,
-            "current_followers_count": target_user.followers.count()
+            "current_followers_count": followers_count
         })
 
     @swagger_auto_schema(
@@ -0,0 +1,19 @@
+"""
+Endpoint benchmarks with per-endpoint latency and query-count budgets.
+
+Run with:
+
+    FITHUB_BENCHMARKS=1 python manage.py test benchmarks
+
+The suite seeds a dataset (FITHUB_BENCHMARK_SIZE, see dataset.SIZES) into
+the SQLite test database, requests every endpoint of suite.ENDPOINTS through
+the Django test client and writes p50/p95 latency and SQL counts to
+FITHUB_BENCHMARK_RESULTS (benchmarks/results.json by default). Endpoints
+over their budget in budgets.json fail the run.
+
+benchmarks.micro times the model and serializer functions behind those
+endpoints on in-memory fixtures, see its docstring. The test runner only
+checks their allocations against the machine-specific baseline; timings are
+compared too with FITHUB_BENCHMARK_TIMINGS=1, allowing
+FITHUB_BENCHMARK_TOLERANCE (1.0 = 2x) over the baseline.
+"""
@@ -0,0 +1,103 @@
+import random
+from decimal import Decimal
+
+from api.models import RegisteredUser
+from forum.models import ForumPost, ForumPostComment, ForumPostVote
+from ingredients import catalog
+from ingredients.models import Ingredient
+from qa.models import Question
+from recipes.models import Recipe, RecipeIngredient
+
+SIZES = {
+    'small': {
+        'users': 10, 'ingredients': 30, 'recipes': 40, 'ingredients_per_recipe': 5,
+        'posts': 30, 'comments_per_post': 4, 'votes_per_post': 4, 'questions': 20, 'follows_per_user': 3,
+    },
+    'medium': {
+        'users': 50, 'ingredients': 100, 'recipes': 300, 'ingredients_per_recipe': 8,
+        'posts': 200, 'comments_per_post': 8, 'votes_per_post': 10, 'questions': 100, 'follows_per_user': 10,
+    },
+}
+
+# Quantity range per unit, small enough for the recipe's DecimalField totals
+UNITS = {'g': (10, 500), 'kg': (1, 2), 'pcs': (1, 6)}
+ALLERGENS = ('gluten', 'nuts', 'dairy', 'eggs')
+DIETARY_INFO = ('vegan', 'vegetarian', 'gluten-free')
+
+
+def seed_dataset(size, seed=0):
+    """
+    Create the benchmark dataset described by one of SIZES.
+    Returns the objects the endpoint paths are built from.
+    """
+    rng = random.Random(seed)
+
+    users = [
+        RegisteredUser.objects.create_user(
+            username=f'bench{i}', email=f'bench{i}@example.com', password='password'
+        )
+        for i in range(size['users'])
+    ]
+    for user in users:
+        others = [other for other in users if other.pk != user.pk]
+        user.followedUsers.add(*rng.sample(others, min(size['follows_per_user'], len(others))))
+
+    ingredients = Ingredient.objects.bulk_create([
+        Ingredient(
+            name=f'bench ingredient {i}',
+            allergens=rng.sample(ALLERGENS, rng.randint(0, 2)),
+            dietary_info=rng.sample(DIETARY_INFO, rng.randint(0, 2)),
+            calories=Decimal(rng.randint(10, 900)),
+            protein=Decimal(rng.randint(0, 40)),
+            fat=Decimal(rng.randint(0, 60)),
+            carbs=Decimal(rng.randint(0, 80)),
+            price_A101=Decimal(rng.randint(50, 5000)) / 100,
+            price_SOK=Decimal(rng.randint(50, 5000)) / 100,
+            price_BIM=Decimal(rng.randint(50, 5000)) / 100,
+            price_MIGROS=Decimal(rng.randint(50, 5000)) / 100,
+            base_unit='g',
+            base_quantity=Decimal('100'),
+            allowed_units=list(UNITS),
+        )
+        for i in range(size['ingredients'])
+    ])
+    catalog.ingredient_changed()  # bulk_create sends no post_save
+
+    recipes = []
+    for i in range(size['recipes']):
+        recipe = Recipe.objects.create(
+            name=f'Bench recipe {i}',
+            steps=['Prepare', 'Cook', 'Serve'],
+            prep_time=rng.randint(5, 60),
+            cook_time=rng.randint(5, 120),
+            meal_type=rng.choice(['breakfast', 'lunch', 'dinner']),
+            creator=rng.choice(users),
+        )
+        # Saved one by one so the cost and nutrition signals fill in the recipe
+        for ingredient in rng.sample(ingredients, size['ingredients_per_recipe']):
+            unit = rng.choice(list(UNITS))
+            RecipeIngredient.objects.create(
+                recipe=recipe, ingredient=ingredient,
+                quantity=Decimal(rng.randint(*UNITS[unit])), unit=unit,
+            )
+        recipes.append(recipe)
+
+    posts = []
+    for i in range(size['posts']):
+        post = ForumPost.objects.create(
+            author=rng.choice(users), title=f'Bench post {i}', content='content ' * 20,
+        )
+        for j in range(size['comments_per_post']):
+            ForumPostComment.objects.create(post=post, author=rng.choice(users), content=f'comment {j}')
+        voters = rng.sample(users, min(size['votes_per_post'], len(users)))
+        ForumPostVote.objects.bulk_create([
+            ForumPostVote(post=post, user=voter, vote_type=rng.choice(['up', 'down'])) for voter in voters
+        ])
+        posts.append(post)
+
+    questions = [
+        Question.objects.create(author=rng.choice(users), title=f'Bench question {i}', content='content')
+        for i in range(size['questions'])
+    ]
+
+    return {'users': users, 'recipes': recipes, 'posts': posts, 'questions': questions}
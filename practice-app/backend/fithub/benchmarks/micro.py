@@ -0,0 +1,247 @@
+"""
+Microbenchmarks of the model and serializer functions that dominate the
+recipe endpoints' CPU profiles, run on in-memory fixtures (no database).
+
+    python -m benchmarks.micro                    # compare with micro_baseline.json
+    python -m benchmarks.micro --update-baseline  # store this machine's numbers
+    python -m benchmarks.micro recipe.calculate_recipe_cost ...
+
+Each benchmark reports the best ns/op over several timing rounds and the
+peak memory allocated by one call (tracemalloc). A benchmark regresses when
+it is slower than the baseline by more than the tolerance, or allocates more
+than ALLOCATION_TOLERANCE above it. The timing baseline is machine
+specific; refresh it on the machine that compares against it. The test
+runner checks only allocations unless FITHUB_BENCHMARK_TIMINGS=1.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'micro_baseline.json')
+TARGET_ROUND_SECONDS = 0.1
+ROUNDS = 7
+DEFAULT_TOLERANCE = 0.25
+ALLOCATION_TOLERANCE = 0.10
+
+
+class _USDUser:
+    preferredCurrency = 'USD'
+    is_authenticated = False
+
+
+class _TRYUser:
+    preferredCurrency = 'TRY'
+    is_authenticated = True
+
+
+class _Request:
+    def __init__(self, user):
+        self.user = user
+
+
+def _prefetched(instance, name, rows):
+    # Serve instance.<name>.all() from memory, the way prefetch_related does
+    manager = getattr(instance, name)
+    queryset = manager.model.objects.none()
+    queryset._result_cache = list(rows)
+    queryset._prefetch_done = True
+    instance._prefetched_objects_cache = {**getattr(instance, '_prefetched_objects_cache', {}), name: queryset}
+
+
+def build_fixtures(ingredient_count=8):
+    """An in-memory recipe with ingredient_count lines over a small catalog"""
+    from api.models import RegisteredUser
+    from ingredients.models import Ingredient
+    from recipes.models import Recipe, RecipeIngredient
+
+    units = ['g', 'kg', 'pcs', 'ml', 'cup', 'tbsp']
+    ingredients = []
+    for i in range(ingredient_count):
+        liquid = i % 3 == 2
+        ingredients.append(Ingredient(
+            id=i + 1,
+            name=f'ingredient {i}',
+            allergens=['gluten', 'nuts', 'dairy'][:i % 3],
+            dietary_info=['vegan', 'vegetarian', 'gluten-free'][i % 2:],
+            calories=Decimal('120.50') + i, protein=Decimal('3.20'), fat=Decimal('1.10'), carbs=Decimal('20.75'),
+            price_A101=Decimal('12.40') + i, price_SOK=Decimal('11.95'), price_BIM=None, price_MIGROS=Decimal('13.10'),
+            base_currency='TRY' if i % 2 else 'USD',
+            base_unit='ml' if liquid else 'g',
+            base_quantity=Decimal('100'),
+            allowed_units=['ml', 'l', 'cup', 'tbsp'] if liquid else ['g', 'kg', 'pcs'],
+        ))
+
+    recipe = Recipe(
+        id=1, name='Benchmark recipe', steps=['Mix', 'Bake'], prep_time=10, cook_time=30,
+        meal_type='dinner', creator=RegisteredUser(id=1, username='bench'),
+    )
+    lines = []
+    for i, ingredient in enumerate(ingredients):
+        unit = ingredient.allowed_units[i % len(ingredient.allowed_units)]
+        lines.append(RecipeIngredient(
+            id=i + 1, recipe=recipe, ingredient=ingredient, quantity=Decimal(2 + i), unit=unit,
+        ))
+    _prefetched(recipe, 'recipe_ingredients', lines)
+    return {'ingredients': ingredients, 'recipe': recipe, 'lines': lines, 'units': units}
+
+
+def benchmarks(fixtures):
+    """name -> zero-argument callable"""
+    from ingredients.serializers import IngredientSerializer
+    from recipes.serializers import RecipeDetailSerializer, RecipeIngredientOutputSerializer, RecipeListSerializer
+
+    recipe = fixtures['recipe']
+    ingredient = fixtures['ingredients'][0]
+    usd, try_user = _USDUser(), _TRYUser()
+    request = _Request(try_user)
+
+    # A fresh context per call: serializers memoize per serialization (ingredients.memo)
+    def list_serializer():
+        return RecipeListSerializer(context={'request': request})
+
+    def detail_serializer():
+        return RecipeDetailSerializer(context={'request': request})
+
+    return {
+        'ingredient.convert_quantity_to_base': lambda: ingredient.convert_quantity_to_base(Decimal('1.5'), 'kg'),
+        'ingredient.get_price_for_user': lambda: ingredient.get_price_for_user(try_user, Decimal('250'), 'g'),
+        'ingredient.get_nutrion_info': lambda: ingredient.get_nutrion_info(Decimal('250'), 'g'),
+        'recipe.calculate_recipe_cost': lambda: recipe.calculate_recipe_cost(usd),
+        'recipe.calculate_cost_per_serving': lambda: recipe.calculate_cost_per_serving(usd),
+        'recipe.calculate_nutrition_info': recipe.calculate_nutrition_info,
+        'recipe.check_allergens': recipe.check_allergens,
+        'recipe.check_dietary_info': recipe.check_dietary_info,
+        'list_serializer.get_recipe_costs': lambda: list_serializer().get_recipe_costs(recipe),
+        'list_serializer.get_recipe_nutritions': lambda: list_serializer().get_recipe_nutritions(recipe),
+        'list_serializer.get_cost_per_serving': lambda: list_serializer().get_cost_per_serving(recipe),
+        'list_serializer.get_allergens': lambda: list_serializer().get_allergens(recipe),
+        'detail_serializer.get_recipe_costs': lambda: detail_serializer().get_recipe_costs(recipe),
+        'detail_serializer.get_recipe_nutritions': lambda: detail_serializer().get_recipe_nutritions(recipe),
+        'detail_serializer.get_cost_per_serving': lambda: detail_serializer().get_cost_per_serving(recipe),
+        'detail_serializer.get_allergens': lambda: detail_serializer().get_allergens(recipe),
+        'detail_serializer.get_dietary_info': lambda: detail_serializer().get_dietary_info(recipe),
+        'detail_serializer.get_ingredients': lambda: detail_serializer().get_ingredients(recipe),
+        'detail_serializer.data': lambda: RecipeDetailSerializer(recipe, context={'request': request}).data,
+        'detail_serializer.ingredient_lines': lambda: RecipeIngredientOutputSerializer(
+            fixtures['lines'], many=True, context={'request': request}
+        ).data,
+        'ingredient_serializer.row': lambda: IngredientSerializer(ingredient, context={'request': request}).data,
+    }
+
+
+def measure(function):
+    """(best ns per call, peak bytes allocated by one call)"""
+    function()  # Warm up lazy imports and caches
+    loops = 1
+    while True:
+        started = time.perf_counter_ns()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter_ns() - started
+        if elapsed >= TARGET_ROUND_SECONDS * 1e9:
+            break
+        loops *= 2
+    best = elapsed / loops
+    for _ in range(ROUNDS - 1):
+        started = time.perf_counter_ns()
+        for _ in range(loops):
+            function()
+        best = min(best, (time.perf_counter_ns() - started) / loops)
+
+    # A collection during the call would make the peak depend on whatever
+    # garbage the process held before, so the call runs without one
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return best, peak - before
+
+
+def run(names=None):
+    results = {}
+    for name, function in benchmarks(build_fixtures()).items():
+        if names and name not in names:
+            continue
+        ns_per_op, allocated = measure(function)
+        results[name] = {'ns_per_op': round(ns_per_op), 'peak_bytes': allocated}
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, check_time=True):
+    """
+    Adds baseline ratios to every result, returns the names that regressed.
+    With check_time=False only allocations count.
+    """
+    regressed = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        result['time_ratio'] = round(result['ns_per_op'] / reference['ns_per_op'], 2)
+        result['alloc_ratio'] = round(result['peak_bytes'] / max(reference['peak_bytes'], 1), 2)
+        slower = check_time and result['time_ratio'] > 1 + tolerance
+        if slower or result['alloc_ratio'] > 1 + ALLOCATION_TOLERANCE:
+            regressed.append(name)
+    return regressed
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, 'w') as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Model and serializer microbenchmarks')
+    parser.add_argument('names', nargs='*', help='only run these benchmarks')
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='allowed slowdown (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fithub.settings')
+    import django
+    django.setup()
+
+    results = run(args.names)
+    baseline = load_baseline()
+    regressed = compare(results, baseline, args.tolerance)
+    for name, result in results.items():
+        ratio = f"x{result['time_ratio']:.2f} time  x{result['alloc_ratio']:.2f} alloc" if 'time_ratio' in result else 'no baseline'
+        flag = '  REGRESSED' if name in regressed else ''
+        print(f"{name:42} {result['ns_per_op']:>10} ns/op  {result['peak_bytes']:>8} B peak  {ratio}{flag}")
+
+    if args.update_baseline:
+        save_baseline({**baseline, **results_without_ratios(results)})
+        print(f'Baseline written to {BASELINE_PATH}')
+        return 0
+    return 1 if regressed else 0
+
+
+def results_without_ratios(results):
+    return {
+        name: {'ns_per_op': result['ns_per_op'], 'peak_bytes': result['peak_bytes']}
+        for name, result in results.items()
+    }
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import json
+import statistics
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# name -> (path template filled from the seeded dataset, needs an authenticated client)
+ENDPOINTS = {
+    'recipe-list': ('/recipes/', False),
+    'recipe-detail': ('/recipes/{recipe}/', False),
+    'meal-planner': ('/recipes/meal_planner/', True),
+    'activity-stream': ('/api/activity-stream/', True),
+    'forum-post-list': ('/forum/posts/', False),
+    'forum-comment-list': ('/forum/posts/{post}/comments/', False),
+    'qa-question-list': ('/qa/questions/', False),
+    'ingredient-list': ('/ingredients/', False),
+    'analytics': ('/analytics/analytics/', False),
+}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(client, path, iterations):
+    """p50/p95 latency in ms and the SQL count of one request to path"""
+    client.get(path)  # Warm up: first-request imports and caches are not what we budget
+    timings = []
+    queries = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(path)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured.captured_queries))
+    return {
+        'path': path,
+        'status': response.status_code,
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'queries': max(queries),
+    }
+
+
+def run(anonymous, authenticated, dataset, iterations, endpoints=ENDPOINTS):
+    ids = {'recipe': dataset['recipes'][0].pk, 'post': dataset['posts'][0].pk}
+    return {
+        name: measure(authenticated if needs_auth else anonymous, template.format(**ids), iterations)
+        for name, (template, needs_auth) in endpoints.items()
+    }
+
+
+def check_budgets(results, budgets):
+    """Adds a 'violations' list to every result, returns the names of endpoints over budget"""
+    failed = []
+    for name, result in results.items():
+        budget = budgets.get(name, {})
+        violations = []
+        if result['status'] != 200:
+            violations.append(f"status {result['status']}")
+        if 'max_queries' in budget and result['queries'] > budget['max_queries']:
+            violations.append(f"{result['queries']} queries > {budget['max_queries']}")
+        if 'p95_ms' in budget and result['p95_ms'] > budget['p95_ms']:
+            violations.append(f"p95 {result['p95_ms']} ms > {budget['p95_ms']} ms")
+        result['budget'] = budget
+        result['violations'] = violations
+        if violations:
+            failed.append(name)
+    return failed
+
+
+def load_budgets(path):
+    with open(path) as budgets_file:
+        return json.load(budgets_file)
+
+
+def write_results(path, size, iterations, results):
+    with open(path, 'w') as results_file:
+        json.dump({'size': size, 'iterations': iterations, 'endpoints': results}, results_file, indent=2)
+        results_file.write('\n')
@@ -0,0 +1,63 @@
+import os
+import unittest
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from ingredients import catalog
+
+from . import micro, suite
+from .dataset import SIZES, seed_dataset
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@unittest.skipUnless(os.getenv('FITHUB_BENCHMARKS') == '1', 'set FITHUB_BENCHMARKS=1 to run the benchmarks')
+class EndpointBenchmarks(TestCase):
+    """Latency and query-count budgets of the main endpoints, see benchmarks/__init__.py"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.size = os.getenv('FITHUB_BENCHMARK_SIZE', 'small')
+        cls.dataset = seed_dataset(SIZES[cls.size])
+
+    def setUp(self):
+        # The seeded ingredients never commit here; serve the catalog the way production would
+        catalog.writes_committed()
+        self.addCleanup(catalog.bump_version)
+
+    def test_endpoints_within_budget(self):
+        anonymous = APIClient()
+        authenticated = APIClient()
+        token = Token.objects.create(user=self.dataset['users'][0])
+        authenticated.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        iterations = int(os.getenv('FITHUB_BENCHMARK_ITERATIONS', '20'))
+        results = suite.run(anonymous, authenticated, self.dataset, iterations)
+        budgets = suite.load_budgets(os.path.join(BENCHMARK_DIR, 'budgets.json'))[self.size]
+        failed = suite.check_budgets(results, budgets)
+        suite.write_results(
+            os.getenv('FITHUB_BENCHMARK_RESULTS', os.path.join(BENCHMARK_DIR, 'results.json')),
+            self.size, iterations, results,
+        )
+
+        for name, result in results.items():
+            print(f"{name:20} p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+                  f"{result['queries']:>4} queries  {', '.join(result['violations'])}")
+        self.assertEqual(failed, [], 'endpoints over budget, see the results file')
+
+
+@unittest.skipUnless(os.getenv('FITHUB_BENCHMARKS') == '1', 'set FITHUB_BENCHMARKS=1 to run the benchmarks')
+class MicroBenchmarks(SimpleTestCase):
+    """Model and serializer hot functions against micro_baseline.json, see benchmarks/micro.py"""
+
+    def test_no_regressions(self):
+        # Allocations hold on any machine; timings only mean something on the
+        # one that recorded the baseline, so they are opt-in (and get 2x by default)
+        check_time = os.getenv('FITHUB_BENCHMARK_TIMINGS') == '1'
+        tolerance = float(os.getenv('FITHUB_BENCHMARK_TOLERANCE', '1.0'))
+        results = micro.run()
+        regressed = micro.compare(results, micro.load_baseline(), tolerance, check_time=check_time)
+        self.assertEqual(regressed, [], {name: results[name] for name in regressed})
@@ -8,9 +8,49 @@ class TimestampedModel(models.Model):
     updated_at = models.DateTimeField(auto_now=True, null=True)
     deleted_on = models.DateTimeField(null=True, blank=True)
 
+    # Fields whose last loaded/saved values are remembered, so signal handlers
+    # can detect transitions (e.g. soft delete) without re-reading the row
+    tracked_fields = ('deleted_on',)
+
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_fields()
+        return instance
+
+    def _remember_tracked_fields(self, fields=None):
+        names = self.tracked_fields if fields is None else [f for f in self.tracked_fields if f in fields]
+        deferred = self.get_deferred_fields()
+        loaded = {
+            name: getattr(self, name)
+            for name in names
+            if self._meta.get_field(name).attname not in deferred
+        }
+        # Rebind instead of mutating: copies of an instance may share the dict
+        self._loaded_values = {**getattr(self, '_loaded_values', {}), **loaded}
+
+    def has_loaded_value(self, field_name):
+        return field_name in getattr(self, '_loaded_values', {})
+
+    def get_loaded_value(self, field_name):
+        """Value of a tracked field as last read from or written to the database"""
+        return self._loaded_values[field_name]
+
+    def set_loaded_value(self, field_name, value):
+        self._loaded_values = {**getattr(self, '_loaded_values', {}), field_name: value}
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save handlers have seen the old values by now
+        self._remember_tracked_fields(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._remember_tracked_fields(fields)
+
     def delete(self, using=None, keep_parents=False):
         self.deleted_on = timezone.now()
-        self.save()
\ No newline at end of file
+        self.save()
@@ -14,6 +14,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from datetime import timedelta
 from pathlib import Path
 import sys
+import tempfile
 from dotenv import load_dotenv
 import os
 import pymysql
@@ -67,6 +68,7 @@ INSTALLED_APPS = [
     'wikidata',    # Wikidata app
     'reports',   # Reports app
     'analytics',
+    'monitoring',  # Request timing and profiling
     'cloudinary',
     'cloudinary_storage',
 ]
@@ -87,8 +89,8 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,  # Number of items per page
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+        'api.authentication.CachedTokenAuthentication',
     ]
     # Removed throttling for now, can be added later if needed
     #'DEFAULT_THROTTLE_CLASSES': [
@@ -102,6 +104,58 @@ REST_FRAMEWORK = {
 }
 
 
+# Per-process cache of authenticated users (see api/authentication.py)
+AUTH_CACHE_TTL = 60  # seconds
+AUTH_CACHE_MAX_SIZE = 1024
+# Cached users recheck their auth version in the 'shared' cache at most this often, so a logout
+# or password change on another worker applies within it. Each check is one query on DatabaseCache
+AUTH_VERSION_CHECK_INTERVAL = 5  # seconds
+
+FOLLOW_CACHE_TTL = 300  # seconds a user's followed ids stay in the shared cache
+
+USER_SUMMARY_CACHE_TTL = 300  # seconds a user's content summary stays in the shared cache
+USER_SUMMARY_IDS_PAGE_SIZE = 20  # ids per content type returned with the summary
+
+INGREDIENT_CATALOG_TTL = 300  # seconds before a process reloads its ingredient catalog anyway
+INGREDIENT_LIST_CACHE_TTL = 300  # seconds a page of the ingredient list stays cached
+
+# Fraction of requests timed by monitoring.middleware.RequestTimingMiddleware (0 disables it)
+REQUEST_TIMING_SAMPLE_RATE = float(os.getenv('REQUEST_TIMING_SAMPLE_RATE', '0.1'))
+REQUEST_TIMING_WINDOW = 500  # samples kept per route for the percentiles
+
+# Staff requests with ?_profile=1 or an X-Profile header are profiled (monitoring.middleware)
+PROFILING_QUERY_PARAM = '_profile'
+PROFILING_INTERVAL = 0.005  # seconds between stack samples
+PROFILING_DIR = os.getenv('PROFILING_DIR', os.path.join(tempfile.gettempdir(), 'fithub-profiles'))
+
+# Fingerprinted SQL statistics of every statement (monitoring.querylog), off unless enabled
+QUERY_LOG_ENABLED = os.getenv('QUERY_LOG_ENABLED', 'False') == 'True'
+QUERY_LOG_SLOW_MS = float(os.getenv('QUERY_LOG_SLOW_MS', '100'))  # statements slower than this get an EXPLAIN
+QUERY_LOG_FLUSH_INTERVAL = 30  # seconds between writes of a process's statistics
+QUERY_LOG_DIR = os.getenv('QUERY_LOG_DIR', os.path.join(tempfile.gettempdir(), 'fithub-querylog'))
+
+# /metrics answers scrapes from these addresses, or with "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()]
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Structured request timing lines (monitoring.middleware) go to the console
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'monitoring': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),     # Default is 1 hour
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),     # Default is 1 day
@@ -137,21 +191,32 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',  # Example: Local memory cache
         # Or use other backends like Redis, Memcached
-    }
+    },
+    # State every worker must agree on: auth versions, login lockouts, the ingredient catalog version.
+    # The database table needs `python manage.py createcachetable`; memcached or Redis work as well,
+    # and spare the query each shared read costs with the database backend.
+    'shared': {
+        'BACKEND': os.environ.get('SHARED_CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.environ.get('SHARED_CACHE_LOCATION', 'fithub_shared_cache'),
+    },
 }
 
 # Session timeout settings
 SESSION_COOKIE_AGE = 1800  # 30 minutes in seconds
 SESSION_SAVE_EVERY_REQUEST = True
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
+SESSION_ACTIVITY_WRITE_INTERVAL = 60  # persist token last-seen at most once a minute
 
 MIDDLEWARE = [
+    'monitoring.middleware.RequestTimingMiddleware',  # First, so its total covers the whole stack
+    'monitoring.middleware.MetricsMiddleware',  # Prometheus latency and query histograms
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'monitoring.middleware.RequestProfilingMiddleware',  # Needs request.user
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'api.middleware.SessionTimeoutMiddleware',
@@ -270,6 +335,14 @@ SITE_DOMAIN = api_host if api_host else "http://localhost:8000"
 # Login attempt settings
 LOGIN_ATTEMPT_LIMIT = 5
 LOGIN_ATTEMPT_TIMEOUT = 15  # minutes
+LOGIN_ATTEMPT_IP_LIMIT = 50  # failed attempts per address within the same window
+LOGIN_AUDIT_BATCH_SIZE = 20  # LoginAttempt rows per bulk insert
+LOGIN_AUDIT_FLUSH_INTERVAL = 30  # seconds a buffered row may wait
+LOGIN_ATTEMPT_RETENTION_DAYS = 30  # used by the prune_login_attempts command
+
+if 'test' in sys.argv:
+    # Each test case rolls back, so buffered audit rows must not outlive it
+    LOGIN_AUDIT_BATCH_SIZE = 1
 
 # ...existing code...
 
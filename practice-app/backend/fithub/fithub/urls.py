@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from api.views import index
+from monitoring.views import metrics
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
@@ -54,5 +55,7 @@ urlpatterns = [
     path('qa/', include('qa.urls')),
     path('reports/', include('reports.urls')),
     path('analytics/', include('analytics.urls')),
+    path('monitoring/', include('monitoring.urls')),
+    path('metrics', metrics, name='prometheus-metrics'),  # Scraped by Prometheus
 
 ]
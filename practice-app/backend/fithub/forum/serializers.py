@@ -2,12 +2,13 @@
 from random import choice
 from django.forms import ValidationError
 from rest_framework import serializers
-from utils.models import CommentVoteModel, PostVoteModel
+from utils.models import COMMENT_MAX_LEVEL, CommentVoteModel, PostVoteModel
 from forum.models import ForumPost, ForumPostVote, ForumPostComment, ForumPostCommentVote
 import re
+from utils.votes import MyVoteSerializerMixin
 
 # Serializer for ForumPost
-class ForumPostSerializer(serializers.ModelSerializer):
+class ForumPostSerializer(MyVoteSerializerMixin, serializers.ModelSerializer):
     tags = serializers.ListField(child=serializers.CharField())
 
     class Meta:
@@ -91,13 +92,13 @@ class ForumPostVoteSerializer(serializers.ModelSerializer):
 ### SERIALIZERS FOR COMMENTS ###
 
 # Serializer for ForumPostComment
-class ForumPostCommentSerializer(serializers.ModelSerializer):
+class ForumPostCommentSerializer(MyVoteSerializerMixin, serializers.ModelSerializer):
     queryset = ForumPostComment.objects.filter(deleted_on__isnull=True)
 
     class Meta:
         model = ForumPostComment
-        fields = ['id', 'content', 'author', 'upvote_count', 'downvote_count', 'reported_count', 'created_at', 'updated_at', 'deleted_on']
-        read_only_fields = ['author', 'upvote_count', 'downvote_count', 'reported_count', 'created_at', 'updated_at', 'deleted_on']
+        fields = ['id', 'content', 'author', 'parent_comment', 'level', 'upvote_count', 'downvote_count', 'reported_count', 'created_at', 'updated_at', 'deleted_on']
+        read_only_fields = ['author', 'level', 'upvote_count', 'downvote_count', 'reported_count', 'created_at', 'updated_at', 'deleted_on']
 
     def validate(self, data):
         post = self.context.get('post')
@@ -111,6 +112,8 @@ class ForumPostCommentSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Cannot comment on a non-commentable post.")
         if parent_comment and parent_comment.post != post:
             raise serializers.ValidationError("Cannot reply to a comment from a different post.")
+        if parent_comment and parent_comment.level >= COMMENT_MAX_LEVEL:
+            raise serializers.ValidationError(f"Cannot reply more than {COMMENT_MAX_LEVEL} levels deep.")
         return data
 
     def create(self, validated_data):
@@ -0,0 +1,165 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api.models import RegisteredUser
+from forum.models import ForumPost, ForumPostComment
+from utils.models import COMMENT_MAX_LEVEL, COMMENT_PATH_MAX_LENGTH
+
+
+class CommentTreeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = RegisteredUser.objects.create_user(
+            username='threader',
+            email='threader@example.com',
+            password='threadpassword'
+        )
+        self.post = ForumPost.objects.create(
+            author=self.user,
+            title="Threaded Post",
+            content="Content for testing threads."
+        )
+        self.url = reverse('forumpostcomment-tree', args=[self.post.id])
+
+    def comment(self, parent=None, content="comment"):
+        return ForumPostComment.objects.create(
+            author=self.user, content=content, post=self.post, parent_comment=parent
+        )
+
+    def test_path_and_level_maintained_on_insert(self):
+        root = self.comment()
+        reply = self.comment(parent=root)
+        nested = self.comment(parent=reply)
+        nested.refresh_from_db()
+
+        self.assertEqual(root.path, f"{root.pk:010d}/")
+        self.assertEqual(nested.path, f"{root.pk:010d}/{reply.pk:010d}/{nested.pk:010d}/")
+        self.assertEqual(nested.level, 2)
+
+    def test_tree_is_nested_and_ordered(self):
+        first = self.comment(content="first")
+        second = self.comment(content="second")
+        reply_a = self.comment(parent=first, content="a")
+        reply_b = self.comment(parent=first, content="b")
+        nested = self.comment(parent=reply_a, content="a1")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 2)
+        threads = response.data['results']
+        self.assertEqual([t['id'] for t in threads], [first.id, second.id])
+        self.assertEqual([r['id'] for r in threads[0]['replies']], [reply_a.id, reply_b.id])
+        self.assertEqual(threads[0]['replies'][0]['replies'][0]['id'], nested.id)
+        self.assertEqual(threads[1]['replies'], [])
+
+    def test_tree_query_count_independent_of_size(self):
+        roots = [self.comment() for _ in range(3)]
+        for root in roots:
+            reply = self.comment(parent=root)
+            self.comment(parent=reply)
+
+        # post lookup, thread count, thread page, descendants
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+
+    def test_depth_limit_flags_truncated_nodes(self):
+        root = self.comment()
+        reply = self.comment(parent=root)
+        self.comment(parent=reply)
+
+        response = self.client.get(self.url, {'depth': 1})
+        reply_node = response.data['results'][0]['replies'][0]
+        self.assertEqual(reply_node['replies'], [])
+        self.assertTrue(reply_node['has_more_replies'])
+
+    def test_deleted_replies_are_hidden(self):
+        root = self.comment()
+        reply = self.comment(parent=root)
+        reply.delete()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['replies'], [])
+
+    def test_threads_paginated_by_root(self):
+        for _ in range(3):
+            root = self.comment()
+            self.comment(parent=root)
+
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(response.data['total'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(len(response.data['results'][0]['replies']), 1)
+
+    def test_tree_includes_replies_without_paths(self):
+        """Rows from before the path column, plus a newer reply under one of them"""
+        first = self.comment(content="first")
+        reply_b = self.comment(parent=first, content="b")
+        reply_a = self.comment(parent=first, content="a")
+        second = self.comment(content="second")
+        other = self.comment(parent=second, content="other")
+        ForumPostComment.objects.update(path='')
+        nested = self.comment(parent=ForumPostComment.objects.get(pk=reply_b.pk), content="b1")
+
+        response = self.client.get(self.url, {'page_size': 1})
+        thread = response.data['results'][0]
+        self.assertEqual([r['id'] for r in thread['replies']], [reply_b.id, reply_a.id])
+        self.assertEqual(thread['replies'][0]['replies'][0]['id'], nested.id)
+        self.assertNotIn(other.id, [r['id'] for r in thread['replies']])
+
+    def test_delete_without_paths_cascades_to_replies(self):
+        root = self.comment()
+        reply = self.comment(parent=root)
+        nested = self.comment(parent=reply)
+        ForumPostComment.objects.update(path='')
+
+        ForumPostComment.objects.get(pk=root.pk).delete()
+
+        for comment in (reply, nested):
+            comment.refresh_from_db()
+            self.assertIsNotNone(comment.deleted_on)
+
+    def test_backfill_rebuilds_paths(self):
+        root = self.comment()
+        reply = self.comment(parent=root)
+        ForumPostComment.objects.update(path='', level=0)
+
+        call_command('backfill_comment_paths', stdout=StringIO())
+
+        reply.refresh_from_db()
+        self.assertEqual(reply.path, f"{root.pk:010d}/{reply.pk:010d}/")
+        self.assertEqual(reply.level, 1)
+
+    def test_replies_beyond_max_level_rejected(self):
+        deepest = self.comment()
+        for _ in range(COMMENT_MAX_LEVEL):
+            deepest = self.comment(parent=deepest)
+        deepest.refresh_from_db()
+        self.assertLessEqual(len(deepest.path), COMMENT_PATH_MAX_LENGTH)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse('forumpostcomment-list-create', args=[self.post.id]),
+            {'content': "too deep", 'parent_comment': deepest.id},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ForumPostComment.objects.filter(content="too deep").exists())
+
+    def test_backfill_reattaches_replies_beyond_max_level(self):
+        chain = [self.comment()]
+        for _ in range(COMMENT_MAX_LEVEL):
+            chain.append(self.comment(parent=chain[-1]))
+        # A reply that got one level too deep before the limit existed
+        too_deep = ForumPostComment.objects.create(author=self.user, content="legacy", post=self.post)
+        ForumPostComment.objects.filter(pk=too_deep.pk).update(parent_comment=chain[-1], path='', level=0)
+
+        call_command('backfill_comment_paths', stdout=StringIO())
+
+        too_deep.refresh_from_db()
+        self.assertEqual(too_deep.parent_comment_id, chain[-2].pk)
+        self.assertEqual(too_deep.level, COMMENT_MAX_LEVEL)
+        self.assertLessEqual(len(too_deep.path), COMMENT_PATH_MAX_LENGTH)
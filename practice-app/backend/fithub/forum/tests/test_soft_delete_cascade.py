@@ -0,0 +1,97 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from api.models import RegisteredUser
+from forum.models import ForumPost, ForumPostComment, ForumPostCommentVote, ForumPostVote
+
+
+class SoftDeleteCascadeTests(TestCase):
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username='cascader',
+            email='cascader@example.com',
+            password='cascadepassword'
+        )
+        self.post = ForumPost.objects.create(
+            author=self.user,
+            title="Cascade Post",
+            content="Content for testing cascades."
+        )
+
+    def comment(self, parent=None):
+        return ForumPostComment.objects.create(
+            author=self.user, content="comment", post=self.post, parent_comment=parent
+        )
+
+    def build_thread(self, replies):
+        root = self.comment()
+        parent = root
+        for _ in range(replies):
+            parent = self.comment(parent=parent)
+            ForumPostCommentVote.objects.create(user=self.user, comment=parent, vote_type='up')
+        return root
+
+    def test_post_delete_cascades_to_comments_and_votes(self):
+        self.build_thread(3)
+        ForumPostVote.objects.create(user=self.user, post=self.post, vote_type='up')
+
+        self.post.delete()
+
+        stamp = ForumPost.objects.get(pk=self.post.pk).deleted_on
+        self.assertIsNotNone(stamp)
+        self.assertFalse(ForumPostComment.objects.exclude(deleted_on=stamp).exists())
+        self.assertFalse(ForumPostCommentVote.objects.exclude(deleted_on=stamp).exists())
+        self.assertFalse(ForumPostVote.objects.exclude(deleted_on=stamp).exists())
+
+    def test_statement_count_does_not_grow_with_comments(self):
+        self.build_thread(2)
+        # Warm up once so one-off setup writes (e.g. analytics rows) are not counted
+        self.post.delete()
+        self.post.restore()
+        with CaptureQueriesContext(connection) as small:
+            self.post.delete()
+
+        self.post.restore()
+        for _ in range(5):
+            self.build_thread(4)
+        with CaptureQueriesContext(connection) as large:
+            self.post.delete()
+
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_restore_skips_rows_deleted_earlier(self):
+        root = self.build_thread(1)
+        removed_earlier = self.comment(parent=root)
+        removed_earlier.delete()
+
+        self.post.delete()
+        self.post.restore()
+
+        self.assertIsNone(ForumPost.objects.get(pk=self.post.pk).deleted_on)
+        self.assertEqual(ForumPostComment.objects.filter(deleted_on__isnull=True).count(), 2)
+        self.assertIsNotNone(ForumPostComment.objects.get(pk=removed_earlier.pk).deleted_on)
+        self.assertFalse(ForumPostCommentVote.objects.filter(deleted_on__isnull=False).exists())
+
+    def test_comment_delete_cascades_to_nested_replies(self):
+        root = self.comment()
+        reply = self.comment(parent=root)
+        nested = self.comment(parent=reply)
+        sibling = self.comment()
+
+        reply.delete()
+
+        self.assertIsNone(ForumPostComment.objects.get(pk=root.pk).deleted_on)
+        self.assertIsNone(ForumPostComment.objects.get(pk=sibling.pk).deleted_on)
+        self.assertIsNotNone(ForumPostComment.objects.get(pk=nested.pk).deleted_on)
+
+        reply.restore()
+        self.assertFalse(ForumPostComment.objects.filter(deleted_on__isnull=False).exists())
+
+    def test_comment_delete_on_closed_post(self):
+        comment = self.comment()
+        self.post.is_commentable = False
+        self.post.save()
+
+        comment.delete()
+
+        self.assertIsNotNone(ForumPostComment.objects.get(pk=comment.pk).deleted_on)
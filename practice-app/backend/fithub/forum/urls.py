@@ -15,6 +15,11 @@ urlpatterns = [
         ForumPostCommentViewSet.as_view({'get': 'list', 'post': 'create'}),
         name='forumpostcomment-list-create'
     ),
+    path(
+        'posts/<int:post_id>/comments/tree/',
+        ForumPostCommentViewSet.as_view({'get': 'tree'}),
+        name='forumpostcomment-tree'
+    ),
     path(
         'posts/<int:post_id>/comments/<int:comment_id>/',
         ForumPostCommentViewSet.as_view({'get': 'retrieve', 'delete': 'destroy'}),
@@ -1,6 +1,8 @@
 # forum/views.py
 from rest_framework import viewsets
 from utils.pagination import StandardPagination
+from utils.votes import MyVoteListMixin
+from utils.comment_tree import comment_tree_response
 from forum.models import ForumPost, ForumPostVote, ForumPostComment, ForumPostCommentVote
 from forum.serializers import ForumPostSerializer, ForumPostVoteSerializer, ForumPostCommentSerializer, ForumPostCommentVoteSerializer
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
@@ -15,14 +17,17 @@ from drf_yasg.utils import swagger_auto_schema
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import permission_classes, action
 from django.utils.timezone import now
+from analytics.metrics import record_view
 
 
 
 @permission_classes([IsAuthenticatedOrReadOnly])
-class ForumPostViewSet(viewsets.ModelViewSet):
+class ForumPostViewSet(MyVoteListMixin, viewsets.ModelViewSet):
     queryset = ForumPost.objects.filter(deleted_on__isnull=True).order_by('-created_at') # Order by created_at descending (only non-deleted posts)
     serializer_class = ForumPostSerializer
     pagination_class = StandardPagination
+    vote_model = ForumPostVote
+    vote_target_field = 'post'
 
     http_method_names = ['get', 'post', 'put', 'delete']  # Disable PATCH
 
@@ -36,6 +41,7 @@ class ForumPostViewSet(viewsets.ModelViewSet):
         # Increment view count whenever a post is viewed
         post.view_count += 1
         post.save()
+        record_view()
 
         # Serialize and return the post
         serializer = self.get_serializer(post)
@@ -144,9 +150,11 @@ class ForumPostVoteView(APIView):
 ### VIEWS FOR COMMENTS ###
 
 @permission_classes([IsAuthenticatedOrReadOnly])
-class ForumPostCommentViewSet(viewsets.ModelViewSet):
+class ForumPostCommentViewSet(MyVoteListMixin, viewsets.ModelViewSet):
     serializer_class = ForumPostCommentSerializer
     pagination_class = StandardPagination
+    vote_model = ForumPostCommentVote
+    vote_target_field = 'comment'
 
     def get_queryset(self):
         """
@@ -201,6 +209,28 @@ class ForumPostCommentViewSet(viewsets.ModelViewSet):
 
         return self.get_paginated_response(serializer.data) if page else Response(serializer.data)
 
+    @swagger_auto_schema(
+        operation_description="List comment threads of a post as nested trees, paginated by top-level comment.",
+        manual_parameters=[
+            openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Page of top-level threads"),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Threads per page (max 100)"),
+            openapi.Parameter('depth', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Reply levels to include (default 3, max 10)"),
+        ],
+    )
+    def tree(self, request, *args, **kwargs):
+        """
+        Nested comment threads for a post, built from one query ordered by path.
+        """
+        post_id = self.kwargs.get('post_id')
+        post = get_object_or_404(ForumPost, id=post_id)
+
+        if post.deleted_on:
+            return Response({"detail": "Post is deleted."}, status=status.HTTP_404_NOT_FOUND)
+        if not post.is_commentable:
+            return Response({"detail": "Comments are disabled for this post."}, status=status.HTTP_403_FORBIDDEN)
+
+        return comment_tree_response(self, post.comments.filter(deleted_on__isnull=True))
+
     def retrieve(self, request, *args, **kwargs):
         """
         Get a single comment's details.
@@ -0,0 +1,24 @@
+# Read by gunicorn from the working directory (see Dockerfile.prod / docker-compose.yml).
+import os
+import shutil
+import tempfile
+
+# Workers keep their Prometheus metrics in mmap files here so /metrics can
+# merge them. prometheus_client picks its value class when it is first
+# imported, so this has to run before any import of it, including the one below
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'fithub-prometheus')
+)
+
+from prometheus_client import multiprocess  # noqa: E402
+
+
+def on_starting(server):
+    # Files left by a previous run would be merged into the new totals
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
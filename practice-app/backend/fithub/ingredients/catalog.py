@@ -0,0 +1,205 @@
+"""
+Process-wide snapshot of the ingredient catalog.
+
+The catalog is small and changes rarely, so each process keeps every
+ingredient in memory. Ingredients are indexed by id and by normalized name,
+and their fixed-point price and nutrient factors (see fixedpoint.py) are
+computed up front. Recipe cost, nutrition and ingredient lookups read from
+the snapshot instead of querying ingredients row by row.
+
+The snapshot's version is a token kept in the shared cache (the 'shared'
+alias, which every worker reads). Saving or deleting an Ingredient replaces
+the token once the transaction commits, and every process reloads when it
+sees a token other than its own. A thread reads the token once per request
+rather than on every lookup; outside requests it rereads it after
+INGREDIENT_CATALOG_TTL seconds. Each process also reloads after
+INGREDIENT_CATALOG_TTL seconds, which covers writes that bypass signals,
+such as QuerySet.update() or SQL imports. Call bump_version() after those.
+
+A thread that wrote an ingredient in a transaction that is still open
+gets no snapshot: get_catalog() returns None and callers fall back to the
+database, which sees the uncommitted rows.
+
+The snapshot's instances are shared between requests and must be treated
+as read-only.
+"""
+import threading
+import time
+import uuid
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from . import fixedpoint
+from .models import Ingredient
+
+CATALOG_VERSION_KEY = 'ingredient_catalog_version'
+
+_lock = threading.Lock()
+_snapshot = None
+_writes = threading.local()
+_seen = threading.local()
+
+
+def normalize_name(name):
+    """Collapse whitespace the way the by-name endpoints do"""
+    return ' '.join(name.strip().split())
+
+
+class IngredientCatalog:
+    """An immutable view of all ingredients at one catalog version"""
+
+    def __init__(self, version, ingredients):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        for ingredient in ingredients:
+            fixedpoint.snapshot(ingredient)
+        self.by_id = MappingProxyType({ingredient.pk: ingredient for ingredient in ingredients})
+        self.by_name = MappingProxyType({normalize_name(ingredient.name): ingredient for ingredient in ingredients})
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def get(self, pk):
+        return self.by_id.get(pk)
+
+    def find(self, name):
+        """Exact lookup of an already normalized name"""
+        return self.by_name.get(name)
+
+
+def current_version():
+    """The catalog version shared through the cache, read once per request"""
+    version = getattr(_seen, 'version', None)
+    if version is not None and time.monotonic() - _seen.at < settings.INGREDIENT_CATALOG_TTL:
+        return version
+    shared = caches['shared']
+    version = shared.get(CATALOG_VERSION_KEY)
+    if version is None:
+        shared.add(CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = shared.get(CATALOG_VERSION_KEY)
+    _remember_version(version)
+    return version
+
+
+def _remember_version(version):
+    _seen.version = version
+    _seen.at = time.monotonic()
+
+
+def forget_version(**kwargs):
+    """request_started receiver: the next lookup reads the shared version again"""
+    _seen.version = None
+
+
+def bump_version():
+    """Make every process reload its snapshot"""
+    global _snapshot
+    version = uuid.uuid4().hex
+    caches['shared'].set(CATALOG_VERSION_KEY, version, timeout=None)
+    _remember_version(version)
+    _snapshot = None
+
+
+def has_pending_writes():
+    """Whether this thread wrote ingredients in a transaction that is still open"""
+    if not getattr(_writes, 'pending', False):
+        return False
+    if transaction.get_connection().in_atomic_block:
+        return True
+    # The transaction was rolled back; a commit would have cleared the flag
+    _writes.pending = False
+    return False
+
+
+def _is_current(snapshot, version):
+    return (
+        snapshot is not None
+        and snapshot.version == version
+        and time.monotonic() - snapshot.loaded_at < settings.INGREDIENT_CATALOG_TTL
+    )
+
+
+def get_catalog():
+    """The current snapshot, or None while this thread has uncommitted ingredient writes"""
+    global _snapshot
+    if has_pending_writes():
+        return None
+    version = current_version()
+    snapshot = _snapshot
+    if not _is_current(snapshot, version):
+        with _lock:
+            snapshot = _snapshot
+            if not _is_current(snapshot, version):
+                snapshot = _snapshot = IngredientCatalog(version, list(Ingredient.objects.order_by('pk')))
+    return snapshot
+
+
+def ingredient_changed():
+    """
+    Record a write to the ingredient table: bump the version once it commits.
+    Bulk writes that send no signals must call this themselves.
+    """
+    if transaction.get_connection().in_atomic_block:
+        _writes.pending = True
+    transaction.on_commit(writes_committed)
+
+
+def writes_committed():
+    """Treat this thread's ingredient writes as committed and make every process reload"""
+    _writes.pending = False
+    bump_version()
+
+
+def get_ingredient(pk):
+    """The ingredient with this id, from the snapshot when possible"""
+    catalog = get_catalog()
+    ingredient = catalog.get(pk) if catalog is not None else None
+    if ingredient is None:
+        ingredient = Ingredient.objects.get(pk=pk)
+    return ingredient
+
+
+def get_ingredient_by_name(name):
+    """
+    The ingredient with this name, from the snapshot when possible. Names the
+    snapshot does not know are looked up in the database as before, so its
+    collation still decides those matches.
+    """
+    catalog = get_catalog()
+    ingredient = catalog.find(name) if catalog is not None else None
+    if ingredient is None:
+        ingredient = Ingredient.objects.get(name=name)
+    return ingredient
+
+
+def ingredient_exists(name):
+    catalog = get_catalog()
+    if catalog is not None and catalog.find(name) is not None:
+        return True
+    return Ingredient.objects.filter(name=name).exists()
+
+
+def attach_ingredients(lines):
+    """
+    Set each recipe line's ingredient from the snapshot unless already loaded,
+    and return the lines as a list. Lines the snapshot misses load as usual.
+    """
+    lines = list(lines)
+    if not lines:
+        return lines
+    field = type(lines[0]).ingredient.field
+    missing = [line for line in lines if not field.is_cached(line)]
+    catalog = get_catalog() if missing else None
+    if catalog is None:
+        return lines
+    for line in missing:
+        ingredient = catalog.get(line.ingredient_id)
+        if ingredient is not None:
+            field.set_cached_value(line, ingredient)
+    return lines
@@ -0,0 +1,202 @@
+"""
+Integer fixed-point core of the ingredient cost and nutrition math.
+
+Prices and nutrients per base unit are kept as integer micro-units (1e-6)
+in a __slots__ record cached on the ingredient, quantities are converted to
+micro-units of the base unit, and every result is an integer number of
+cents (0.01), rounded half-even like ``round(Decimal, 2)``. Decimals are
+only built at the boundary, by market_prices and nutrition_info.
+
+The results are exactly those of the Decimal arithmetic in Ingredient
+(_decimal_prices, _decimal_nutrition): that arithmetic is exact as long as
+no intermediate value needs more than 28 significant digits, and every
+input here must be representable in micro-units. When either does not hold
+(a base quantity of 3, a float quantity, huge values) the functions return
+None and the caller falls back to the Decimal code.
+"""
+from decimal import Decimal
+
+MARKETS = ("A101", "SOK", "BIM", "MIGROS")
+NUTRIENTS = ("calories", "protein", "fat", "carbs")
+
+MICRO = 10 ** 6
+# Decimal's default precision; below this no step of the Decimal math rounds
+EXACT_LIMIT = 10 ** 28
+# micro-units of price times micro-units of quantity, over cents
+PRODUCT_TO_CENTS_EXPONENT = 10
+
+_conversions = {}
+_rates = {}
+
+
+class FixedPointIngredient:
+    """An ingredient's prices and nutrients per base unit, in micro-units"""
+    __slots__ = ('key', 'prices', 'nutrients')
+
+    def __init__(self, key, prices, nutrients):
+        self.key = key
+        # None when some value is not representable in micro-units
+        self.prices = prices
+        self.nutrients = nutrients
+
+
+def _ratio(value):
+    if not isinstance(value, Decimal):
+        value = Decimal(value)
+    try:
+        return value.as_integer_ratio()
+    except (ValueError, OverflowError):
+        return None
+
+
+def _per_unit(values, base_quantity):
+    """Micro-units per base unit of every value (None stays None), or None if any is inexact"""
+    base = _ratio(base_quantity)
+    if base is None or base[0] <= 0:
+        return None
+    per_unit = []
+    for value in values:
+        if value is None:
+            per_unit.append(None)
+            continue
+        ratio = _ratio(value)
+        if ratio is None or ratio[0] < 0:
+            return None
+        scaled, remainder = divmod(ratio[0] * base[1] * MICRO, ratio[1] * base[0])
+        if remainder or scaled >= EXACT_LIMIT:
+            return None
+        per_unit.append(scaled)
+    return tuple(per_unit)
+
+
+def snapshot(ingredient):
+    """The ingredient's FixedPointIngredient, rebuilt whenever one of its fields changed"""
+    key = (
+        ingredient.base_quantity,
+        ingredient.price_A101, ingredient.price_SOK, ingredient.price_BIM, ingredient.price_MIGROS,
+        ingredient.calories, ingredient.protein, ingredient.fat, ingredient.carbs,
+    )
+    record = ingredient.__dict__.get('_fixed_point')
+    if record is None or record.key != key:
+        record = FixedPointIngredient(key, _per_unit(key[1:5], key[0]), _per_unit(key[5:], key[0]))
+        ingredient.__dict__['_fixed_point'] = record
+    return record
+
+
+def _conversion(ingredient_class, base_unit, unit):
+    """(numerator, denominator) turning a quantity in unit into base units, as in convert_quantity_to_base"""
+    key = (base_unit, unit)
+    if key not in _conversions:
+        conversions = ingredient_class.UNIT_CONVERSIONS
+        ratio = None
+        if unit == base_unit:
+            ratio = (1, 1)
+        elif unit in conversions.get(base_unit, {}):
+            numerator, denominator = Decimal(str(conversions[base_unit][unit])).as_integer_ratio()
+            ratio = (denominator, numerator)
+        else:
+            for u_from, mapping in conversions.items():
+                if base_unit in mapping and u_from == unit:
+                    ratio = Decimal(str(mapping[base_unit])).as_integer_ratio()
+                    break
+        _conversions[key] = ratio
+    return _conversions[key]
+
+
+def base_quantity_micro(ingredient, quantity, unit):
+    """quantity in unit as micro-units of the base unit, None when not exact or not convertible"""
+    conversion = _conversion(type(ingredient), ingredient.base_unit, unit)
+    ratio = _ratio(quantity)
+    if conversion is None or ratio is None or ratio[0] < 0:
+        return None
+    scaled, remainder = divmod(ratio[0] * conversion[0] * MICRO, ratio[1] * conversion[1])
+    if remainder or scaled >= EXACT_LIMIT:
+        return None
+    return scaled
+
+
+def _rate(base_currency, currency, usd_to_try_rate):
+    """The Decimal rate of get_price_for_user as (coefficient, exponent)"""
+    key = (base_currency, currency, usd_to_try_rate)
+    if key not in _rates:
+        rate = Decimal("1.0")
+        try_rate = Decimal(str(usd_to_try_rate))
+        if base_currency == "USD" and currency == "TRY":
+            rate = try_rate
+        elif base_currency == "TRY" and currency == "USD":
+            rate = Decimal("1.0") / try_rate
+        sign, digits, exponent = rate.as_tuple()
+        coefficient = int(''.join(map(str, digits)))
+        _rates[key] = None if sign or not isinstance(exponent, int) else (coefficient, exponent)
+    return _rates[key]
+
+
+def _scaled(per_unit, quantity, coefficient=1, exponent=0):
+    """
+    round(per_unit * quantity * coefficient * 10 ** exponent, 2) of every value
+    as cents, half-even, or None when the Decimal math would have rounded first
+    """
+    exponent -= PRODUCT_TO_CENTS_EXPONENT
+    shift, divisor = (10 ** exponent, 1) if exponent >= 0 else (1, 10 ** -exponent)
+    cents = []
+    for value in per_unit:
+        if value is None:
+            cents.append(None)
+            continue
+        product = value * quantity
+        scaled = product * coefficient
+        if product >= EXACT_LIMIT or scaled >= EXACT_LIMIT:
+            return None
+        whole, remainder = divmod(scaled * shift, divisor)
+        remainder *= 2
+        if remainder > divisor or (remainder == divisor and whole & 1):
+            whole += 1
+        if whole >= EXACT_LIMIT:
+            return None
+        cents.append(whole)
+    return tuple(cents)
+
+
+def price_cents(ingredient, currency, quantity, unit, usd_to_try_rate):
+    """Per-market cents of get_price_for_user, or None to fall back to Decimal"""
+    record = snapshot(ingredient)
+    if record.prices is None:
+        return None
+    rate = _rate(ingredient.base_currency, currency, usd_to_try_rate)
+    quantity = base_quantity_micro(ingredient, quantity, unit)
+    if rate is None or quantity is None:
+        return None
+    return _scaled(record.prices, quantity, *rate)
+
+
+def nutrition_cents(ingredient, quantity, unit):
+    """Per-nutrient hundredths of get_nutrion_info, or None to fall back to Decimal"""
+    record = snapshot(ingredient)
+    if record.nutrients is None:
+        return None
+    quantity = base_quantity_micro(ingredient, quantity, unit)
+    if quantity is None:
+        return None
+    return _scaled(record.nutrients, quantity)
+
+
+def to_decimal(cents):
+    return None if cents is None else Decimal(cents).scaleb(-2)
+
+
+def to_cents(value):
+    """A Decimal with at most 2 decimals (or None) as integer cents"""
+    return None if value is None else int(value.scaleb(2))
+
+
+def market_prices(currency, cents):
+    """The get_price_for_user dict"""
+    prices = {"currency": currency}
+    for market, value in zip(MARKETS, cents):
+        prices[market] = to_decimal(value)
+    return prices
+
+
+def nutrition_info(cents):
+    """The get_nutrion_info dict"""
+    return {nutrient: to_decimal(value) for nutrient, value in zip(NUTRIENTS, cents)}
@@ -0,0 +1,51 @@
+"""
+Cached pages of the ingredient list.
+
+A page is cached as its response data together with a strong ETag, keyed by
+the catalog version (see catalog.py), page, page size, currency and
+renderer. A catalog write changes the version, so pages of older versions
+are never served again and simply expire after INGREDIENT_LIST_CACHE_TTL.
+The ETag is a hash of the data, so a client revalidating with
+If-None-Match gets a 304 as long as its page did not change, even across
+catalog versions.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import parse_etags
+
+from monitoring.prometheus import record_cache_lookup
+
+INGREDIENT_LIST_CACHE_PREFIX = 'ingredient_list'
+
+
+def page_key(version, page, page_size, currency, renderer_format):
+    return f"{INGREDIENT_LIST_CACHE_PREFIX}:{version}:{page}:{page_size}:{currency}:{renderer_format}"
+
+
+def make_etag(data, renderer_format):
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    digest = hashlib.sha256(f"{renderer_format}:{body}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def get_page(key, build, renderer_format):
+    """(etag, data) of a page, calling build() for the data on a miss"""
+    cached = cache.get(key)
+    record_cache_lookup('ingredient_list', cached is not None)
+    if cached is None:
+        data = build()
+        cached = (make_etag(data, renderer_format), data)
+        cache.set(key, cached, timeout=settings.INGREDIENT_LIST_CACHE_TTL)
+    return cached
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match uses the weak comparison, so W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in (candidate.removeprefix('W/') for candidate in etags)
@@ -0,0 +1,66 @@
+"""
+Request-scoped memo of ingredient price and nutrition computations.
+
+A recipe response asks for the same (ingredient, quantity, unit, currency)
+result several times: per line, in the nested ingredient, and again in the
+recipe totals. Serializers share their context dict with the serializers
+nested in them, so a memo kept in the context computes each result once per
+response. It never outlives the serializer that created the context, so
+there is nothing to invalidate.
+"""
+from monitoring.prometheus import record_cache_lookup
+
+from . import fixedpoint
+
+CONTEXT_KEY = 'ingredient_memo'
+
+
+class IngredientMemo:
+    def __init__(self):
+        self._results = {}
+
+    @classmethod
+    def for_context(cls, context):
+        """The memo of this serialization, created on first use"""
+        memo = context.get(CONTEXT_KEY)
+        if memo is None:
+            memo = context[CONTEXT_KEY] = cls()
+        return memo
+
+    def lookup(self, key, compute):
+        try:
+            result = self._results[key]
+        except KeyError:
+            record_cache_lookup('serializer_memo', False)
+            result = self._results[key] = compute()
+        else:
+            record_cache_lookup('serializer_memo', True)
+        return result
+
+    def price_cents(self, ingredient, user, quantity, unit):
+        """Ingredient.price_cents, once per ingredient, quantity, unit and currency"""
+        currency = getattr(user, 'preferredCurrency', 'USD')
+        if ingredient.pk is None:
+            return ingredient.price_cents(currency, quantity=quantity, unit=unit)
+        return self.lookup(
+            ('prices', ingredient.pk, quantity, unit, currency),
+            lambda: ingredient.price_cents(currency, quantity=quantity, unit=unit),
+        )
+
+    def nutrition_cents(self, ingredient, quantity, unit):
+        """Ingredient.nutrition_cents, once per ingredient, quantity and unit"""
+        if ingredient.pk is None:
+            return ingredient.nutrition_cents(quantity=quantity, unit=unit)
+        return self.lookup(
+            ('nutrition', ingredient.pk, quantity, unit),
+            lambda: ingredient.nutrition_cents(quantity=quantity, unit=unit),
+        )
+
+    def prices(self, ingredient, user, quantity, unit):
+        """The get_price_for_user dict, built from the memoized cents"""
+        currency = getattr(user, 'preferredCurrency', 'USD')
+        return fixedpoint.market_prices(currency, self.price_cents(ingredient, user, quantity, unit))
+
+    def nutrition(self, ingredient, quantity, unit):
+        """The get_nutrion_info dict, built from the memoized hundredths"""
+        return fixedpoint.nutrition_info(self.nutrition_cents(ingredient, quantity, unit))
@@ -2,6 +2,7 @@ from django.db import models
 from core.models import TimestampedModel  
 from decimal import Decimal
 from django.core.exceptions import ValidationError
+from . import fixedpoint
 
 class Ingredient(TimestampedModel):
     CATEGORY_CHOICES = []
@@ -86,6 +87,17 @@ class Ingredient(TimestampedModel):
         return getattr(self, f"price_{market}", None)
 
     def get_nutrion_info(self, quantity=1, unit=None):
+        return fixedpoint.nutrition_info(self.nutrition_cents(quantity, unit))
+
+    def nutrition_cents(self, quantity=1, unit=None):
+        """get_nutrion_info as integer hundredths per nutrient (None when missing)"""
+        cents = fixedpoint.nutrition_cents(self, quantity, unit or self.base_unit)
+        if cents is None:
+            cents = tuple(map(fixedpoint.to_cents, self._decimal_nutrition(quantity, unit).values()))
+        return cents
+
+    # Reference implementation, used when the fixed-point core cannot be exact
+    def _decimal_nutrition(self, quantity=1, unit=None):
         base_qty = self.convert_quantity_to_base(quantity, unit or self.base_unit)
         
         def scale(nutrient):
@@ -104,6 +116,20 @@ class Ingredient(TimestampedModel):
     # Compute cost in user’s currency for given quantity/unit
     def get_price_for_user(self, user, quantity=1, unit=None, usd_to_try_rate=40.0):
         user_currency = getattr(user, "preferredCurrency", "USD")
+        return fixedpoint.market_prices(
+            user_currency, self.price_cents(user_currency, quantity, unit, usd_to_try_rate)
+        )
+
+    def price_cents(self, currency, quantity=1, unit=None, usd_to_try_rate=40.0):
+        """get_price_for_user as integer cents per market (None when the market has no price)"""
+        cents = fixedpoint.price_cents(self, currency, quantity, unit or self.base_unit, usd_to_try_rate)
+        if cents is None:
+            prices = self._decimal_prices(currency, quantity, unit, usd_to_try_rate)
+            cents = tuple(fixedpoint.to_cents(prices[market]) for market in fixedpoint.MARKETS)
+        return cents
+
+    # Reference implementation, used when the fixed-point core cannot be exact
+    def _decimal_prices(self, user_currency, quantity=1, unit=None, usd_to_try_rate=40.0):
         rate = Decimal("1.0")
         usd_to_try_rate = Decimal(str(usd_to_try_rate))
 
@@ -2,6 +2,7 @@
 from pyexpat import model
 from rest_framework import serializers
 from .models import Ingredient, WikidataInfo
+from .memo import IngredientMemo
 from rest_framework.pagination import PageNumberPagination  
 import math
 from rest_framework.response import Response
@@ -34,7 +35,7 @@ class IngredientSerializer(serializers.ModelSerializer):
         quantity = self.context.get("quantity", obj.base_quantity)
         unit = self.context.get("unit", obj.base_unit)
 
-        return obj.get_nutrion_info(quantity=quantity, unit=unit)
+        return IngredientMemo.for_context(self.context).nutrition(obj, quantity, unit)
     
     def get_prices(self, obj: Ingredient):
         """
@@ -52,7 +53,7 @@ class IngredientSerializer(serializers.ModelSerializer):
         quantity = self.context.get("quantity", obj.base_quantity)
         unit = self.context.get("unit", obj.base_unit)
 
-        return obj.get_price_for_user(user, quantity=quantity, unit=unit)
+        return IngredientMemo.for_context(self.context).prices(obj, user, quantity, unit)
 
 class IngredientPagination(PageNumberPagination):
     page_size = 10  # Default items per page
@@ -0,0 +1,26 @@
+from django.core.signals import request_started
+from django.db import DatabaseError
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from . import catalog
+from .models import Ingredient
+
+# Each request reads the shared catalog version afresh
+request_started.connect(catalog.forget_version, dispatch_uid='ingredients_catalog_request_started')
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def reload_catalog_on_change(sender, **kwargs):
+    catalog.ingredient_changed()
+
+
+@receiver(post_migrate, dispatch_uid='ingredients_catalog_post_migrate')
+def reload_catalog_on_migrate(sender, **kwargs):
+    # Also sent after flush, which empties the tables without model signals
+    try:
+        catalog.bump_version()
+    except DatabaseError:
+        # The first migrate runs before createcachetable; there is no snapshot to reload yet
+        pass
@@ -7,7 +7,7 @@ import json
 from unittest.mock import patch, Mock, MagicMock
 from rest_framework.test import APIClient, APITestCase
 from django.urls import reverse
-from django.core.cache import cache
+from django.core.cache import caches
 from rest_framework import status
 
 User = get_user_model()
@@ -354,3 +354,168 @@ class IngredientModelTests(TestCase):
         result = self.ingredient.get_price_for_user(user)
         self.assertEqual(result["currency"], "TRY")
 
+
+
+class FixedPointExactnessTests(TestCase):
+    """The fixed-point core returns exactly what the Decimal reference implementation does"""
+
+    BASE_QUANTITIES = ["1", "100", "100.00", "250", "0.5", "7.5", "1000", "3", "0.07"]
+    QUANTITIES = ["0.01", "0.35", "1", "2.5", "12.125", "200", "333.33", "12345.67"]
+    PRICES = [None, "0.01", "0.05", "2.50", "12.40", "13.05", "99999.99"]
+    NUTRIENTS = [None, "0.00", "0.15", "18.00", "364.00", "20.75"]
+    UNITS = {"g": ["g", "kg", "pcs"], "ml": ["ml", "l", "cup", "tbsp", "tsp"], "pcs": ["pcs", "g", "kg"], "cup": ["cup", "ml", "tbsp"]}
+
+    def ingredients(self):
+        import random
+        rng = random.Random(48)
+        for base_unit, units in self.UNITS.items():
+            for base_quantity in self.BASE_QUANTITIES:
+                for base_currency in ("USD", "TRY"):
+                    ingredient = Ingredient(
+                        id=rng.randint(1, 10 ** 6),
+                        base_unit=base_unit,
+                        base_quantity=Decimal(base_quantity),
+                        base_currency=base_currency,
+                        **{f"price_{market}": self.decimal(rng.choice(self.PRICES)) for market in ("A101", "SOK", "BIM", "MIGROS")},
+                        **{nutrient: self.decimal(rng.choice(self.NUTRIENTS)) for nutrient in ("calories", "protein", "fat", "carbs")},
+                    )
+                    yield ingredient, units
+
+    @staticmethod
+    def decimal(value):
+        return None if value is None else Decimal(value)
+
+    @staticmethod
+    def exact(values):
+        # Decimal("1.0") == Decimal("1.00"); the representation must match too
+        return {key: None if value is None else str(value) for key, value in values.items()}
+
+    def test_prices_match_decimal_reference(self):
+        from ingredients import fixedpoint
+        fast = 0
+        for ingredient, units in self.ingredients():
+            for unit in units:
+                for quantity in self.QUANTITIES:
+                    for currency in ("USD", "TRY"):
+                        user = Mock(preferredCurrency=currency)
+                        expected = ingredient._decimal_prices(currency, Decimal(quantity), unit)
+                        actual = ingredient.get_price_for_user(user, quantity=Decimal(quantity), unit=unit)
+                        self.assertEqual(self.exact(actual), self.exact(expected), (ingredient.base_quantity, quantity, unit))
+                        fast += fixedpoint.price_cents(ingredient, currency, Decimal(quantity), unit, 40.0) is not None
+        # Most of the grid runs on the integer path, the rest falls back
+        self.assertGreater(fast, 1000)
+
+    def test_nutrition_matches_decimal_reference(self):
+        from ingredients import fixedpoint
+        fast = 0
+        for ingredient, units in self.ingredients():
+            for unit in units:
+                for quantity in self.QUANTITIES:
+                    expected = ingredient._decimal_nutrition(Decimal(quantity), unit)
+                    actual = ingredient.get_nutrion_info(quantity=Decimal(quantity), unit=unit)
+                    self.assertEqual(self.exact(actual), self.exact(expected), (ingredient.base_quantity, quantity, unit))
+                    fast += fixedpoint.nutrition_cents(ingredient, Decimal(quantity), unit) is not None
+        self.assertGreater(fast, 500)
+
+    def test_rounds_half_even_like_decimal(self):
+        ingredient = Ingredient(id=1, base_unit="g", base_quantity=Decimal("100"), price_A101=Decimal("0.01"), calories=Decimal("0.03"))
+        # 0.005 and 0.015 are exact ties
+        for quantity, expected in (("50", "0.00"), ("150", "0.02"), ("250", "0.02"), ("51", "0.01")):
+            prices = ingredient.get_price_for_user(Mock(preferredCurrency="USD"), quantity=Decimal(quantity), unit="g")
+            self.assertEqual(str(prices["A101"]), expected)
+            self.assertEqual(prices, ingredient._decimal_prices("USD", Decimal(quantity), "g"))
+
+    def test_float_and_string_quantities_fall_back(self):
+        ingredient = Ingredient(id=1, base_unit="g", base_quantity=Decimal("3"), price_A101=Decimal("1.00"), calories=Decimal("1.00"))
+        for quantity in (0.1, "2.5", 4):
+            self.assertEqual(
+                ingredient.get_price_for_user(Mock(preferredCurrency="TRY"), quantity=quantity, unit="kg"),
+                ingredient._decimal_prices("TRY", quantity, "kg"),
+            )
+            self.assertEqual(ingredient.get_nutrion_info(quantity=quantity, unit="kg"), ingredient._decimal_nutrition(quantity, "kg"))
+
+    def test_snapshot_follows_field_changes(self):
+        ingredient = Ingredient(id=1, base_unit="g", base_quantity=Decimal("100"), price_A101=Decimal("2.00"))
+        user = Mock(preferredCurrency="USD")
+        self.assertEqual(ingredient.get_price_for_user(user, quantity=Decimal("50"), unit="g")["A101"], Decimal("1.00"))
+        ingredient.price_A101 = Decimal("4.00")
+        self.assertEqual(ingredient.get_price_for_user(user, quantity=Decimal("50"), unit="g")["A101"], Decimal("2.00"))
+
+    def test_invalid_conversion_still_raises(self):
+        ingredient = Ingredient(id=1, name="Rice", base_unit="g", base_quantity=Decimal("100"), price_A101=Decimal("1.00"))
+        with self.assertRaises(ValidationError):
+            ingredient.get_price_for_user(Mock(preferredCurrency="USD"), quantity=1, unit="ml")
+
+
+class IngredientCatalogTests(TestCase):
+    """The process-wide ingredient snapshot of ingredients/catalog.py"""
+
+    def setUp(self):
+        from api.models import RegisteredUser
+        from ingredients import catalog
+        from recipes.models import Recipe, RecipeIngredient
+        self.catalog = catalog
+        self.tomato = Ingredient.objects.create(
+            name="Tomato", base_unit="g", base_quantity=Decimal("100"), allowed_units=["g", "kg"],
+            calories=Decimal("18.0"), price_A101=Decimal("1.50"), allergens=[], dietary_info=["vegan"],
+        )
+        self.rice = Ingredient.objects.create(
+            name="Rice", base_unit="g", base_quantity=Decimal("100"), allowed_units=["g", "kg"],
+            calories=Decimal("130.0"), price_A101=Decimal("0.80"), allergens=["gluten"], dietary_info=["vegan"],
+        )
+        user = RegisteredUser.objects.create_user(username="cook", email="cook@example.com", password="pass12345")
+        self.recipe = Recipe.objects.create(
+            name="Tomato rice", steps=["Cook"], prep_time=5, cook_time=20, meal_type="dinner", creator=user,
+        )
+        RecipeIngredient.objects.create(recipe=self.recipe, ingredient=self.tomato, quantity=Decimal("200"), unit="g")
+        RecipeIngredient.objects.create(recipe=self.recipe, ingredient=self.rice, quantity=Decimal("1"), unit="kg")
+        # The test transaction never commits; treat the fixtures as committed
+        catalog.writes_committed()
+        self.addCleanup(catalog.writes_committed)
+
+    def test_lookups_are_served_from_the_snapshot(self):
+        snapshot = self.catalog.get_catalog()
+        self.assertEqual(len(snapshot), 2)
+        with self.assertNumQueries(0):
+            self.assertIs(self.catalog.get_catalog(), snapshot)
+            self.assertEqual(self.catalog.get_ingredient(self.tomato.pk).name, "Tomato")
+            self.assertEqual(self.catalog.get_ingredient_by_name("Rice").pk, self.rice.pk)
+            self.assertTrue(self.catalog.ingredient_exists("Tomato"))
+
+    def test_unknown_names_fall_back_to_the_database(self):
+        self.catalog.get_catalog()
+        with self.assertNumQueries(1):
+            with self.assertRaises(Ingredient.DoesNotExist):
+                self.catalog.get_ingredient_by_name("Saffron")
+
+    def test_recipe_totals_read_ingredients_from_the_snapshot(self):
+        from recipes.models import Recipe
+        expected_cost = self.recipe.calculate_recipe_cost(Mock(preferredCurrency="USD"))
+        self.catalog.get_catalog()
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        # One query for the recipe lines each; none per ingredient
+        with self.assertNumQueries(4):
+            self.assertEqual(recipe.calculate_recipe_cost(Mock(preferredCurrency="USD")), expected_cost)
+            self.assertEqual(recipe.calculate_nutrition_info()["calories"], Decimal("1336.00"))
+            self.assertEqual(recipe.check_allergens(), ["gluten"])
+            self.assertEqual(recipe.check_dietary_info(), ["vegan"])
+
+    def test_write_hides_the_snapshot_until_it_commits(self):
+        snapshot = self.catalog.get_catalog()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tomato.price_A101 = Decimal("3.00")
+            self.tomato.save()
+            self.assertIsNone(self.catalog.get_catalog())
+            self.assertEqual(self.catalog.get_ingredient(self.tomato.pk).price_A101, Decimal("3.00"))
+        reloaded = self.catalog.get_catalog()
+        self.assertNotEqual(reloaded.version, snapshot.version)
+        self.assertEqual(reloaded.get(self.tomato.pk).price_A101, Decimal("3.00"))
+
+    def test_version_change_from_another_process_reloads(self):
+        snapshot = self.catalog.get_catalog()
+        caches['shared'].set(self.catalog.CATALOG_VERSION_KEY, "other-process")
+        # Still this request's version until the next one starts
+        self.assertIs(self.catalog.get_catalog(), snapshot)
+        self.catalog.forget_version()
+        self.assertIsNot(self.catalog.get_catalog(), snapshot)
+        self.assertEqual(self.catalog.get_catalog().version, "other-process")
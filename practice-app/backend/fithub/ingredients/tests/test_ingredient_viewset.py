@@ -140,3 +140,70 @@ class IngredientViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("error", response.data)
 
+
+
+class IngredientListCacheTests(APITestCase):
+    """Cached, ETag-versioned pages of the ingredient list"""
+
+    def setUp(self):
+        from ingredients import catalog
+        self.catalog = catalog
+        self.url = reverse("ingredient-list")
+        self.apple = Ingredient.objects.create(
+            name="Apple", base_unit="pcs", base_quantity=Decimal("1.0"), price_A101=Decimal("0.50")
+        )
+        Ingredient.objects.create(name="Banana", base_unit="pcs", base_quantity=Decimal("1.0"))
+        # The test transaction never commits; treat the fixtures as committed
+        catalog.writes_committed()
+        self.addCleanup(catalog.writes_committed)
+
+    def test_repeated_requests_are_served_from_the_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertTrue(first["ETag"].startswith('"'))
+        # Only the shared catalog version is read
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response.content, b"")
+            self.assertEqual(response["ETag"], etag)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_pages_and_page_sizes_are_cached_separately(self):
+        page_one = self.client.get(self.url, {"page_size": 1})
+        page_two = self.client.get(self.url, {"page_size": 1, "page": 2})
+        self.assertEqual(page_one.data["results"][0]["name"], "Apple")
+        self.assertEqual(page_two.data["results"][0]["name"], "Banana")
+        self.assertNotEqual(page_one["ETag"], page_two["ETag"])
+        self.assertEqual(len(self.client.get(self.url).data["results"]), 2)
+
+    def test_currency_is_part_of_the_key(self):
+        User = get_user_model()
+        user = User.objects.create_user(username="lira", email="lira@example.com", password="pass12345")
+        user.preferredCurrency = "TRY"
+        user.save()
+        anonymous = self.client.get(self.url)
+        self.client.force_authenticate(user)
+        priced = self.client.get(self.url)
+        self.assertEqual(priced.data["results"][0]["prices"]["currency"], "TRY")
+        self.assertNotEqual(priced["ETag"], anonymous["ETag"])
+
+    def test_catalog_write_changes_the_page(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.apple.price_A101 = Decimal("0.75")
+            self.apple.save()
+            # Uncommitted writes of this thread bypass the cache
+            self.assertNotIn("ETag", self.client.get(self.url))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["prices"]["A101"], Decimal("0.75"))
+        self.assertNotEqual(response["ETag"], etag)
@@ -5,6 +5,8 @@ from rest_framework import mixins, viewsets
 from drf_yasg import openapi
 import requests
 from drf_yasg.utils import swagger_auto_schema
+from django.utils.cache import patch_vary_headers
+from . import catalog, list_cache
 from .models import Ingredient, WikidataInfo
 from .serializers import IngredientSerializer, IngredientPagination, WikidataInfoSerializer
 from wikidata.utils import get_wikidata_id, get_wikidata_details  # Import from the wikidata app
@@ -18,6 +20,44 @@ class IngredientViewSet(mixins.ListModelMixin,
     serializer_class = IngredientSerializer
     pagination_class = IngredientPagination
 
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                'If-None-Match',
+                openapi.IN_HEADER,
+                description="ETag of a previously fetched page",
+                type=openapi.TYPE_STRING,
+                required=False
+            )
+        ],
+        responses={304: openapi.Response(description='Page unchanged since the given ETag')},
+    )
+    def list(self, request, *args, **kwargs):
+        # Pages are cached per catalog version; skip that while this thread's writes are uncommitted
+        if request.accepted_renderer.format != 'json' or catalog.has_pending_writes():
+            return super().list(request, *args, **kwargs)
+
+        user = request.user
+        currency = getattr(user, 'preferredCurrency', 'USD') if user.is_authenticated else 'USD'
+        key = list_cache.page_key(
+            catalog.current_version(),
+            request.query_params.get(self.paginator.page_query_param, '1'),
+            self.paginator.get_page_size(request),
+            currency,
+            request.accepted_renderer.format,
+        )
+        etag, data = list_cache.get_page(
+            key, lambda: super(IngredientViewSet, self).list(request, *args, **kwargs).data, request.accepted_renderer.format
+        )
+
+        if list_cache.etag_matches(request.META.get('HTTP_IF_NONE_MATCH'), etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
     # Function to get the Ingredient (all fields) by name
     @swagger_auto_schema(
         method='get',
@@ -41,7 +81,7 @@ class IngredientViewSet(mixins.ListModelMixin,
         name = ' '.join(name.strip().split())  # Normalize whitespace (remove extra spaces after, before, and between words)
 
         try:
-            ingredient = Ingredient.objects.get(name=name)
+            ingredient = catalog.get_ingredient_by_name(name)
             serializer = self.serializer_class(ingredient)
             return Response(serializer.data)
         except Ingredient.DoesNotExist:
@@ -71,7 +111,7 @@ class IngredientViewSet(mixins.ListModelMixin,
         name = ' '.join(name.strip().split())  # Normalize whitespace (remove extra spaces after, before, and between words)
 
         try:
-            ingredient = Ingredient.objects.get(name=name)
+            ingredient = catalog.get_ingredient_by_name(name)
             return Response({'id': ingredient.id})
         except Ingredient.DoesNotExist:
             return Response({'error': 'Ingredient not found.'}, status=status.HTTP_404_NOT_FOUND)
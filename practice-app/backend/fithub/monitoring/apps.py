@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'monitoring'
+
+    # Hook serializer timing into DRF once the apps are loaded
+    def ready(self):
+        from monitoring.timing import instrument_serializers
+        instrument_serializers()
+        import monitoring.signals  # Soft delete, vote and rating counters for /metrics
+
+        from django.conf import settings
+        if settings.QUERY_LOG_ENABLED:
+            from django.db.backends.signals import connection_created
+            from monitoring.querylog import install
+            connection_created.connect(install, dispatch_uid='monitoring_query_log')
@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from monitoring.profiling import delete_artifact, list_artifacts
+
+
+class Command(BaseCommand):
+    help = 'Lists or prunes the request profiles stored in PROFILING_DIR'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['list', 'prune'])
+        parser.add_argument(
+            '--days', type=float, default=7,
+            help='prune: delete profiles older than this many days'
+        )
+        parser.add_argument(
+            '--keep', type=int, default=None,
+            help='prune: also keep at most this many of the newest profiles'
+        )
+
+    def handle(self, *args, **options):
+        artifacts = list_artifacts()
+        if options['action'] == 'list':
+            if not artifacts:
+                self.stdout.write(f'No profiles in {settings.PROFILING_DIR}')
+            for name, _, metadata in artifacts:
+                self.stdout.write(
+                    f"{name}  {metadata.get('method', '?')} {metadata.get('route', '?')}  "
+                    f"{metadata.get('duration_ms', '?')} ms  {metadata.get('samples', '?')} samples  "
+                    f"{len(metadata.get('queries', []))} queries"
+                )
+            return
+
+        cutoff = time.time() - options['days'] * 86400
+        keep = options['keep']
+        deleted = 0
+        for index, (name, modified, _) in enumerate(artifacts):
+            if modified < cutoff or (keep is not None and index >= keep):
+                delete_artifact(name)
+                deleted += 1
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} profiles'))
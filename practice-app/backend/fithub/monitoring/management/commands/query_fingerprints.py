@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from monitoring.querylog import clear_fingerprints, load_fingerprints
+
+SORT_KEYS = {
+    'total': lambda entry: entry['total_ms'],
+    'count': lambda entry: entry['count'],
+    'worst': lambda entry: entry['worst_ms'],
+    'avg': lambda entry: entry['total_ms'] / entry['count'],
+}
+
+
+class Command(BaseCommand):
+    help = 'Prints the SQL fingerprints with the most time spent, merged from QUERY_LOG_DIR'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='number of fingerprints to print')
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='total')
+        parser.add_argument(
+            '--explain', action='store_true',
+            help='also print the worst sample and its EXPLAIN output'
+        )
+        parser.add_argument('--clear', action='store_true', help='delete the stored statistics')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            removed = clear_fingerprints()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {removed} query log files'))
+            return
+
+        fingerprints = load_fingerprints()
+        if not fingerprints:
+            self.stdout.write(f'No query statistics in {settings.QUERY_LOG_DIR}')
+            return
+
+        key = SORT_KEYS[options['sort']]
+        ranked = sorted(fingerprints.items(), key=lambda item: key(item[1]), reverse=True)
+        for sql, entry in ranked[:options['limit']]:
+            self.stdout.write(
+                f"{entry['count']:>8} calls  {entry['total_ms']:>10.1f} ms total  "
+                f"{entry['total_ms'] / entry['count']:>8.2f} ms avg  {entry['worst_ms']:>8.1f} ms worst"
+            )
+            self.stdout.write(f"    {sql}")
+            if options['explain']:
+                self.stdout.write(f"    worst: {entry.get('sql', '')}  params={entry.get('params', '')}")
+                for line in entry.get('explain', []):
+                    self.stdout.write(f"      {line}")
+        self.stdout.write(self.style.SUCCESS(f'{len(fingerprints)} fingerprints'))
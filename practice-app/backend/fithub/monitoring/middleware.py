@@ -0,0 +1,164 @@
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .profiling import QueryRecorder, StackSampler, write_artifact
+from .prometheus import REQUEST_LATENCY, REQUEST_QUERIES, QueryCounter
+from .timing import RequestTimer, route_stats
+
+logger = logging.getLogger('monitoring.timing')
+
+
+def _route_pattern(request):
+    # The URL pattern, not the path, so ids do not create a route per object
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    # Router patterns are regexes; drop the anchors so routes read like paths
+    return '/' + match.route.replace('^', '').replace('$', '')
+
+
+def _route(request):
+    return f"{request.method} {_route_pattern(request)}"
+
+
+class MetricsMiddleware:
+    """
+    Feeds the latency and SQL count histograms of monitoring.prometheus for
+    every request. Only a statement counter is hooked into the connections,
+    so this stays cheap enough to run unsampled.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        labels = {'method': request.method, 'route': _route_pattern(request)}
+        REQUEST_LATENCY.labels(**labels).observe(time.perf_counter() - started)
+        REQUEST_QUERIES.labels(**labels).observe(counter.queries)
+        return response
+
+
+class RequestTimingMiddleware:
+    """
+    Records SQL queries, DB time, serializer time and view time for a sample
+    of requests (REQUEST_TIMING_SAMPLE_RATE). Sampled responses get a
+    Server-Timing header, a structured log line and a spot in the per-route
+    percentiles served by monitoring.views.request_timings.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        timer = RequestTimer()
+        request._request_timer = timer
+        token = timer.activate()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            RequestTimer.deactivate(token)
+
+        if timer.view_started is not None:
+            timer.view_ms = timer.total_ms() - timer.view_started
+        total_ms = timer.total_ms()
+        route = _route(request)
+        response['Server-Timing'] = timer.server_timing(total_ms)
+        route_stats.record(route, total_ms, timer.db_ms, timer.queries)
+        logger.info(json.dumps({
+            'event': 'request_timing',
+            'route': route,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 1),
+            'view_ms': round(timer.view_ms, 1),
+            'db_ms': round(timer.db_ms, 1),
+            'queries': timer.queries,
+            'serializer_ms': round(timer.serializer_ms, 1),
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timer = getattr(request, '_request_timer', None)
+        if timer is not None:
+            # Offset from the start of the request; the view runs from here to the response
+            timer.view_started = timer.total_ms()
+        return None
+
+
+def _staff_user(request):
+    """The staff user behind the request, authenticating DRF credentials if needed"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user if user.is_staff else None
+    # Token/JWT credentials are normally only checked inside the DRF view
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(Request(request))
+        except (exceptions.APIException, AttributeError):
+            return None
+        if result is not None:
+            user = result[0]
+            return user if user.is_staff else None
+    return None
+
+
+class RequestProfilingMiddleware:
+    """
+    Runs a request under the sampling profiler of monitoring.profiling when it
+    carries the PROFILING_QUERY_PARAM flag or the X-Profile header and comes
+    from a staff user. The artifact name is returned in X-Profile-Artifact.
+    Requests without the flag only pay for two dictionary lookups.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.PROFILING_QUERY_PARAM not in request.GET and 'HTTP_X_PROFILE' not in request.META:
+            return self.get_response(request)
+        user = _staff_user(request)
+        if user is None:
+            return self.get_response(request)
+
+        sampler = StackSampler(threading.get_ident(), settings.PROFILING_INTERVAL)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                sampler.stop()
+
+        name = write_artifact(sampler, recorder, {
+            'method': request.method,
+            'path': request.path,
+            'route': _route(request),
+            'query_string': request.META.get('QUERY_STRING', ''),
+            'user_id': user.pk,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+        })
+        response['X-Profile-Artifact'] = name
+        return response
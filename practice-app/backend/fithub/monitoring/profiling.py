@@ -0,0 +1,124 @@
+"""
+On-demand sampling profiler for single requests.
+
+A background thread samples the request thread's stack every
+PROFILING_INTERVAL seconds. The stacks are written in the collapsed format
+("frame;frame;frame count" per line) that flamegraph.pl and speedscope read,
+next to a JSON file with the route, query string and SQL of the request.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.utils import timezone
+
+STACKS_SUFFIX = '.folded'
+META_SUFFIX = '.json'
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Counts the collapsed stacks of one thread while it runs"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                frames.append(_frame_name(frame))
+                frame = frame.f_back
+            if frames:
+                self.stacks[';'.join(reversed(frames))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class QueryRecorder:
+    """connection.execute_wrapper hook keeping every statement and its duration"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+            })
+
+
+def _slug(value):
+    return re.sub(r'[^A-Za-z0-9]+', '-', value).strip('-')[:60] or 'root'
+
+
+def write_artifact(sampler, recorder, metadata):
+    """Write the collapsed stacks and their metadata, returns the artifact name"""
+    directory = settings.PROFILING_DIR
+    os.makedirs(directory, exist_ok=True)
+    name = f"{timezone.now():%Y%m%dT%H%M%S}-{_slug(metadata['path'])}-{uuid.uuid4().hex[:8]}"
+
+    with open(os.path.join(directory, name + STACKS_SUFFIX), 'w') as stacks_file:
+        for stack, count in sampler.stacks.most_common():
+            stacks_file.write(f"{stack} {count}\n")
+
+    metadata = {
+        **metadata,
+        'samples': sum(sampler.stacks.values()),
+        'interval_ms': sampler.interval * 1000,
+        'queries': recorder.queries,
+    }
+    with open(os.path.join(directory, name + META_SUFFIX), 'w') as meta_file:
+        json.dump(metadata, meta_file, indent=2, default=str)
+    return name
+
+
+def list_artifacts():
+    """(name, modified time, metadata) of every stored profile, newest first"""
+    directory = settings.PROFILING_DIR
+    if not os.path.isdir(directory):
+        return []
+    artifacts = []
+    for filename in os.listdir(directory):
+        if not filename.endswith(META_SUFFIX):
+            continue
+        path = os.path.join(directory, filename)
+        try:
+            with open(path) as meta_file:
+                metadata = json.load(meta_file)
+        except (OSError, ValueError):
+            metadata = {}
+        artifacts.append((filename[:-len(META_SUFFIX)], os.path.getmtime(path), metadata))
+    return sorted(artifacts, key=lambda artifact: artifact[1], reverse=True)
+
+
+def delete_artifact(name):
+    for suffix in (STACKS_SUFFIX, META_SUFFIX):
+        try:
+            os.remove(os.path.join(settings.PROFILING_DIR, name + suffix))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,87 @@
+"""
+Prometheus metrics served in text exposition format at /metrics.
+
+Under gunicorn every worker has its own copy of these metrics. When
+PROMETHEUS_MULTIPROC_DIR is set (gunicorn.conf.py sets it before the workers
+start) prometheus_client keeps the values in mmap files in that directory
+and the endpoint merges the files of all workers, so any worker can answer
+a scrape with the totals of the whole server.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+REQUEST_LATENCY = Histogram(
+    'fithub_request_latency_seconds',
+    'Time spent handling a request, by view route',
+    ['method', 'route'],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    'fithub_request_sql_queries',
+    'SQL statements executed while handling a request, by view route',
+    ['method', 'route'],
+    buckets=QUERY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'fithub_cache_requests_total',
+    'Lookups in application caches',
+    ['cache', 'result'],
+)
+WIKIDATA_LATENCY = Histogram(
+    'fithub_wikidata_request_seconds',
+    'Latency of outbound Wikidata API calls',
+    ['action'],
+    buckets=LATENCY_BUCKETS,
+)
+WRITES = Counter(
+    'fithub_writes_total',
+    'Soft deletes, votes and ratings written',
+    ['kind', 'model'],
+)
+
+
+def record_cache_lookup(cache_name, hit):
+    CACHE_REQUESTS.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
+
+
+def record_write(kind, model, count=1):
+    if count:
+        WRITES.labels(kind=kind, model=model._meta.label_lower).inc(count)
+
+
+@contextmanager
+def time_wikidata_call(action):
+    """Observe the duration of the enclosed Wikidata request, failed or not"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        WIKIDATA_LATENCY.labels(action=action).observe(time.perf_counter() - started)
+
+
+class QueryCounter:
+    """connection.execute_wrapper hook counting the statements of one request"""
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def exposition():
+    """The metrics of this process, or of every worker in multiprocess mode"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
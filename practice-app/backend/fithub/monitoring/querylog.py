@@ -0,0 +1,190 @@
+"""
+Fingerprinted SQL statistics with EXPLAIN capture for slow statements.
+
+Statements are normalized into fingerprints: literals and placeholders
+become ``?`` and ``IN``/``VALUES`` lists collapse to ``(...)``, so
+``id__in`` filters of any length share one fingerprint. Each fingerprint
+keeps its count, total time and worst sample; statements slower than
+QUERY_LOG_SLOW_MS get the database's EXPLAIN output stored with the sample.
+
+Every process keeps its own statistics and writes them to QUERY_LOG_DIR at
+most once per QUERY_LOG_FLUSH_INTERVAL seconds and when it exits. The
+query_fingerprints command merges the files of all processes.
+"""
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.db import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+FILE_SUFFIX = '.json'
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w."])-?\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_VALUES = re.compile(r'VALUES\s*\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))*', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """The statement with its literals and list lengths removed"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _LIST.sub('(...)', sql)
+    sql = _VALUES.sub('VALUES (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+class QueryLog:
+    """connection.execute_wrapper hook aggregating statements by fingerprint"""
+
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._flushed = time.monotonic()
+        self._path = None
+        self._pid = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(self._local, 'explaining', False):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.record(context['connection'], sql, params, many, duration_ms)
+
+    def record(self, connection, sql, params, many, duration_ms):
+        key = fingerprint(sql)
+        with self._lock:
+            entry = self.stats.get(key)
+            if entry is None:
+                entry = self.stats[key] = {'count': 0, 'total_ms': 0.0, 'worst_ms': 0.0}
+            entry['count'] += 1
+            entry['total_ms'] += duration_ms
+            worst = duration_ms > entry['worst_ms']
+            if worst:
+                entry.update(worst_ms=duration_ms, sql=sql, params=repr(params)[:500])
+        if worst and not many and duration_ms >= settings.QUERY_LOG_SLOW_MS:
+            plan = self.explain(connection, sql, params)
+            if plan is not None:
+                with self._lock:
+                    entry['explain'] = plan
+        if time.monotonic() - self._flushed >= settings.QUERY_LOG_FLUSH_INTERVAL:
+            # Runs after every statement: a full disk must not fail the request
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Could not write the query log to %s', settings.QUERY_LOG_DIR)
+
+    def explain(self, connection, sql, params):
+        if not sql.lstrip()[:6].upper() == 'SELECT':
+            return None
+        self._local.explaining = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+                return [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+        except DatabaseError as error:
+            return [f"EXPLAIN failed: {error}"]
+        finally:
+            self._local.explaining = False
+
+    def snapshot(self):
+        with self._lock:
+            return {key: dict(entry) for key, entry in self.stats.items()}
+
+    def clear(self):
+        with self._lock:
+            self.stats.clear()
+
+    def flush(self):
+        """Write this process's statistics to QUERY_LOG_DIR, replacing its previous file"""
+        self._flushed = time.monotonic()
+        stats = self.snapshot()
+        if not stats:
+            return None
+        if self._pid != os.getpid():
+            # One file per process; a forked worker starts its own
+            self._pid = os.getpid()
+            self._path = os.path.join(
+                settings.QUERY_LOG_DIR, f"{self._pid}-{uuid.uuid4().hex[:8]}{FILE_SUFFIX}"
+            )
+        os.makedirs(settings.QUERY_LOG_DIR, exist_ok=True)
+        partial = self._path + '.tmp'
+        with open(partial, 'w') as stats_file:
+            json.dump(stats, stats_file, default=str)
+        os.replace(partial, self._path)
+        return self._path
+
+
+query_log = QueryLog()
+
+
+def install(connection, **kwargs):
+    """connection_created receiver adding the query log to a new connection"""
+    if query_log not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_log)
+
+
+def load_fingerprints():
+    """Statistics of all processes merged by fingerprint"""
+    directory = settings.QUERY_LOG_DIR
+    merged = {}
+    if not os.path.isdir(directory):
+        return merged
+    for filename in os.listdir(directory):
+        if not filename.endswith(FILE_SUFFIX):
+            continue
+        try:
+            with open(os.path.join(directory, filename)) as stats_file:
+                stats = json.load(stats_file)
+        except (OSError, ValueError):
+            continue
+        for key, entry in stats.items():
+            total = merged.get(key)
+            if total is None:
+                merged[key] = dict(entry)
+                continue
+            total['count'] += entry['count']
+            total['total_ms'] += entry['total_ms']
+            if entry['worst_ms'] > total['worst_ms']:
+                # The worst sample and its plan travel together
+                for field in ('worst_ms', 'sql', 'params', 'explain'):
+                    if field in entry:
+                        total[field] = entry[field]
+                    else:
+                        total.pop(field, None)
+    return merged
+
+
+def clear_fingerprints():
+    directory = settings.QUERY_LOG_DIR
+    if not os.path.isdir(directory):
+        return 0
+    removed = 0
+    for filename in os.listdir(directory):
+        if filename.endswith(FILE_SUFFIX):
+            os.remove(os.path.join(directory, filename))
+            removed += 1
+    return removed
+
+
+@atexit.register
+def _flush_query_log_at_exit():
+    try:
+        query_log.flush()
+    except Exception:
+        logger.exception('Could not write the query log to %s at exit', settings.QUERY_LOG_DIR)
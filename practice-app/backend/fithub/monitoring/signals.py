@@ -0,0 +1,48 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from api.models import HealthRating, RecipeRating
+from core.models import TimestampedModel
+from forum.models import ForumPostCommentVote, ForumPostVote
+from qa.models import AnswerVote, QuestionVote
+from utils.cascade import rows_soft_deleted
+
+from .prometheus import record_write
+
+VOTE_MODELS = (ForumPostVote, ForumPostCommentVote, QuestionVote, AnswerVote)
+RATING_MODELS = (RecipeRating, HealthRating)
+
+
+def _soft_deleted(instance, update_fields):
+    if update_fields is not None and 'deleted_on' not in update_fields:
+        return False
+    if instance.deleted_on is None or not instance.has_loaded_value('deleted_on'):
+        return False
+    return instance.get_loaded_value('deleted_on') is None
+
+
+@receiver(post_save, dispatch_uid='monitoring_soft_delete')
+def count_soft_delete(sender, instance, created, update_fields=None, **kwargs):
+    if not created and isinstance(instance, TimestampedModel) and _soft_deleted(instance, update_fields):
+        record_write('soft_delete', sender)
+
+
+@receiver(rows_soft_deleted, dispatch_uid='monitoring_bulk_soft_delete')
+def count_bulk_soft_delete(sender, count, **kwargs):
+    record_write('soft_delete', sender, count)
+
+
+def count_vote(sender, instance, **kwargs):
+    # Withdrawn votes are soft deleted and counted as such
+    if instance.deleted_on is None:
+        record_write('vote', sender)
+
+
+def count_rating(sender, instance, **kwargs):
+    record_write('rating', sender)
+
+
+for model in VOTE_MODELS:
+    post_save.connect(count_vote, sender=model, dispatch_uid=f'monitoring_vote_{model._meta.label}')
+for model in RATING_MODELS:
+    post_save.connect(count_rating, sender=model, dispatch_uid=f'monitoring_rating_{model._meta.label}')
@@ -0,0 +1,303 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from api.models import RegisteredUser
+from forum.models import ForumPost, ForumPostVote
+from monitoring import prometheus
+from monitoring.profiling import list_artifacts
+from monitoring.querylog import QueryLog, fingerprint
+from monitoring.timing import route_stats
+
+
+@override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0)
+class RequestTimingMiddlewareTests(TestCase):
+
+    def setUp(self):
+        route_stats.clear()
+        self.client = APIClient()
+        self.user = RegisteredUser.objects.create_user(
+            username='timer', email='timer@example.com', password='password'
+        )
+        ForumPost.objects.create(author=self.user, title='Post', content='content')
+
+    def test_server_timing_header(self):
+        response = self.client.get('/forum/posts/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        header = response['Server-Timing']
+        for metric in ('db;dur=', 'serializer;dur=', 'view;dur=', 'total;dur='):
+            self.assertIn(metric, header)
+        self.assertRegex(header, r'desc="[1-9]\d* queries"')
+
+    def test_log_line(self):
+        with self.assertLogs('monitoring.timing', level='INFO') as logs:
+            self.client.get('/forum/posts/')
+        self.assertIn('"route": "GET /forum/posts/"', logs.output[0])
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_untouched(self):
+        response = self.client.get('/forum/posts/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(route_stats.summary(), {})
+
+    def test_staff_endpoint_reports_percentiles(self):
+        for _ in range(3):
+            self.client.get('/forum/posts/')
+        staff = RegisteredUser.objects.create_superuser(
+            username='staff', email='staff@example.com', password='password'
+        )
+        self.client.force_authenticate(user=staff)
+
+        response = self.client.get(reverse('request-timings'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.data['routes']['GET /forum/posts/']
+        self.assertEqual(stats['count'], 3)
+        self.assertLessEqual(stats['total_ms']['p50'], stats['total_ms']['p99'])
+        self.assertGreater(stats['avg_queries'], 0)
+
+    def test_staff_endpoint_requires_staff(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('request-timings'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class RequestProfilingMiddlewareTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        overrides = override_settings(PROFILING_DIR=self.directory.name)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.client = APIClient()
+        self.staff = RegisteredUser.objects.create_superuser(
+            username='profiler', email='profiler@example.com', password='password'
+        )
+        self.user = RegisteredUser.objects.create_user(
+            username='regular', email='regular@example.com', password='password'
+        )
+        self.url = '/recipes/meal_planner/'
+
+    def authenticate(self, user):
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_staff_request_writes_artifact(self):
+        self.authenticate(self.staff)
+        response = self.client.get(self.url, {'_profile': '1', 'meal_type': 'lunch'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        name = response['X-Profile-Artifact']
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, name + '.folded')))
+        with open(os.path.join(self.directory.name, name + '.json')) as meta_file:
+            metadata = json.load(meta_file)
+        self.assertEqual(metadata['route'], 'GET /recipes/meal_planner/')
+        self.assertIn('meal_type=lunch', metadata['query_string'])
+        self.assertTrue(metadata['queries'])
+
+    def test_header_flag(self):
+        self.authenticate(self.staff)
+        response = self.client.get(self.url, HTTP_X_PROFILE='1')
+        self.assertIn('X-Profile-Artifact', response)
+
+    def test_non_staff_and_unflagged_requests_are_not_profiled(self):
+        self.authenticate(self.user)
+        self.assertNotIn('X-Profile-Artifact', self.client.get(self.url, {'_profile': '1'}))
+        self.authenticate(self.staff)
+        self.assertNotIn('X-Profile-Artifact', self.client.get(self.url))
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_command_lists_and_prunes(self):
+        self.authenticate(self.staff)
+        names = [self.client.get(self.url, {'_profile': '1'})['X-Profile-Artifact'] for _ in range(3)]
+
+        out = StringIO()
+        call_command('profiles', 'list', stdout=out)
+        for name in names:
+            self.assertIn(name, out.getvalue())
+
+        call_command('profiles', 'prune', '--keep', '1', stdout=StringIO())
+        self.assertEqual(len(list_artifacts()), 1)
+        call_command('profiles', 'prune', '--days', '0', stdout=StringIO())
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+
+class PrometheusMetricsTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = RegisteredUser.objects.create_user(
+            username='scraped', email='scraped@example.com', password='password'
+        )
+        self.post = ForumPost.objects.create(author=self.user, title='Post', content='content')
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_request_histograms(self):
+        labels = {'method': 'GET', 'route': '/forum/posts/'}
+        before = self.sample('fithub_request_latency_seconds_count', **labels)
+        self.client.get('/forum/posts/')
+        self.assertEqual(self.sample('fithub_request_latency_seconds_count', **labels), before + 1)
+        self.assertGreater(self.sample('fithub_request_sql_queries_sum', **labels), 0)
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('fithub_request_latency_seconds_bucket{le="0.005",method="GET",route="/forum/posts/"}', body)
+        self.assertIn('# TYPE fithub_request_sql_queries histogram', body)
+
+    def test_write_counters(self):
+        vote_labels = {'kind': 'vote', 'model': 'forum.forumpostvote'}
+        delete_labels = {'kind': 'soft_delete', 'model': 'forum.forumpostvote'}
+        votes = self.sample('fithub_writes_total', **vote_labels)
+        deletes = self.sample('fithub_writes_total', **delete_labels)
+
+        vote = ForumPostVote.objects.create(user=self.user, post=self.post, vote_type='up')
+        self.assertEqual(self.sample('fithub_writes_total', **vote_labels), votes + 1)
+
+        self.post.delete()  # The vote goes with the post in one bulk UPDATE
+        self.assertEqual(self.sample('fithub_writes_total', **delete_labels), deletes + 1)
+        self.assertEqual(self.sample('fithub_writes_total', **vote_labels), votes + 1)
+        self.assertGreater(self.sample('fithub_writes_total', kind='soft_delete', model='forum.forumpost'), 0)
+        vote.refresh_from_db()
+        self.assertIsNotNone(vote.deleted_on)
+
+    def test_wikidata_cache_lookups(self):
+        from wikidata.utils import get_wikidata_id
+
+        labels = {'cache': 'wikidata_id', 'result': 'hit'}
+        hits = self.sample('fithub_cache_requests_total', **labels)
+        misses = self.sample('fithub_cache_requests_total', cache='wikidata_id', result='miss')
+        calls = self.sample('fithub_wikidata_request_seconds_count', action='wbsearchentities')
+        response = mock.Mock(**{'json.return_value': {'search': [{'id': 'Q89'}]}})
+        with mock.patch('wikidata.utils.requests.get', return_value=response):
+            self.assertEqual(get_wikidata_id('prometheus apple'), 'Q89')
+            self.assertEqual(get_wikidata_id('prometheus apple'), 'Q89')
+
+        self.assertEqual(self.sample('fithub_cache_requests_total', **labels), hits + 1)
+        self.assertEqual(self.sample('fithub_cache_requests_total', cache='wikidata_id', result='miss'), misses + 1)
+        self.assertEqual(
+            self.sample('fithub_wikidata_request_seconds_count', action='wbsearchentities'), calls + 1
+        )
+
+    def test_workers_are_aggregated(self):
+        # Two "workers" write to a shared directory; the endpoint reports their sum
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': directory.name}
+        script = (
+            "from monitoring.prometheus import record_cache_lookup; "
+            "record_cache_lookup('recipe_cost', True)"
+        )
+        for _ in range(2):
+            subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env, check=True)
+
+        with mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': directory.name}):
+            body, _ = prometheus.exposition()
+        self.assertIn(b'fithub_cache_requests_total{cache="recipe_cost",result="hit"} 2.0', body)
+
+    def test_gunicorn_config_selects_multiprocess_values(self):
+        # Loading the config must switch prometheus_client to its mmap values
+        env = {key: value for key, value in os.environ.items() if key != 'PROMETHEUS_MULTIPROC_DIR'}
+        script = (
+            "import runpy; runpy.run_path('gunicorn.conf.py'); "
+            "from prometheus_client import values; "
+            "print(values.ValueClass is values.MutexValue)"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env,
+            check=True, capture_output=True, text=True,
+        )
+        self.assertEqual(result.stdout.strip(), 'False')
+
+    @override_settings(METRICS_ALLOWED_IPS=['10.0.0.5'], METRICS_TOKEN='scrape-secret')
+    def test_metrics_require_allowed_ip_or_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code, status.HTTP_200_OK)
+
+
+class QueryLogTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        settings_override = override_settings(
+            QUERY_LOG_DIR=self.directory.name, QUERY_LOG_SLOW_MS=0, QUERY_LOG_FLUSH_INTERVAL=3600
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.log = QueryLog()
+        self.user = RegisteredUser.objects.create_user(
+            username='logged', email='logged@example.com', password='password'
+        )
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint('SELECT "t"."id" FROM "t" WHERE ("t"."id" IN (%s, %s, %s) AND "t"."n" = 5) LIMIT 21'),
+            'SELECT "t"."id" FROM "t" WHERE ("t"."id" IN (...) AND "t"."n" = ?) LIMIT ?'
+        )
+        self.assertEqual(fingerprint("SELECT 1 FROM t WHERE name = 'o''brien'"), 'SELECT ? FROM t WHERE name = ?')
+        self.assertEqual(
+            fingerprint('INSERT INTO "t" ("a", "b")\n VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO "t" ("a", "b") VALUES (...)'
+        )
+
+    def test_in_lists_share_a_fingerprint(self):
+        with connection.execute_wrapper(self.log):
+            list(ForumPost.objects.filter(id__in=[1, 2]))
+            list(ForumPost.objects.filter(id__in=[1, 2, 3, 4, 5]))
+        entries = [entry for sql, entry in self.log.snapshot().items() if 'IN (...)' in sql]
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['count'], 2)
+        self.assertGreaterEqual(entries[0]['total_ms'], entries[0]['worst_ms'])
+        # Slower than the (zero) threshold, so the worst sample carries its plan
+        self.assertTrue(entries[0]['explain'])
+        self.assertNotIn('EXPLAIN failed', entries[0]['explain'][0])
+
+    def test_command_merges_processes(self):
+        with connection.execute_wrapper(self.log):
+            list(ForumPost.objects.filter(id__in=[1, 2]))
+        self.log.flush()
+        other = QueryLog()  # Stands in for a second worker process
+        with connection.execute_wrapper(other):
+            list(ForumPost.objects.filter(id__in=[3]))
+        other.flush()
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)
+
+        out = StringIO()
+        call_command('query_fingerprints', '--sort', 'count', '--explain', stdout=out)
+        output = out.getvalue()
+        self.assertIn('"forum_forumpost"."id" IN (...)', output)
+        self.assertRegex(output, r'\s2 calls')
+
+        call_command('query_fingerprints', '--clear', stdout=StringIO())
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_failed_flush_does_not_fail_the_statement(self):
+        with override_settings(QUERY_LOG_FLUSH_INTERVAL=0):
+            with mock.patch.object(self.log, 'flush', side_effect=OSError('disk full')):
+                with self.assertLogs('monitoring.querylog', 'ERROR'):
+                    with connection.execute_wrapper(self.log):
+                        self.assertEqual(ForumPost.objects.count(), 0)
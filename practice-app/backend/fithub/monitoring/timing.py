@@ -0,0 +1,135 @@
+"""
+Per-request timing: SQL query count and time, serializer time and view time.
+
+A RequestTimer is active (through a context variable) only for sampled
+requests; unsampled requests never touch any of this.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+_active_timer = contextvars.ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+        self.serializer_ms = 0.0
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook: time every statement of the request
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - started) * 1000
+            self.queries += 1
+
+    def activate(self):
+        return _active_timer.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _active_timer.reset(token)
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms):
+        """Value of the Server-Timing response header"""
+        return ", ".join([
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f'serializer;dur={self.serializer_ms:.1f}',
+            f'view;dur={self.view_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+
+
+def get_active_timer():
+    return _active_timer.get()
+
+
+def _timed_data(prop):
+    getter = prop.fget
+
+    def data(self):
+        timer = _active_timer.get()
+        if timer is None:
+            return getter(self)
+        # Serializer.data calls BaseSerializer.data: only the outermost call is timed
+        timer._serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return getter(self)
+        finally:
+            timer._serializer_depth -= 1
+            if timer._serializer_depth == 0:
+                timer.serializer_ms += (time.perf_counter() - started) * 1000
+
+    data._timed = True
+    return property(data)
+
+
+def instrument_serializers():
+    """Wrap the DRF .data properties so sampled requests record serializer time"""
+    from rest_framework import serializers
+
+    for cls in (serializers.BaseSerializer, serializers.Serializer, serializers.ListSerializer):
+        prop = cls.__dict__.get('data')
+        if prop is not None and not getattr(prop.fget, '_timed', False):
+            cls.data = _timed_data(prop)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 1)
+
+
+class RouteStats:
+    """Rolling window of the last REQUEST_TIMING_WINDOW samples per route, in memory"""
+
+    def __init__(self):
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, total_ms, db_ms, queries):
+        with self._lock:
+            samples = self._samples.get(route)
+            if samples is None:
+                samples = self._samples[route] = deque(maxlen=settings.REQUEST_TIMING_WINDOW)
+            samples.append((total_ms, db_ms, queries))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        with self._lock:
+            snapshot = {route: list(samples) for route, samples in self._samples.items()}
+
+        result = {}
+        for route, samples in snapshot.items():
+            totals = sorted(s[0] for s in samples)
+            db = sorted(s[1] for s in samples)
+            result[route] = {
+                'count': len(samples),
+                'total_ms': {'p50': _percentile(totals, 0.5), 'p90': _percentile(totals, 0.9),
+                             'p99': _percentile(totals, 0.99)},
+                'db_ms': {'p50': _percentile(db, 0.5), 'p90': _percentile(db, 0.9),
+                          'p99': _percentile(db, 0.99)},
+                'avg_queries': round(sum(s[2] for s in samples) / len(samples), 1),
+            }
+        return result
+
+
+route_stats = RouteStats()
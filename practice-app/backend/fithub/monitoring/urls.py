@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import request_timings
+
+urlpatterns = [
+    path('timings/', request_timings, name='request-timings'),
+]
@@ -0,0 +1,59 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .prometheus import exposition
+from .timing import route_stats
+
+
+@swagger_auto_schema(
+    method='GET',
+    operation_description="Rolling per-route latency percentiles of sampled requests (this worker process only)",
+    responses={
+        200: openapi.Response(
+            description="Sample rate and per-route statistics",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'sample_rate': openapi.Schema(type=openapi.TYPE_NUMBER),
+                    'routes': openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        description='count, total_ms/db_ms p50/p90/p99 and avg_queries per route'
+                    ),
+                }
+            )
+        )
+    }
+)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def request_timings(request):
+    """Staff view of the request timing statistics kept by RequestTimingMiddleware"""
+    return Response({
+        'sample_rate': settings.REQUEST_TIMING_SAMPLE_RATE,
+        'routes': route_stats.summary(),
+    }, status=status.HTTP_200_OK)
+
+
+def metrics_allowed(request):
+    """Scrapes come from METRICS_ALLOWED_IPS or carry METRICS_TOKEN as a bearer token"""
+    if request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS:
+        return True
+    token = settings.METRICS_TOKEN
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    return bool(token) and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode())
+
+
+def metrics(request):
+    """Prometheus scrape target; a plain Django view so scrapers need no API user"""
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    body, content_type = exposition()
+    return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qa', '0002_answer_level_path'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='answer',
+            name='content',
+            field=models.TextField(max_length=1000),
+        ),
+        migrations.AlterField(
+            model_name='answer',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='answervote',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='answervote',
+            name='vote_type',
+            field=models.CharField(choices=[('up', 'Upvote'), ('down', 'Downvote')], max_length=5),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='content',
+            field=models.TextField(max_length=1000),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='questionvote',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='questionvote',
+            name='vote_type',
+            field=models.CharField(choices=[('up', 'Upvote'), ('down', 'Downvote')], max_length=5),
+        ),
+    ]
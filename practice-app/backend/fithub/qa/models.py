@@ -1,5 +1,4 @@
 from django.db import models
-from django.utils.timezone import now
 from utils.models import CommentModel, CommentVoteModel, PostModel, PostVoteModel
 
 
@@ -25,20 +24,8 @@ class Question(PostModel):
 
     tags = models.JSONField(default=list, blank=True)
 
-    def delete(self, using=None, keep_parents=False):
-        """
-        Soft delete this question and cascade to its related answers and votes.
-        """
-        self.deleted_on = now()
-        self.save(update_fields=["deleted_on"])
-
-        answers = self.answers.filter(deleted_on__isnull=True)
-        for answer in answers:
-            answer.deleted_on = now()
-            answer.save(update_fields=["deleted_on"])
-            answer.votes.filter(deleted_on__isnull=True).update(deleted_on=now())
-
-        self.votes.filter(deleted_on__isnull=True).update(deleted_on=now())
+    # Deleting a question also soft deletes its answers (with their votes) and its votes
+    soft_delete_related = ('answers', 'votes')
 
     def __str__(self):
         return f"Question #{self.pk}, {self.title}"
@@ -57,14 +44,6 @@ class Answer(CommentModel):
     def get_replies(self):
         return self.replies.all()
 
-    def delete(self, using=None, keep_parents=False):
-        """Soft delete this answer and its votes (and optional replies)."""
-        self.deleted_on = now()
-        self.save(update_fields=["deleted_on"])
-
-        self.votes.filter(deleted_on__isnull=True).update(deleted_on=now())
-        self.replies.filter(deleted_on__isnull=True).update(deleted_on=now())
-
 
 class AnswerVote(CommentVoteModel):
     comment = models.ForeignKey(Answer, related_name='votes', on_delete=models.CASCADE)
@@ -1,11 +1,12 @@
 from random import choice
 import re
 from rest_framework import serializers
-from utils.models import CommentVoteModel, PostVoteModel
+from utils.models import COMMENT_MAX_LEVEL, CommentVoteModel, PostVoteModel
 from qa.models import Answer, AnswerVote, Question, QuestionVote
+from utils.votes import MyVoteSerializerMixin
 
 
-class QuestionSerializer(serializers.ModelSerializer):
+class QuestionSerializer(MyVoteSerializerMixin, serializers.ModelSerializer):
     tags = serializers.ListField(child=serializers.CharField())
 
     class Meta:
@@ -80,13 +81,13 @@ class QuestionVoteSerializer(serializers.ModelSerializer):
         return QuestionVote.objects.create(**validated_data)
 
 
-class AnswerSerializer(serializers.ModelSerializer):
+class AnswerSerializer(MyVoteSerializerMixin, serializers.ModelSerializer):
     queryset = Answer.objects.filter(deleted_on__isnull=True)
 
     class Meta:
         model = Answer
-        fields = ['id', 'content', 'author', 'upvote_count', 'downvote_count', 'reported_count', 'created_at', 'updated_at', 'deleted_on']
-        read_only_fields = ['author', 'upvote_count', 'downvote_count', 'reported_count', 'created_at', 'updated_at', 'deleted_on']
+        fields = ['id', 'content', 'author', 'parent_comment', 'level', 'upvote_count', 'downvote_count', 'reported_count', 'created_at', 'updated_at', 'deleted_on']
+        read_only_fields = ['author', 'level', 'upvote_count', 'downvote_count', 'reported_count', 'created_at', 'updated_at', 'deleted_on']
 
     def validate(self, data):
         post = self.context.get('post')
@@ -100,6 +101,8 @@ class AnswerSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Cannot answer a non-commentable question.")
         if parent_comment and parent_comment.post != post:
             raise serializers.ValidationError("Cannot reply to an answer from a different question.")
+        if parent_comment and parent_comment.level >= COMMENT_MAX_LEVEL:
+            raise serializers.ValidationError(f"Cannot reply more than {COMMENT_MAX_LEVEL} levels deep.")
         return data
 
     def create(self, validated_data):
@@ -13,6 +13,11 @@ urlpatterns = [
         AnswerViewSet.as_view({'get': 'list', 'post': 'create'}),
         name='question-answer-list-create'
     ),
+    path(
+        'questions/<int:post_id>/answers/tree/',
+        AnswerViewSet.as_view({'get': 'tree'}),
+        name='question-answer-tree'
+    ),
     path(
         'questions/<int:post_id>/answers/<int:comment_id>/',
         AnswerViewSet.as_view({'get': 'retrieve', 'delete': 'destroy'}),
@@ -9,16 +9,21 @@ from django.shortcuts import get_object_or_404
 from django.utils.timezone import now
 from rest_framework.exceptions import ValidationError
 from utils.pagination import StandardPagination
+from utils.votes import MyVoteListMixin
+from utils.comment_tree import comment_tree_response
 from api.models import RegisteredUser
 from qa.models import Answer, AnswerVote, Question, QuestionVote
 from qa.serializers import AnswerSerializer, AnswerVoteSerializer, QuestionSerializer, QuestionVoteSerializer
+from analytics.metrics import record_view
 
 
 @permission_classes([IsAuthenticatedOrReadOnly])
-class QuestionViewSet(viewsets.ModelViewSet):
+class QuestionViewSet(MyVoteListMixin, viewsets.ModelViewSet):
     queryset = Question.objects.filter(deleted_on__isnull=True).order_by('-created_at')
     serializer_class = QuestionSerializer
     pagination_class = StandardPagination
+    vote_model = QuestionVote
+    vote_target_field = 'post'
     http_method_names = ['get', 'post', 'put', 'delete']
 
     def update(self, request, *args, **kwargs):
@@ -29,6 +34,7 @@ class QuestionViewSet(viewsets.ModelViewSet):
         post = self.get_object()
         post.view_count += 1
         post.save()
+        record_view()
         serializer = self.get_serializer(post)
         return Response(serializer.data)
 
@@ -129,9 +135,11 @@ class QuestionVoteView(APIView):
 
 
 @permission_classes([IsAuthenticatedOrReadOnly])
-class AnswerViewSet(viewsets.ModelViewSet):
+class AnswerViewSet(MyVoteListMixin, viewsets.ModelViewSet):
     serializer_class = AnswerSerializer
     pagination_class = StandardPagination
+    vote_model = AnswerVote
+    vote_target_field = 'comment'
 
     def get_queryset(self):
         post_id = self.kwargs.get('post_id')
@@ -178,6 +186,25 @@ class AnswerViewSet(viewsets.ModelViewSet):
 
         return self.get_paginated_response(serializer.data) if page else Response(serializer.data)
 
+    @swagger_auto_schema(
+        operation_description="List answer threads of a question as nested trees, paginated by top-level answer.",
+        manual_parameters=[
+            openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Page of top-level threads"),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Threads per page (max 100)"),
+            openapi.Parameter('depth', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Reply levels to include (default 3, max 10)"),
+        ],
+    )
+    def tree(self, request, *args, **kwargs):
+        post_id = self.kwargs.get('post_id')
+        post = get_object_or_404(Question, id=post_id)
+
+        if post.deleted_on:
+            return Response({"detail": "Question is deleted."}, status=status.HTTP_404_NOT_FOUND)
+        if not post.is_commentable:
+            return Response({"detail": "Answers are disabled for this question."}, status=status.HTTP_403_FORBIDDEN)
+
+        return comment_tree_response(self, post.answers.filter(deleted_on__isnull=True))
+
     def retrieve(self, request, *args, **kwargs):
         post_id = self.kwargs.get('post_id')
         comment_id = self.kwargs.get('comment_id')
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from api.models import RegisteredUser
+from recipes.models import Recipe
+from recipes.signals import get_type_of_cook_from_recipe_count
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds recipeCount and typeOfCook for all users from their live recipes (e.g. after bulk imports)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Users written per bulk UPDATE'
+        )
+
+    def handle(self, *args, **options):
+        # One grouped query for every creator's live recipe count
+        counts = dict(
+            Recipe.objects.filter(deleted_on__isnull=True, creator__isnull=False)
+            .values('creator')
+            .annotate(total=Count('id'))
+            .values_list('creator', 'total')
+        )
+
+        changed = []
+        users = RegisteredUser.objects.only('id', 'recipeCount', 'typeOfCook').order_by('pk')
+        for user in users.iterator(chunk_size=2000):
+            recipe_count = counts.get(user.pk, 0)
+            type_of_cook = get_type_of_cook_from_recipe_count(recipe_count)
+            if user.recipeCount != recipe_count or user.typeOfCook != type_of_cook:
+                user.recipeCount = recipe_count
+                user.typeOfCook = type_of_cook
+                changed.append(user)
+
+        RegisteredUser.objects.bulk_update(
+            changed, ['recipeCount', 'typeOfCook'], batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Reconciled recipe counts for {len(changed)} users'))
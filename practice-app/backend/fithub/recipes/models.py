@@ -3,9 +3,11 @@ from core.models import TimestampedModel
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from ingredients.models import Ingredient 
+from ingredients import catalog, fixedpoint
 from django.utils import timezone
 from cloudinary.models import CloudinaryField
 from decimal import Decimal
+from utils import cascade
 
 # Recipe model that will be used for the recipe
 class Recipe(TimestampedModel):
@@ -80,55 +82,56 @@ class Recipe(TimestampedModel):
                     raise ValidationError(f"{rating_field} must be between 0 and 5.")
 
 
+    # Rows soft deleted together with the recipe
+    soft_delete_related = ('recipe_ingredients',)
+
     # Crutial for soft delete (also affects the recipeIngredient cascade delete)
     def delete(self, *args, **kwargs):
         if self.deleted_on: # Fixes the issue of deleting already deleted recipes
             return  # Already deleted
-        self.deleted_on = timezone.now()
-        self.save()
+        # Saves the recipe (so recipeCount signals run) and bulk updates its ingredients
+        cascade.soft_delete(self)
+
+    def restore(self):
+        """Undo a soft delete, together with the ingredients removed by it"""
+        cascade.restore(self)
 
     def calculate_recipe_cost(self, user):
         """
         Calculates the recipe cost of the recipe for each market.
         """
-        total_market_prices = {
-            "A101": Decimal("0.0"),
-            "SOK": Decimal("0.0"),
-            "BIM": Decimal("0.0"),
-            "MIGROS": Decimal("0.0"),
-        }
-        
-        for ri in self.recipe_ingredients.all():
-            ingredient = ri.ingredient
-
-            # Cheapest price among markets
-            market_prices = ingredient.get_price_for_user(
-                user=user,
-                quantity=ri.quantity,
-                unit=ri.unit,
-            )
-            
-            # Scale by quantity relative to base
-            for market in total_market_prices.keys():
-                price = market_prices.get(market)
+        currency = getattr(user, "preferredCurrency", "USD")
+        return self.total_market_prices(
+            ri.ingredient.price_cents(currency, quantity=ri.quantity, unit=ri.unit)
+            for ri in catalog.attach_ingredients(self.recipe_ingredients.all())
+        )
+
+    @staticmethod
+    def total_market_prices(line_cents):
+        """
+        Sums the per-ingredient market prices of a recipe (Ingredient.price_cents results).
+        """
+        totals = [0] * len(fixedpoint.MARKETS)
+        for cents in line_cents:
+            for index, price in enumerate(cents):
                 if price is not None:
-                    total_market_prices[market] += Decimal(price)
-                    
-        # Round all values to 2 decimals for output
-        return {m: c.quantize(Decimal("0.01")) for m, c in total_market_prices.items()}
+                    totals[index] += price
+        return dict(zip(fixedpoint.MARKETS, map(fixedpoint.to_decimal, totals)))
 
     def calculate_cost_per_serving(self, user=None):
         """
         Saves the minimum cost per serving among markets to the recipe's cost_per_serving field.
         """
-        total_cost = Decimal("0.0")
-
         if user is None:
             class DummyUser:
                 preferredCurrency = "USD"
             user = DummyUser()
 
-        market_costs = self.calculate_recipe_cost(user=user)
+        return self.cheapest_market_cost(self.calculate_recipe_cost(user=user))
+
+    @staticmethod
+    def cheapest_market_cost(market_costs):
+        total_cost = Decimal("0.0")
         if market_costs:
             total_cost = min(market_costs.values())
         return total_cost.quantize(Decimal("0.01"))
@@ -137,53 +140,60 @@ class Recipe(TimestampedModel):
         """
         Calculates the total nutrition info for the recipe based on its ingredients.
         """
-        total_nutrition = {
-            "calories": Decimal("0.0"),
-            "protein": Decimal("0.0"),
-            "fat": Decimal("0.0"),
-            "carbs": Decimal("0.0"),
-        }
-        
-        for ri in self.recipe_ingredients.all():
-            ingredient_nutrition = ri.get_nutrition_info()
-            
-            for key in total_nutrition.keys():
-                value = ingredient_nutrition.get(key)
+        return self.total_nutrition(
+            ri.ingredient.nutrition_cents(quantity=ri.quantity, unit=ri.unit)
+            for ri in catalog.attach_ingredients(self.recipe_ingredients.all())
+        )
+
+    @staticmethod
+    def total_nutrition(line_cents):
+        """
+        Sums the per-ingredient nutrition info of a recipe (Ingredient.nutrition_cents results).
+        """
+        totals = [0] * len(fixedpoint.NUTRIENTS)
+        for cents in line_cents:
+            for index, value in enumerate(cents):
                 if value is not None:
-                    total_nutrition[key] += Decimal(value)
-        
-        # Round all values to 2 decimals for output
-        return {k: v.quantize(Decimal("0.01")) for k, v in total_nutrition.items()}
+                    totals[index] += value
+        return dict(zip(fixedpoint.NUTRIENTS, map(fixedpoint.to_decimal, totals)))
     
     
 
     # Will dynamically return alergens, if updated anything no problem
     def check_allergens(self):
+        return self.allergens_of(ri.ingredient for ri in catalog.attach_ingredients(self.recipe_ingredients.all()))
+
+    @staticmethod
+    def allergens_of(ingredients):
         return list(set(
             allergen
-            for ri in self.recipe_ingredients.all()
-            for allergen in ri.ingredient.allergens
+            for ingredient in ingredients
+            for allergen in ingredient.allergens
         ))
 
     # Will dynamically return dietary info, if updated anything no problem
     def check_dietary_info(self):
+        return self.dietary_info_of([ri.ingredient for ri in catalog.attach_ingredients(self.recipe_ingredients.all())])
 
+    @staticmethod
+    def dietary_info_of(ingredients):
+        """Dietary info of any ingredient; vegan and gluten-free only when every ingredient is"""
         excluded = ["vegan", "gluten-free"]
         included = []
 
-        for ri in self.recipe_ingredients.all():
+        for ingredient in ingredients:
 
-            for info in ri.ingredient.dietary_info:
+            for info in ingredient.dietary_info:
 
                 if info not in included:
                     included.append(info)
 
-        for ri in self.recipe_ingredients.all():
+        for ingredient in ingredients:
 
             if excluded == []: break
             for e in excluded:
 
-                if e not in ri.ingredient.dietary_info:
+                if e not in ingredient.dietary_info:
                     
                     if e in included:
                         included.remove(e)
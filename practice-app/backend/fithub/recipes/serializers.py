@@ -6,9 +6,11 @@ from .models import Recipe, RecipeIngredient
 from ingredients.models import Ingredient
 from rest_framework.exceptions import ValidationError
 from ingredients.serializers import IngredientSerializer
+from ingredients import catalog
+from ingredients.memo import IngredientMemo
 from rest_framework.response import Response
 import json
-from django.db import transaction
+from django.db import IntegrityError, transaction
 
 class RecipeIngredientOutputSerializer(serializers.ModelSerializer):
     ingredient = IngredientSerializer()
@@ -20,16 +22,68 @@ class RecipeIngredientOutputSerializer(serializers.ModelSerializer):
         fields = ['ingredient', 'quantity', 'unit', 'costs_for_recipe', 'nutrion_info_for_recipe']
 
     def get_costs_for_recipe(self, obj):
-        request = self.context.get("request")
-        user = getattr(request, "user", None)
-        if not user or not user.is_authenticated:
-            class DummyUser:
-                preferredCurrency = "USD"
-            user = DummyUser()
-        return obj.get_costs(user)
+        user = pricing_user(self.context)
+        return IngredientMemo.for_context(self.context).prices(obj.ingredient, user, obj.quantity, obj.unit)
     
     def get_nutrion_info_for_recipe(self, obj):
-        return obj.get_nutrition_info()
+        return IngredientMemo.for_context(self.context).nutrition(obj.ingredient, obj.quantity, obj.unit)
+
+
+def pricing_user(context):
+    """The request's user, or a USD-pricing stand-in for anonymous requests"""
+    request = context.get("request")
+    user = getattr(request, "user", None)
+    if not user or not user.is_authenticated:
+        class DummyUser:
+            preferredCurrency = "USD"
+        user = DummyUser()
+    return user
+
+
+class RecipeTotalsMixin:
+    """
+    Recipe totals computed from the request's IngredientMemo, so the lines,
+    their prices and their nutrition are computed once per response and
+    shared by every field that needs them.
+    """
+
+    def recipe_lines(self, obj):
+        def load():
+            if 'recipe_ingredients' in getattr(obj, '_prefetched_objects_cache', {}):
+                lines = obj.recipe_ingredients.all()
+            elif catalog.get_catalog() is not None:
+                lines = RecipeIngredient.objects.filter(recipe=obj)
+            else:
+                lines = RecipeIngredient.objects.filter(recipe=obj).select_related('ingredient')
+            return catalog.attach_ingredients(lines)
+        return IngredientMemo.for_context(self.context).lookup(('recipe_lines', obj.pk), load)
+
+    def get_recipe_costs(self, obj):
+        user = pricing_user(self.context)
+        memo = IngredientMemo.for_context(self.context)
+        costs = memo.lookup(
+            ('recipe_costs', obj.pk, getattr(user, 'preferredCurrency', 'USD')),
+            lambda: Recipe.total_market_prices(
+                memo.price_cents(ri.ingredient, user, ri.quantity, ri.unit) for ri in self.recipe_lines(obj)
+            ),
+        )
+        return dict(costs)
+
+    def get_recipe_nutritions(self, obj):
+        memo = IngredientMemo.for_context(self.context)
+        return Recipe.total_nutrition(
+            memo.nutrition_cents(ri.ingredient, ri.quantity, ri.unit) for ri in self.recipe_lines(obj)
+        )
+
+    def get_cost_per_serving(self, obj):
+        """
+        Dynamically calculate cost_per_serving based on the current user's preferred currency.
+        This ensures the cost updates when the user switches currencies, matching recipe_costs behavior.
+        """
+        return Recipe.cheapest_market_cost(self.get_recipe_costs(obj))
+
+    def get_allergens(self, obj):
+        return Recipe.allergens_of(ri.ingredient for ri in self.recipe_lines(obj))
 
 # ============================================================
 # 🧩 BASE SERIALIZER (only shared logic, no required model fields)
@@ -87,6 +141,14 @@ class RecipeBaseSerializer(serializers.ModelSerializer):
         except json.JSONDecodeError:
             raise serializers.ValidationError({"ingredients": "Invalid JSON format."})
 
+        try:
+            with transaction.atomic():
+                self._replace_ingredients(recipe, ingredients_data, clear_existing)
+        except IntegrityError:
+            # The catalog snapshot can still hold an ingredient deleted by a write that sent no signal
+            raise serializers.ValidationError({"ingredients": "An ingredient no longer exists."})
+
+    def _replace_ingredients(self, recipe, ingredients_data, clear_existing):
         if clear_existing:
             RecipeIngredient.objects.filter(recipe=recipe).delete()
 
@@ -99,7 +161,7 @@ class RecipeBaseSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({"ingredients": "Missing ingredient_name."})
 
             try:
-                ingredient = Ingredient.objects.get(name=ingredient_name)
+                ingredient = catalog.get_ingredient_by_name(ingredient_name)
             except Ingredient.DoesNotExist:
                 raise serializers.ValidationError(
                     {"ingredients": f"Ingredient '{ingredient_name}' does not exist."}
@@ -151,7 +213,7 @@ class RecipeCreateSerializer(RecipeBaseSerializer):
                     raise serializers.ValidationError("Ingredients must be a valid JSON array.")
 
                 for ing in ingredients_list:
-                    ingredient_obj = Ingredient.objects.get(name=ing['ingredient_name'])
+                    ingredient_obj = catalog.get_ingredient_by_name(ing['ingredient_name'])
                     unit = ing['unit']
                     
                     # Optional: validate unit
@@ -194,7 +256,7 @@ class RecipeCreateSerializer(RecipeBaseSerializer):
 
         for ing in ingredients_list:
             name = ing.get("ingredient_name")
-            if not Ingredient.objects.filter(name=name).exists():
+            if not catalog.ingredient_exists(name):
                 raise serializers.ValidationError(
                     {"ingredients": f"Ingredient '{name}' does not exist."}
                 )
@@ -239,7 +301,7 @@ class RecipeUpdateSerializer(RecipeBaseSerializer):
         return instance
 
 # Used for list view of Recipe (Response)
-class RecipeListSerializer(serializers.ModelSerializer):
+class RecipeListSerializer(RecipeTotalsMixin, serializers.ModelSerializer):
     creator_id = serializers.IntegerField(source='creator.id')
     recipe_costs = serializers.SerializerMethodField()
     recipe_nutritions = serializers.SerializerMethodField()
@@ -278,34 +340,6 @@ class RecipeListSerializer(serializers.ModelSerializer):
             'image_full_url',      # for response (read_only)
         ]
 
-    def get_recipe_costs(self, obj):
-        request = self.context.get("request")
-        user = getattr(request, "user", None)
-        if not user or not user.is_authenticated:
-            class DummyUser:
-                preferredCurrency = "USD"
-            user = DummyUser()
-        return obj.calculate_recipe_cost(user)
-    
-    def get_recipe_nutritions(self, obj):
-        return obj.calculate_nutrition_info()
-    
-    def get_cost_per_serving(self, obj):
-        """
-        Dynamically calculate cost_per_serving based on the current user's preferred currency.
-        This ensures the cost updates when the user switches currencies, matching recipe_costs behavior.
-        """
-        request = self.context.get("request")
-        user = getattr(request, "user", None)
-        if not user or not user.is_authenticated:
-            class DummyUser:
-                preferredCurrency = "USD"
-            user = DummyUser()
-        return obj.calculate_cost_per_serving(user)
-    
-    def get_allergens(self, obj):
-        return obj.check_allergens()
-    
     def get_image_relative_url(self, obj):
         return str(obj.image) if obj.image else None
     
@@ -314,7 +348,7 @@ class RecipeListSerializer(serializers.ModelSerializer):
     
     
 # Used for detail view of Recipe (Response)
-class RecipeDetailSerializer(serializers.ModelSerializer):
+class RecipeDetailSerializer(RecipeTotalsMixin, serializers.ModelSerializer):
     
     allergens = serializers.SerializerMethodField()
     dietary_info = serializers.SerializerMethodField()
@@ -371,37 +405,7 @@ class RecipeDetailSerializer(serializers.ModelSerializer):
         return obj.image.url if obj.image else None
     
     def get_ingredients(self, obj):
-        ingredients = RecipeIngredient.objects.filter(recipe=obj)
-        return RecipeIngredientOutputSerializer(ingredients, many=True, context=self.context).data
-
-    def get_allergens(self, obj):
-        return obj.check_allergens()
+        return RecipeIngredientOutputSerializer(self.recipe_lines(obj), many=True, context=self.context).data
 
     def get_dietary_info(self, obj):
-        return obj.check_dietary_info()
-    
-    def get_recipe_costs(self, obj):
-        request = self.context.get("request")
-        user = getattr(request, "user", None)
-        if not user or not user.is_authenticated:
-            class DummyUser:
-                preferredCurrency = "USD"
-            user = DummyUser()
-        return obj.calculate_recipe_cost(user)
-    
-    def get_recipe_nutritions(self, obj):
-        return obj.calculate_nutrition_info()
-    
-    def get_cost_per_serving(self, obj):
-        """
-        Dynamically calculate cost_per_serving based on the current user's preferred currency.
-        This ensures the cost updates when the user switches currencies, matching recipe_costs behavior.
-        """
-        request = self.context.get("request")
-        user = getattr(request, "user", None)
-        if not user or not user.is_authenticated:
-            class DummyUser:
-                preferredCurrency = "USD"
-            user = DummyUser()
-        return obj.calculate_cost_per_serving(user)
-    
+        return Recipe.dietary_info_of([ri.ingredient for ri in self.recipe_lines(obj)])
@@ -1,24 +1,9 @@
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.db import models
+from django.db.models.lookups import GreaterThanOrEqual
 from django.dispatch import receiver
 from recipes.models import RecipeLike, RecipeIngredient
 from recipes.models import Recipe
-import threading
-
-# Thread-local storage to track old deleted_on values across pre_save and post_save
-_thread_locals = threading.local()
-
-def get_old_deleted_on(recipe_id):
-    """Get the old deleted_on value for a recipe from thread-local storage"""
-    if not hasattr(_thread_locals, 'recipe_deleted_on'):
-        return None
-    return _thread_locals.recipe_deleted_on.get(recipe_id)
-
-def set_old_deleted_on(recipe_id, deleted_on):
-    """Store the old deleted_on value for a recipe in thread-local storage"""
-    if not hasattr(_thread_locals, 'recipe_deleted_on'):
-        _thread_locals.recipe_deleted_on = {}
-    _thread_locals.recipe_deleted_on[recipe_id] = deleted_on
 
 # Signal to update like_count when a new like is added
 @receiver(post_save, sender=RecipeLike)
@@ -56,82 +41,79 @@ def update_recipe_nutrition(sender, instance, **kwargs):
     recipe.carbs = nutrition_info.get('carbs')
     recipe.save(update_fields=['calories', 'protein', 'fat', 'carbs'])
 
-# Signal to track old deleted_on value before save
+# Signal to make sure the old deleted_on value is known before save
 @receiver(pre_save, sender=Recipe)
-def track_recipe_deleted_on(sender, instance, **kwargs):
-    """Track the old deleted_on value before save to detect soft deletes"""
-    if instance.pk:
-        try:
-            old_recipe = Recipe.objects.get(pk=instance.pk)
-            set_old_deleted_on(instance.pk, old_recipe.deleted_on)
-        except Recipe.DoesNotExist:
-            set_old_deleted_on(instance.pk, None)
-    else:
-        # New recipe, no old value
-        set_old_deleted_on(None, None)
+def track_recipe_deleted_on(sender, instance, update_fields=None, **kwargs):
+    """
+    Recipes loaded from the database already remember their deleted_on value
+    (see TimestampedModel), so the row is only read for instances that were
+    built by hand with a primary key.
+    """
+    if instance.pk is None or instance.has_loaded_value('deleted_on'):
+        return
+    if update_fields is not None and 'deleted_on' not in update_fields:
+        return
+    old_deleted_on = (
+        Recipe.objects.filter(pk=instance.pk).values_list('deleted_on', flat=True).first()
+    )
+    instance.set_loaded_value('deleted_on', old_deleted_on)
+
+# Recipe count thresholds for typeOfCook, highest first
+TYPE_OF_COOK_THRESHOLDS = (
+    (10, 'experienced_home_cook'),  # Experienced Home Cook
+    (5, 'home_cook'),  # Home Cook
+)
 
 def get_type_of_cook_from_recipe_count(recipe_count):
     """Determine typeOfCook based on recipeCount"""
-    if recipe_count >= 10:
-        return 'experienced_home_cook'  # Experienced Home Cook
-    elif recipe_count >= 5:
-        return 'home_cook'  # Home Cook
-    else:
-        return 'beginner'
+    for threshold, type_of_cook in TYPE_OF_COOK_THRESHOLDS:
+        if recipe_count >= threshold:
+            return type_of_cook
+    return 'beginner'
+
+def recipe_count_update(delta):
+    """
+    Update kwargs that shift recipeCount by delta and set the matching typeOfCook
+    in the same UPDATE. typeOfCook comes first because MySQL assigns columns left
+    to right, so its Case must still see the old recipeCount.
+    """
+    new_count = models.F('recipeCount') + delta
+    return {
+        'typeOfCook': models.Case(
+            *[
+                models.When(GreaterThanOrEqual(new_count, threshold), then=models.Value(type_of_cook))
+                for threshold, type_of_cook in TYPE_OF_COOK_THRESHOLDS
+            ],
+            default=models.Value('beginner'),
+        ),
+        'recipeCount': new_count,
+    }
 
 # Signal to update recipeCount when a recipe is created or soft-deleted
 @receiver(post_save, sender=Recipe)
 def update_recipe_count(sender, instance, created, **kwargs):
     """Update the creator's recipeCount and typeOfCook when a recipe is created or soft-deleted"""
     from api.models import RegisteredUser
-    
-    creator = instance.creator
-    if not creator:
+
+    update_fields = kwargs.get('update_fields')
+    if not created and update_fields is not None and 'deleted_on' not in update_fields:
+        # Counter-only saves (likes, costs, nutrition) cannot change the soft-delete state
+        return
+    if instance.creator_id is None:
         return
-    
-    old_deleted_on = get_old_deleted_on(instance.pk) if instance.pk else None
-    
+
+    old_deleted_on = (
+        instance.get_loaded_value('deleted_on') if instance.has_loaded_value('deleted_on') else None
+    )
+    creator = RegisteredUser.objects.filter(pk=instance.creator_id)
+
     if created:
         # New recipe created - increment count if not soft-deleted
         if instance.deleted_on is None:
-            # Update recipeCount and get the new value
-            RegisteredUser.objects.filter(pk=creator.pk).update(
-                recipeCount=models.F('recipeCount') + 1
-            )
-            # Refresh to get updated recipeCount, then update typeOfCook
-            creator.refresh_from_db()
-            new_type_of_cook = get_type_of_cook_from_recipe_count(creator.recipeCount)
-            RegisteredUser.objects.filter(pk=creator.pk).update(
-                typeOfCook=new_type_of_cook
-            )
-    else:
-        # Existing recipe updated
-        if old_deleted_on is None and instance.deleted_on is not None:
-            # Recipe was just soft-deleted - decrement count
-            # Ensure count doesn't go below 0
-            creator.refresh_from_db()
-            if creator.recipeCount > 0:
-                RegisteredUser.objects.filter(pk=creator.pk).update(
-                    recipeCount=models.F('recipeCount') - 1
-                )
-                # Update typeOfCook based on new recipeCount
-                creator.refresh_from_db()
-                new_type_of_cook = get_type_of_cook_from_recipe_count(creator.recipeCount)
-                RegisteredUser.objects.filter(pk=creator.pk).update(
-                    typeOfCook=new_type_of_cook
-                )
-        elif old_deleted_on is not None and instance.deleted_on is None:
-            # Recipe was restored from soft-delete - increment count
-            RegisteredUser.objects.filter(pk=creator.pk).update(
-                recipeCount=models.F('recipeCount') + 1
-            )
-            # Refresh to get updated recipeCount, then update typeOfCook
-            creator.refresh_from_db()
-            new_type_of_cook = get_type_of_cook_from_recipe_count(creator.recipeCount)
-            RegisteredUser.objects.filter(pk=creator.pk).update(
-                typeOfCook=new_type_of_cook
-            )
-    
-    # Clean up thread-local storage
-    if instance.pk and hasattr(_thread_locals, 'recipe_deleted_on'):
-        _thread_locals.recipe_deleted_on.pop(instance.pk, None)
\ No newline at end of file
+            creator.update(**recipe_count_update(1))
+    elif old_deleted_on is None and instance.deleted_on is not None:
+        # Recipe was just soft-deleted - decrement count, never below 0
+        creator.filter(recipeCount__gt=0).update(**recipe_count_update(-1))
+    elif old_deleted_on is not None and instance.deleted_on is None:
+        # Recipe was restored from soft-delete - increment count
+        creator.update(**recipe_count_update(1))
@@ -0,0 +1,86 @@
+"""
+Tests for deleted_on change tracking on Recipe
+
+Saves of recipes loaded from the database must not re-read the row to
+detect soft deletes, so like and rating updates cost a single UPDATE.
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.models import RegisteredUser
+from recipes.models import Recipe, RecipeLike
+
+
+class RecipeChangeTrackingTests(TestCase):
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username="tracker",
+            email="tracker@example.com",
+            password="testpass123"
+        )
+        self.liker = RegisteredUser.objects.create_user(
+            username="liker",
+            email="liker@example.com",
+            password="testpass123"
+        )
+        created = Recipe.objects.create(
+            name="Tracked Recipe",
+            steps=["mix", "serve"],
+            prep_time=5,
+            cook_time=10,
+            meal_type="lunch",
+            creator=self.user
+        )
+        self.recipe = Recipe.objects.get(pk=created.pk)
+
+    def _recipe_selects(self, queries):
+        return [
+            q['sql'] for q in queries
+            if q['sql'].startswith('SELECT') and 'recipes_recipe' in q['sql']
+        ]
+
+    def test_loaded_recipe_remembers_deleted_on(self):
+        self.assertTrue(self.recipe.has_loaded_value('deleted_on'))
+        self.assertIsNone(self.recipe.get_loaded_value('deleted_on'))
+
+    def test_rating_update_is_a_single_update(self):
+        with self.assertNumQueries(1):
+            self.recipe.update_ratings('taste', 4.0)
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.taste_rating, 4.0)
+
+    def test_like_does_not_select_recipe(self):
+        with CaptureQueriesContext(connection) as ctx:
+            RecipeLike.objects.create(recipe=self.recipe, user=self.liker)
+        self.assertEqual(self._recipe_selects(ctx.captured_queries), [])
+        self.assertEqual(len(ctx.captured_queries), 2)  # INSERT like, UPDATE like_count
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.like_count, 1)
+
+    def test_soft_delete_detected_without_select(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.recipe.delete()
+        self.assertEqual(self._recipe_selects(ctx.captured_queries), [])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.recipeCount, 0)
+
+    def test_unloaded_instance_falls_back_to_query(self):
+        """A hand-built instance with a pk still has its transition detected"""
+        recipe = Recipe.objects.filter(pk=self.recipe.pk).values(
+            'name', 'steps', 'prep_time', 'cook_time', 'meal_type'
+        ).get()
+        stub = Recipe(pk=self.recipe.pk, creator=self.user, deleted_on=timezone.now(), **recipe)
+        stub.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.recipeCount, 0)
+
+    def test_restore_brings_back_recipe_and_count(self):
+        self.recipe.delete()
+        self.recipe.restore()
+
+        self.assertIsNone(Recipe.objects.get(pk=self.recipe.pk).deleted_on)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.recipeCount, 1)
@@ -14,6 +14,10 @@ from api.models import RegisteredUser
 from recipes.models import Recipe
 from django.utils import timezone
 import json
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 
 def create_recipe(creator, name_suffix, deleted_on=None):
@@ -516,3 +520,65 @@ class RecipeCountEdgeCaseTests(TestCase):
         self.assertEqual(count_after_restore, count_after_create)
         self.assertEqual(count_after_second_delete, count_after_create - 1)
 
+
+
+class RecipeCountSingleUpdateTests(TestCase):
+    """recipeCount and typeOfCook are maintained with one UPDATE"""
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username="singleupdate",
+            email="singleupdate@example.com",
+            password="testpass123"
+        )
+
+    def test_create_issues_one_user_update(self):
+        with CaptureQueriesContext(connection) as ctx:
+            create_recipe(self.user, "single")
+        user_queries = [q['sql'] for q in ctx.captured_queries if 'api_registereduser' in q['sql']]
+        self.assertEqual(len(user_queries), 1)
+        self.assertTrue(user_queries[0].startswith('UPDATE'))
+
+    def test_type_of_cook_follows_threshold(self):
+        for i in range(5):
+            create_recipe(self.user, f"t{i}")
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.recipeCount, 5)
+        self.assertEqual(self.user.typeOfCook, 'home_cook')
+
+        Recipe.objects.filter(creator=self.user).first().delete()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.recipeCount, 4)
+        self.assertEqual(self.user.typeOfCook, 'beginner')
+
+
+class ReconcileRecipeCountsCommandTests(TestCase):
+    """The reconcile command rebuilds counts from live recipes"""
+
+    def test_reconcile_rebuilds_counts(self):
+        user = RegisteredUser.objects.create_user(
+            username="reconcile",
+            email="reconcile@example.com",
+            password="testpass123"
+        )
+        idle = RegisteredUser.objects.create_user(
+            username="idle",
+            email="idle@example.com",
+            password="testpass123"
+        )
+        Recipe.objects.bulk_create([
+            Recipe(name=f"Bulk {i}", steps=["mix"], prep_time=1, cook_time=1,
+                   meal_type="lunch", creator=user)
+            for i in range(6)
+        ] + [
+            Recipe(name="Bulk deleted", steps=["mix"], prep_time=1, cook_time=1,
+                   meal_type="lunch", creator=user, deleted_on=timezone.now())
+        ])
+        RegisteredUser.objects.filter(pk=idle.pk).update(recipeCount=3, typeOfCook='home_cook')
+
+        call_command('reconcile_recipe_counts', stdout=StringIO())
+
+        user.refresh_from_db()
+        idle.refresh_from_db()
+        self.assertEqual((user.recipeCount, user.typeOfCook), (6, 'home_cook'))
+        self.assertEqual((idle.recipeCount, idle.typeOfCook), (0, 'beginner'))
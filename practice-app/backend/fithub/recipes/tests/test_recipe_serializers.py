@@ -11,7 +11,7 @@ from recipes.serializers import (
     RecipeIngredientOutputSerializer
 )
 from decimal import Decimal
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 import json
 from django.test import RequestFactory
 
@@ -288,6 +288,50 @@ class RecipeDetailSerializerTests(TestCase):
         self.assertIsInstance(data["recipe_costs"], dict)
 
 
+    def test_recipe_detail_serializer_matches_model_totals(self):
+        """Totals from the serialization memo equal the model's own calculations."""
+        self.ingredient.price_A101 = Decimal("12.40")
+        self.ingredient.price_SOK = Decimal("11.95")
+        self.ingredient.price_BIM = Decimal("12.10")
+        self.ingredient.price_MIGROS = Decimal("13.05")
+        self.ingredient.calories = Decimal("18.00")
+        self.ingredient.save()
+        flour = Ingredient.objects.create(
+            name="Flour", base_unit="g", base_quantity=Decimal("100.0"), base_currency="TRY",
+            price_A101=Decimal("30.00"), price_SOK=Decimal("28.50"), price_BIM=Decimal("29.25"),
+            price_MIGROS=Decimal("31.90"), calories=Decimal("364.00"),
+            allergens=["gluten"], dietary_info=["vegetarian"], allowed_units=["g", "kg"],
+        )
+        RecipeIngredient.objects.create(recipe=self.recipe, ingredient=flour, quantity=Decimal("0.35"), unit="kg")
+        self.user.preferredCurrency = "TRY"
+        request = RequestFactory().get("/")
+        request.user = self.user
+
+        data = RecipeDetailSerializer(self.recipe, context={"request": request}).data
+
+        self.assertEqual(data["recipe_costs"], self.recipe.calculate_recipe_cost(self.user))
+        self.assertEqual(data["cost_per_serving"], self.recipe.calculate_cost_per_serving(self.user))
+        self.assertGreater(data["cost_per_serving"], 0)
+        self.assertEqual(data["recipe_nutritions"], self.recipe.calculate_nutrition_info())
+        self.assertCountEqual(data["allergens"], self.recipe.check_allergens())
+        self.assertEqual(data["dietary_info"], self.recipe.check_dietary_info())
+
+    def test_recipe_detail_serializer_computes_each_line_once(self):
+        """Prices and nutrition are computed once per ingredient, quantity and unit."""
+        request = RequestFactory().get("/")
+        request.user = self.user
+
+        with patch.object(Ingredient, "price_cents", autospec=True,
+                          side_effect=Ingredient.price_cents) as prices, \
+                patch.object(Ingredient, "nutrition_cents", autospec=True,
+                             side_effect=Ingredient.nutrition_cents) as nutrition:
+            RecipeDetailSerializer(self.recipe, context={"request": request}).data
+
+        # The recipe line (200 g) and the nested ingredient at its base quantity (100 g)
+        self.assertEqual(prices.call_count, 2)
+        self.assertEqual(nutrition.call_count, 2)
+
+
 class RecipeCreateSerializerTests(TestCase):
     """Tests for RecipeCreateSerializer"""
 
@@ -1,9 +1,11 @@
 from django.test import TestCase
-from rest_framework.test import APIClient, APITestCase
+from django.db import connection
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
 from rest_framework import status
 from django.urls import reverse
 from api.models import RegisteredUser
 from recipes.models import Recipe, RecipeIngredient
+from ingredients import catalog
 from ingredients.models import Ingredient
 from decimal import Decimal
 import json
@@ -287,3 +289,40 @@ class RecipeViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 5)
 
+
+class RecipeIngredientCatalogTests(APITransactionTestCase):
+    """Recipe writes against a catalog snapshot that is behind the database"""
+
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username="stale", email="stale@example.com", password="testpass123"
+        )
+        self.ingredient = Ingredient.objects.create(
+            name="Tomato", base_unit="g", base_quantity=Decimal("100.0"), allowed_units=["g", "kg"]
+        )
+        self.surviving = Ingredient.objects.create(
+            name="Onion", base_unit="g", base_quantity=Decimal("100.0"), allowed_units=["g", "kg"]
+        )
+        self.recipe = Recipe.objects.create(
+            name="Stale Recipe", steps=["Step 1"], prep_time=10, cook_time=20, meal_type="lunch", creator=self.user
+        )
+        self.line = RecipeIngredient.objects.create(
+            recipe=self.recipe, ingredient=self.surviving, quantity=Decimal("50"), unit="g"
+        )
+        self.addCleanup(catalog.bump_version)
+
+    def test_ingredient_deleted_without_signals_is_rejected(self):
+        self.assertIsNotNone(catalog.get_catalog().get(self.ingredient.pk))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {Ingredient._meta.db_table} WHERE id = %s", [self.ingredient.pk])
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.put(
+            reverse("recipe-detail", kwargs={"pk": self.recipe.pk}),
+            {"ingredients": json.dumps([{"ingredient_name": "Tomato", "quantity": 200, "unit": "g"}])}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # The rejected update leaves the recipe's existing lines alone
+        self.assertEqual(
+            list(RecipeIngredient.objects.filter(recipe=self.recipe).values_list('pk', flat=True)), [self.line.pk]
+        )
@@ -164,12 +164,8 @@ class RecipeViewSet(viewsets.ModelViewSet):
         if instance.deleted_on:
             return Response({"detail": "Recipe not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        # Soft delete related ingredients
-        RecipeIngredient.objects.filter(recipe=instance, deleted_on__isnull=True).update(deleted_on=timezone.now())
-
-        # Soft delete the recipe
-        instance.deleted_on = timezone.now()
-        instance.save()
+        # Soft delete the recipe and its ingredients
+        instance.delete()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
     
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reports'
+
+    # Import and register the signals when the app is ready
+    def ready(self):
+        import reports.signals  # Keeps the report rollups up to date
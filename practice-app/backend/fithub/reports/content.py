@@ -0,0 +1,43 @@
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+
+from forum.models import ForumPost as Post
+from forum.models import ForumPostComment as PostComment
+from recipes.models import Recipe
+from qa.models import Question, Answer
+
+# Names accepted by the report endpoint for each reportable model
+REPORTABLE_MODELS = {
+    'post': Post,
+    'recipe': Recipe,
+    'postcomment': PostComment,
+    'question': Question,
+    'answer': Answer,
+}
+
+
+def get_content_type(name):
+    """
+    Content type of a reportable model by its report name, or None.
+    ContentType lookups are served from Django's per-process cache,
+    so only the first call for a model hits the database.
+    """
+    model = REPORTABLE_MODELS.get(name.lower())
+    if model is None:
+        return None
+    return ContentType.objects.get_for_model(model)
+
+
+def content_object_prefetch():
+    """
+    Prefetch for Report.content_object: reports are grouped by content type and
+    each type's objects are loaded with a single IN query. The querysets carry
+    what the objects' __str__ needs for the preview.
+    """
+    return GenericPrefetch('content_object', [
+        Post.objects.all(),
+        Recipe.objects.all(),
+        PostComment.objects.select_related('author', 'post'),
+        Question.objects.all(),
+        Answer.objects.select_related('author', 'post'),
+    ])
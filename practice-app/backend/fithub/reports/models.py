@@ -30,4 +30,51 @@ class Report(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"Report #{self.id} - {self.report_type}"
\ No newline at end of file
+        return f"Report #{self.id} - {self.report_type}"
+
+class ReportRollup(models.Model):
+    """
+    One row per reported object, summarizing all of its reports.
+    Kept up to date by reports.signals and resolve_reports so the
+    moderation queue never has to group the Report table.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey('content_type', 'object_id')
+
+    report_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+
+    # Histogram of report types, one column per Report.REPORT_TYPES entry
+    spam_count = models.PositiveIntegerField(default=0)
+    inappropriate_count = models.PositiveIntegerField(default=0)
+    harassment_count = models.PositiveIntegerField(default=0)
+    other_count = models.PositiveIntegerField(default=0)
+
+    first_reported_at = models.DateTimeField(null=True, blank=True)
+    last_reported_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=Report.STATUS_CHOICES, default='pending')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['content_type', 'object_id'], name='unique_report_rollup')
+        ]
+        indexes = [
+            # Moderation queue: most reported pending objects first
+            models.Index(fields=['status', '-pending_count', '-last_reported_at'], name='report_rollup_queue_idx'),
+        ]
+        ordering = ['-pending_count', '-last_reported_at']
+
+    @staticmethod
+    def type_field(report_type):
+        return f"{report_type}_count"
+
+    @property
+    def type_counts(self):
+        return {
+            report_type: getattr(self, self.type_field(report_type))
+            for report_type, _ in Report.REPORT_TYPES
+        }
+
+    def __str__(self):
+        return f"Rollup {self.content_type.model} #{self.object_id} ({self.pending_count} pending)"
@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q
+
+from .models import Report, ReportRollup
+
+
+def record_report(report):
+    """Add a newly created report to the rollup of its object"""
+    rollup, _ = ReportRollup.objects.get_or_create(
+        content_type_id=report.content_type_id,
+        object_id=report.object_id,
+        defaults={'first_reported_at': report.created_at},
+    )
+    changes = {
+        'report_count': F('report_count') + 1,
+        ReportRollup.type_field(report.report_type): F(ReportRollup.type_field(report.report_type)) + 1,
+        'last_reported_at': report.created_at,
+    }
+    if report.status == 'pending':
+        changes['pending_count'] = F('pending_count') + 1
+        changes['status'] = 'pending'
+    ReportRollup.objects.filter(pk=rollup.pk).update(**changes)
+
+
+def _rollup_aggregates():
+    values = {
+        'report_count': Count('id'),
+        'pending_count': Count('id', filter=Q(status='pending')),
+        'first_reported_at': Min('created_at'),
+        'last_reported_at': Max('created_at'),
+    }
+    for report_type, _ in Report.REPORT_TYPES:
+        values[ReportRollup.type_field(report_type)] = Count('id', filter=Q(report_type=report_type))
+    return values
+
+
+def refresh_rollup(content_type_id, object_id):
+    """Recompute one object's rollup from its reports (after edits or deletes)"""
+    values = Report.objects.filter(
+        content_type_id=content_type_id, object_id=object_id
+    ).aggregate(**_rollup_aggregates())
+    if not values['report_count']:
+        ReportRollup.objects.filter(content_type_id=content_type_id, object_id=object_id).delete()
+        return
+    values['status'] = 'pending' if values['pending_count'] else 'resolved'
+    ReportRollup.objects.update_or_create(
+        content_type_id=content_type_id, object_id=object_id, defaults=values
+    )
+
+
+def resolve_reports(content_type_id, object_id):
+    """Close every pending report of an object with one UPDATE, returns how many were closed"""
+    with transaction.atomic():
+        resolved = Report.objects.filter(
+            content_type_id=content_type_id, object_id=object_id, status='pending'
+        ).update(status='resolved')
+        ReportRollup.objects.filter(content_type_id=content_type_id, object_id=object_id).update(
+            pending_count=0, status='resolved'
+        )
+    return resolved
+
+
+def rebuild_rollups():
+    """Recreate every rollup from the Report table with one grouped query"""
+    rows = (
+        Report.objects.order_by()
+        .values('content_type_id', 'object_id')
+        .annotate(**_rollup_aggregates())
+    )
+    rollups = []
+    for row in rows:
+        row['status'] = 'pending' if row['pending_count'] else 'resolved'
+        rollups.append(ReportRollup(**row))
+    with transaction.atomic():
+        ReportRollup.objects.all().delete()
+        ReportRollup.objects.bulk_create(rollups, batch_size=500)
+    return len(rollups)
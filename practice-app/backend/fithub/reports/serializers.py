@@ -1,12 +1,7 @@
 # reports/serializers.py
 from rest_framework import serializers
-from django.contrib.contenttypes.models import ContentType
-from .models import Report
-
-from forum.models import ForumPost as Post
-from forum.models import ForumPostComment as PostComment
-from recipes.models import Recipe
-from qa.models import Question, Answer
+from .content import REPORTABLE_MODELS, get_content_type
+from .models import Report, ReportRollup
 
 
 class ReportCreateSerializer(serializers.ModelSerializer):
@@ -21,17 +16,9 @@ class ReportCreateSerializer(serializers.ModelSerializer):
         content_type_name = validated_data.pop('content_type')
         object_id = validated_data.pop('object_id')
         
-        content_type_map = {
-            'post': ContentType.objects.get_for_model(Post),
-            'recipe': ContentType.objects.get_for_model(Recipe),
-            'postcomment': ContentType.objects.get_for_model(PostComment),
-            'question': ContentType.objects.get_for_model(Question),
-            'answer': ContentType.objects.get_for_model(Answer),
-        }
-        
-        content_type = content_type_map.get(content_type_name.lower())
+        content_type = get_content_type(content_type_name)
         if not content_type:
-            available_types = list(content_type_map.keys())
+            available_types = list(REPORTABLE_MODELS.keys())
             raise serializers.ValidationError(
                 f"Invalid content type '{content_type_name}'. Available types: {available_types}"
             )
@@ -71,4 +58,21 @@ class ReportSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at',)
     
     def get_content_object_preview(self, obj):
-        return str(obj.content_object)
\ No newline at end of file
+        return str(obj.content_object)
+
+class ReportRollupSerializer(serializers.ModelSerializer):
+    content_type_name = serializers.CharField(source='content_type.model', read_only=True)
+    type_counts = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+    content_object_preview = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportRollup
+        fields = [
+            'id', 'content_type', 'content_type_name', 'object_id', 'content_object_preview',
+            'report_count', 'pending_count', 'type_counts',
+            'first_reported_at', 'last_reported_at', 'status',
+        ]
+        read_only_fields = fields
+
+    def get_content_object_preview(self, obj):
+        return str(obj.content_object)
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Report
+from .rollups import record_report, refresh_rollup
+
+
+@receiver(post_save, sender=Report)
+def update_rollup_on_save(sender, instance, created, **kwargs):
+    if created:
+        record_report(instance)
+    else:
+        # Status or type edits are rare, recount this object's reports
+        refresh_rollup(instance.content_type_id, instance.object_id)
+
+
+@receiver(post_delete, sender=Report)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    refresh_rollup(instance.content_type_id, instance.object_id)
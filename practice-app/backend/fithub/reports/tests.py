@@ -1,12 +1,19 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.contrib.contenttypes.models import ContentType
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
 from api.models import RegisteredUser
-from reports.models import Report
+from reports.models import Report, ReportRollup
+from reports.rollups import resolve_reports
 from recipes.models import Recipe
 from qa.models import Question, Answer
+from forum.models import ForumPost, ForumPostComment
 
 
 class ReportTests(APITestCase):
@@ -245,4 +252,162 @@ class ReportTests(APITestCase):
         self.assertEqual(report.status, 'resolved')
         # Verify answer is soft-deleted
         answer.refresh_from_db()
-        self.assertIsNotNone(answer.deleted_on)
\ No newline at end of file
+        self.assertIsNotNone(answer.deleted_on)
+
+class ReportPreviewPrefetchTests(APITestCase):
+    def setUp(self):
+        self.user = RegisteredUser.objects.create_user(
+            username="reporter", email="reporter@example.com", password="pw12345"
+        )
+        self.admin = RegisteredUser.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin123"
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.url = reverse('admin-reports-list')
+
+    def report_every_type(self):
+        recipe = Recipe.objects.create(
+            name="Reported Recipe", steps=["Step 1"], prep_time=1, cook_time=1,
+            meal_type="lunch", creator=self.user
+        )
+        post = ForumPost.objects.create(author=self.user, title="Post", content="content")
+        comment = ForumPostComment.objects.create(author=self.user, content="comment", post=post)
+        question = Question.objects.create(author=self.user, title="Question", content="content")
+        answer = Answer.objects.create(author=self.user, content="answer", post=question)
+        for obj in (recipe, post, comment, question, answer):
+            Report.objects.create(
+                content_type=ContentType.objects.get_for_model(obj),
+                object_id=obj.id,
+                reporter=self.user,
+                report_type='spam'
+            )
+        return answer
+
+    def test_previews_resolved(self):
+        answer = self.report_every_type()
+        response = self.client.get(self.url)
+        previews = {r['content_type_name']: r['content_object_preview'] for r in response.data['results']}
+        self.assertEqual(previews['recipe'], "Reported Recipe")
+        self.assertEqual(previews['answer'], str(answer))
+
+    def test_query_count_independent_of_report_count(self):
+        self.report_every_type()
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+
+        self.report_every_type()
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(len(many.captured_queries), len(few.captured_queries))
+
+
+class ReportRollupTests(APITestCase):
+    def setUp(self):
+        self.users = [
+            RegisteredUser.objects.create_user(
+                username=f"reporter{i}", email=f"reporter{i}@example.com", password="pw12345"
+            )
+            for i in range(3)
+        ]
+        self.admin = RegisteredUser.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin123"
+        )
+        self.recipe = Recipe.objects.create(
+            name="Popular Recipe", steps=["Step 1"], prep_time=1, cook_time=1,
+            meal_type="lunch", creator=self.users[0]
+        )
+        self.question = Question.objects.create(author=self.users[0], title="Question", content="content")
+        self.client.force_authenticate(user=self.admin)
+
+    def report(self, obj, user, report_type='spam'):
+        return Report.objects.create(
+            content_type=ContentType.objects.get_for_model(obj),
+            object_id=obj.id,
+            reporter=user,
+            report_type=report_type
+        )
+
+    def rollup(self, obj):
+        return ReportRollup.objects.get(
+            content_type=ContentType.objects.get_for_model(obj), object_id=obj.id
+        )
+
+    def test_rollup_counts_reports_by_type(self):
+        first = self.report(self.recipe, self.users[0], 'spam')
+        self.report(self.recipe, self.users[1], 'spam')
+        last = self.report(self.recipe, self.users[2], 'harassment')
+
+        rollup = self.rollup(self.recipe)
+        self.assertEqual(rollup.report_count, 3)
+        self.assertEqual(rollup.pending_count, 3)
+        self.assertEqual(rollup.type_counts, {'spam': 2, 'inappropriate': 0, 'harassment': 1, 'other': 0})
+        self.assertEqual(rollup.first_reported_at, first.created_at)
+        self.assertEqual(rollup.last_reported_at, last.created_at)
+        self.assertEqual(rollup.status, 'pending')
+
+    def test_queue_orders_most_reported_first(self):
+        self.report(self.question, self.users[0])
+        for user in self.users:
+            self.report(self.recipe, user)
+
+        response = self.client.get(reverse('admin-reports-queue'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([r['content_type_name'] for r in results], ['recipe', 'question'])
+        self.assertEqual(results[0]['pending_count'], 3)
+        self.assertEqual(results[0]['content_object_preview'], "Popular Recipe")
+
+    def test_resolve_closes_all_reports_of_object(self):
+        report = self.report(self.recipe, self.users[0])
+        self.report(self.recipe, self.users[1])
+        other = self.report(self.question, self.users[0])
+
+        url = reverse('admin-reports-resolve-keep', kwargs={'pk': report.id})
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertFalse(Report.objects.filter(object_id=self.recipe.id, status='pending',
+                                               content_type__model='recipe').exists())
+        other.refresh_from_db()
+        self.assertEqual(other.status, 'pending')
+        rollup = self.rollup(self.recipe)
+        self.assertEqual((rollup.pending_count, rollup.status), (0, 'resolved'))
+
+        queue = self.client.get(reverse('admin-reports-queue')).data['results']
+        self.assertEqual([r['content_type_name'] for r in queue], ['question'])
+
+    def test_new_report_reopens_resolved_rollup(self):
+        report = self.report(self.recipe, self.users[0])
+        resolve_reports(report.content_type_id, report.object_id)
+        self.report(self.recipe, self.users[1])
+
+        rollup = self.rollup(self.recipe)
+        self.assertEqual((rollup.report_count, rollup.pending_count, rollup.status), (2, 1, 'pending'))
+
+    def test_deleting_report_refreshes_rollup(self):
+        report = self.report(self.recipe, self.users[0])
+        self.report(self.recipe, self.users[1], 'other')
+        report.delete()
+
+        rollup = self.rollup(self.recipe)
+        self.assertEqual(rollup.report_count, 1)
+        self.assertEqual(rollup.type_counts['spam'], 0)
+
+    def test_rebuild_command_matches_incremental_rollups(self):
+        self.report(self.recipe, self.users[0])
+        self.report(self.recipe, self.users[1], 'other')
+        self.report(self.question, self.users[2])
+        expected = {
+            (r.content_type_id, r.object_id): (r.report_count, r.pending_count, r.type_counts)
+            for r in ReportRollup.objects.all()
+        }
+
+        call_command('rebuild_report_rollups', stdout=StringIO())
+
+        rebuilt = {
+            (r.content_type_id, r.object_id): (r.report_count, r.pending_count, r.type_counts)
+            for r in ReportRollup.objects.all()
+        }
+        self.assertEqual(rebuilt, expected)
@@ -4,8 +4,13 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.contrib.contenttypes.models import ContentType
-from .models import Report
-from .serializers import ReportCreateSerializer, ReportSerializer
+from django.db import transaction
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from .content import content_object_prefetch
+from .models import Report, ReportRollup
+from .rollups import resolve_reports
+from .serializers import ReportCreateSerializer, ReportSerializer, ReportRollupSerializer
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
@@ -25,21 +30,30 @@ class ReportViewSet(viewsets.ModelViewSet):
         if getattr(self, 'swagger_fake_view', False):
             return Report.objects.none()
         
+        queryset = Report.objects.select_related('reporter', 'content_type').prefetch_related(
+            content_object_prefetch()
+        )
         if getattr(self.request.user, 'is_staff', False):
-            return Report.objects.select_related('reporter', 'content_type').all()
-        return Report.objects.filter(reporter=self.request.user)
+            return queryset
+        return queryset.filter(reporter=self.request.user)
 
 class AdminReportViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     serializer_class = ReportSerializer
-    queryset = Report.objects.select_related('reporter', 'content_type').all()
+
+    def get_queryset(self):
+        queryset = Report.objects.select_related('reporter', 'content_type')
+        if self.action == 'list':
+            # Previews of a whole page: one query per content type instead of one per report
+            queryset = queryset.prefetch_related(content_object_prefetch())
+        return queryset
     
     @action(detail=True, methods=['post'])
     def resolve_keep(self, request, pk=None):
         """Resolve report by keeping the content"""
         report = self.get_object()
-        report.status = 'resolved'
-        report.save()
+        # Closes every pending report on the same object
+        resolve_reports(report.content_type_id, report.object_id)
         return Response({'status': 'Report resolved - content kept'})
     
     @action(detail=True, methods=['post'])
@@ -48,13 +62,37 @@ class AdminReportViewSet(viewsets.ModelViewSet):
         report = self.get_object()
         content_object = report.content_object
         
-        # Delete the reported content
-        content_object.delete()
-        
-        report.status = 'resolved'
-        report.save()
+        with transaction.atomic():
+            # Delete the reported content (soft deletes cascade to its subtree)
+            if content_object is not None:
+                content_object.delete()
+            
+            resolve_reports(report.content_type_id, report.object_id)
         
         return Response({'status': 'Report resolved - content deleted'})
+
+    @swagger_auto_schema(
+        operation_description="Reported objects with their report counts, most reported pending objects first",
+        manual_parameters=[
+            openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=['pending', 'resolved', 'all'], description="Rollup status (default: pending)"),
+        ],
+        responses={200: ReportRollupSerializer(many=True)}
+    )
+    @action(detail=False, methods=['get'])
+    def queue(self, request):
+        """Moderation queue: one row per reported object instead of one per report"""
+        queryset = ReportRollup.objects.select_related('content_type').prefetch_related(
+            content_object_prefetch()
+        )
+        status_filter = request.query_params.get('status', 'pending')
+        if status_filter != 'all':
+            queryset = queryset.filter(status=status_filter)
+        queryset = queryset.order_by('-pending_count', '-last_reported_at', '-id')
+
+        page = self.paginate_queryset(queryset)
+        serializer = ReportRollupSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
 
 
@@ -0,0 +1,129 @@
+"""
+Set-based soft delete and restore of whole object trees.
+
+Models name the reverse relations a soft delete should follow in
+``soft_delete_related``. Each relation is handled with one
+``UPDATE ... WHERE <fk> IN (<parents>)`` statement, so the number of
+statements depends on the shape of the tree and not on how many rows it has.
+
+Every row touched by one cascade gets the same ``deleted_on`` timestamp.
+A restore brings back exactly the rows carrying that timestamp, leaving
+children that had been deleted on their own before untouched.
+
+Bulk updates do not send post_save, so ``rows_soft_deleted`` and
+``rows_restored`` are sent instead with the model, the number of rows and
+``rows``, a queryset containing (at least) the rows that were updated.
+Instances saved through ``soft_delete``/``restore`` send post_save as usual.
+"""
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+# Sent with sender=<model>, count=<rows updated> and rows=<queryset> after each bulk UPDATE
+rows_soft_deleted = Signal()
+rows_restored = Signal()
+
+
+def _related(model):
+    for name in getattr(model, 'soft_delete_related', ()):
+        relation = model._meta.get_field(name)
+        yield relation.related_model, relation.field.name
+
+
+def _delete_related(model, parents, stamp):
+    # parents: pks (or a pk subquery) of rows that were stamped with this cascade
+    count = 0
+    for child_model, fk in _related(model):
+        children = child_model._base_manager.filter(**{f'{fk}__in': parents})
+        updated = children.filter(deleted_on__isnull=True).update(deleted_on=stamp)
+        if updated:
+            rows_soft_deleted.send(
+                sender=child_model, count=updated, rows=children.filter(deleted_on=stamp)
+            )
+            count += updated
+            count += _delete_related(
+                child_model, children.filter(deleted_on=stamp).values('pk'), stamp
+            )
+    return count
+
+
+def _restore_related(model, parents, stamp):
+    # Leaves first: the parents must still carry the stamp while their children are matched
+    count = 0
+    for child_model, fk in _related(model):
+        children = child_model._base_manager.filter(**{f'{fk}__in': parents}, deleted_on=stamp)
+        count += _restore_related(child_model, children.values('pk'), stamp)
+        count += _restore_rows(children, child_model._base_manager.filter(**{f'{fk}__in': parents}))
+    return count
+
+
+def _restore_rows(queryset, superset):
+    # Once restored the rows can no longer be told apart from their live siblings,
+    # so receivers get a superset of them
+    restored = queryset.update(deleted_on=None)
+    if restored:
+        rows_restored.send(
+            sender=queryset.model, count=restored, rows=superset.filter(deleted_on__isnull=True)
+        )
+    return restored
+
+
+def soft_delete(instance, stamp=None):
+    """
+    Soft delete an instance and everything below it.
+    The instance itself is saved normally so its signals still run.
+    Returns the number of related rows deleted.
+    """
+    stamp = stamp or timezone.now()
+    with transaction.atomic():
+        instance.deleted_on = stamp
+        instance.save(update_fields=['deleted_on'])
+        return _delete_related(type(instance), [instance.pk], stamp)
+
+
+def soft_delete_queryset(queryset, stamp=None):
+    """Soft delete every live row of a queryset and their subtrees, returns the row count"""
+    stamp = stamp or timezone.now()
+    with transaction.atomic():
+        count = queryset.filter(deleted_on__isnull=True).update(deleted_on=stamp)
+        if count:
+            rows_soft_deleted.send(
+                sender=queryset.model, count=count, rows=queryset.filter(deleted_on=stamp)
+            )
+            count += _delete_related(
+                queryset.model, queryset.filter(deleted_on=stamp).values('pk'), stamp
+            )
+    return count
+
+
+def restore(instance):
+    """Undo the soft delete that removed this instance, returns the number of related rows restored"""
+    stamp = instance.deleted_on
+    if stamp is None:
+        return 0
+    with transaction.atomic():
+        count = _restore_related(type(instance), [instance.pk], stamp)
+        instance.deleted_on = None
+        instance.save(update_fields=['deleted_on'])
+    return count
+
+
+def restore_queryset(queryset, stamp=None):
+    """
+    Undo the soft deletes of the rows in a queryset, returns the row count.
+    With a stamp, only the cascade that deleted rows at that time is undone.
+    """
+    count = 0
+    with transaction.atomic():
+        if stamp is None:
+            stamps = list(
+                queryset.filter(deleted_on__isnull=False)
+                .order_by().values_list('deleted_on', flat=True).distinct()
+            )
+        else:
+            stamps = [stamp]
+        for stamp in stamps:
+            deleted = queryset.filter(deleted_on=stamp)
+            count += _restore_related(queryset.model, deleted.values('pk'), stamp)
+            count += _restore_rows(deleted, queryset)
+    return count
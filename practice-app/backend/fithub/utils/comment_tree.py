@@ -0,0 +1,111 @@
+# utils/comment_tree.py
+# Nested comment threads for forum comments and q/a answers
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from rest_framework.response import Response
+
+from utils.votes import get_user_votes
+
+DEFAULT_TREE_DEPTH = 3
+MAX_TREE_DEPTH = 10
+
+
+def parse_tree_depth(raw_value):
+    """Reply depth requested by the client, clamped to 0..MAX_TREE_DEPTH"""
+    try:
+        depth = int(raw_value)
+    except (TypeError, ValueError):
+        return DEFAULT_TREE_DEPTH
+    return max(0, min(depth, MAX_TREE_DEPTH))
+
+
+def load_thread_descendants(comments, roots, max_depth):
+    """
+    Live replies under the given thread roots in one query ordered by path.
+    One level beyond max_depth is loaded so truncated nodes can be flagged.
+    Rows from before the path column (empty path, until backfill_comment_paths
+    runs) come with the same query and are placed through parent_comment.
+    """
+    if not roots or max_depth == 0:
+        return []
+    # A root without a stored path still prefixes the paths of its newer replies
+    prefixes = [root.path or root.build_path() for root in roots]
+    descendants = list(
+        comments.filter(
+            reduce(or_, [Q(path__startswith=prefix) for prefix in prefixes], Q(path='')),
+            parent_comment__isnull=False,
+            level__lte=max_depth + 1,
+        ).order_by('path')
+    )
+    if all(comment.path for comment in descendants):
+        return descendants
+    return _order_by_parent(roots, descendants)
+
+
+def _order_by_parent(roots, descendants):
+    """The descendants reachable from roots, each parent before its replies and siblings by id"""
+    replies = {}
+    for comment in sorted(descendants, key=lambda comment: comment.pk, reverse=True):
+        replies.setdefault(comment.parent_comment_id, []).append(comment)
+    ordered = []
+    pending = [reply for root in reversed(roots) for reply in replies.get(root.pk, [])]
+    while pending:
+        comment = pending.pop()
+        ordered.append(comment)
+        pending.extend(replies.get(comment.pk, []))
+    return ordered
+
+
+def build_comment_tree(roots, descendants, serializer_class, context, max_depth):
+    """
+    Assemble serialized roots with nested "replies" in memory.
+
+    descendants must be ordered by path so every parent precedes its replies.
+    Replies of deleted or out-of-range parents are dropped; nodes at max_depth
+    that have further replies get "has_more_replies": true.
+    """
+    comments = list(roots) + list(descendants)
+    serialized = serializer_class(comments, many=True, context=context).data
+
+    nodes, depths, tree = {}, {}, []
+    for comment, data in zip(roots, serialized):
+        node = dict(data, replies=[], has_more_replies=False)
+        nodes[comment.pk] = node
+        depths[comment.pk] = 0
+        tree.append(node)
+
+    for comment, data in zip(descendants, serialized[len(roots):]):
+        parent = nodes.get(comment.parent_comment_id)
+        if parent is None:
+            continue
+        depth = depths[comment.parent_comment_id] + 1
+        if depth > max_depth:
+            parent['has_more_replies'] = True
+            continue
+        node = dict(data, replies=[], has_more_replies=False)
+        nodes[comment.pk] = node
+        depths[comment.pk] = depth
+        parent['replies'].append(node)
+
+    return tree
+
+
+def comment_tree_response(view, comments):
+    """Paginate top-level threads of `comments` and return them as nested trees"""
+    max_depth = parse_tree_depth(view.request.query_params.get('depth'))
+    threads = comments.filter(parent_comment__isnull=True).order_by('created_at', 'pk')
+    page = view.paginate_queryset(threads)
+    roots = list(page if page is not None else threads)
+    descendants = load_thread_descendants(comments, roots, max_depth)
+    if getattr(view, 'my_votes', None) is not None:
+        # MyVoteListMixin only saw the roots of the page
+        view.my_votes.update(get_user_votes(
+            view.vote_model, view.vote_target_field, view.request.user,
+            [comment.pk for comment in descendants]
+        ))
+    tree = build_comment_tree(
+        roots, descendants, view.get_serializer_class(), view.get_serializer_context(), max_depth
+    )
+    return view.get_paginated_response(tree) if page is not None else Response(tree)
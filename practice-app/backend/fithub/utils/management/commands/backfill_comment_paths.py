@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from forum.models import ForumPostComment
+from qa.models import Answer
+from utils.models import COMMENT_MAX_LEVEL, COMMENT_PATH_DIGITS
+
+
+class Command(BaseCommand):
+    help = 'Recomputes materialized paths and levels of forum comments and answers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows written per bulk UPDATE'
+        )
+
+    def handle(self, *args, **options):
+        for model in (ForumPostComment, Answer):
+            updated = self.backfill(model, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Updated paths of {updated} {model.__name__} rows'))
+
+    def backfill(self, model, batch_size):
+        # Parents always have a smaller id than their replies, so one pass in id order suffices
+        paths, levels, parents = {}, {}, {}
+        changed = []
+        rows = model.objects.order_by('pk').only('pk', 'parent_comment_id', 'path', 'level')
+        for comment in rows.iterator(chunk_size=batch_size):
+            parent_id = comment.parent_comment_id
+            if levels.get(parent_id, -1) >= COMMENT_MAX_LEVEL:
+                # Too deep for the path column: hang the reply beside its parent instead
+                parent_id = parents[parent_id]
+            parents[comment.pk] = parent_id
+            parent_path = paths.get(parent_id, '') if parent_id else ''
+            path = f"{parent_path}{comment.pk:0{COMMENT_PATH_DIGITS}d}/"
+            level = levels[parent_id] + 1 if parent_id in levels else 0
+            paths[comment.pk] = path
+            levels[comment.pk] = level
+            if comment.path != path or comment.level != level or comment.parent_comment_id != parent_id:
+                comment.path = path
+                comment.level = level
+                comment.parent_comment_id = parent_id
+                changed.append(comment)
+
+        model.objects.bulk_update(changed, ['path', 'level', 'parent_comment'], batch_size=batch_size)
+        return len(changed)
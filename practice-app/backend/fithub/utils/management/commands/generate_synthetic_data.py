@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.synthetic import DEFAULTS, SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes a large, seeded synthetic dataset (users, follows, recipes with ingredients, likes, '
+        'ratings, forum posts, questions, comments, answers and votes) with bulk_create and '
+        'rebuilds the denormalized counters'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULTS.items():
+            option = '--' + name.replace('_', '-')
+            if '_per_' in name:
+                parser.add_argument(option, type=float, help=f'mean per item (default {default})')
+            else:
+                parser.add_argument(option, type=int, help=f'total (default {default})')
+        parser.add_argument('--seed', type=int, default=0, help='same seed, same data')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='parent rows written per transaction')
+        parser.add_argument(
+            '--prefix', default='synthetic',
+            help='username and title prefix; use another prefix or seed to add a second dataset'
+        )
+
+    def handle(self, *args, **options):
+        generator = SyntheticDataGenerator(
+            seed=options['seed'], chunk_size=options['chunk_size'], prefix=options['prefix'],
+            log=self.stdout.write,
+        )
+        try:
+            created = generator.run(**{name: options[name] for name in DEFAULTS})
+        except ValueError as error:
+            raise CommandError(str(error))
+        for model, count in created.items():
+            self.stdout.write(f'{model}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Created {sum(created.values())} rows'))
@@ -1,6 +1,9 @@
 # utils/models.py
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from api.models import TimestampedModel, RegisteredUser
+from utils import cascade
 
 # Abstract base class for posts, will be used in forum and q/a models
 class PostModel(TimestampedModel):
@@ -46,6 +49,14 @@ class PostModel(TimestampedModel):
         self.reported_count -= 1
         self.save()
 
+    def delete(self, using=None, keep_parents=False):
+        """Soft delete this post together with everything in soft_delete_related."""
+        cascade.soft_delete(self)
+
+    def restore(self):
+        """Bring back this post and what was deleted along with it."""
+        cascade.restore(self)
+
     def __str__(self):
         return f"Post #{self.pk}, {self.title}"
 
@@ -68,6 +79,12 @@ class PostVoteModel(TimestampedModel):
 
 ### MODELS FOR COMMENTS ###
 
+# Width of each id segment in CommentModel.path
+COMMENT_PATH_DIGITS = 10
+COMMENT_PATH_MAX_LENGTH = 255
+# Deepest reply level whose path still fits in the path column
+COMMENT_MAX_LEVEL = COMMENT_PATH_MAX_LENGTH // (COMMENT_PATH_DIGITS + 1) - 1
+
 
 # Abstract base class for comments, will be used in forum and q/a models
 class CommentModel(TimestampedModel):
@@ -82,10 +99,16 @@ class CommentModel(TimestampedModel):
     )
     # To store depth or nesting level, was a reply to another comment or was a post comment
     level = models.PositiveIntegerField(default=0)
+    # Materialized path: zero-padded ids from the thread root down to this comment,
+    # e.g. "0000000012/0000000045/". Ordering by path yields threads depth-first.
+    path = models.CharField(max_length=COMMENT_PATH_MAX_LENGTH, blank=True, default='', db_index=True)
     upvote_count = models.PositiveIntegerField(default=0)
     downvote_count = models.PositiveIntegerField(default=0)
     reported_count = models.PositiveIntegerField(default=0)
 
+    # Replies are reached through the path, only the votes hang off each comment
+    soft_delete_related = ('votes',)
+
     # This makes the model abstract and cannot be instantiated directly
     # We will use this class to create comments for posts and use as subclass
     # We don't want to create a table for this class
@@ -128,7 +151,59 @@ class CommentModel(TimestampedModel):
             raise ValueError("Cannot reply to a comment from a different post.")
         if not self.post.is_commentable:
             raise ValueError("Cannot comment on a non-commentable post.")
+        if self.pk is None and self.parent_comment and self.parent_comment.level >= COMMENT_MAX_LEVEL:
+            raise ValueError("Cannot reply deeper than the maximum comment level.")
+        is_new = self.pk is None
+        if is_new and self.parent_comment:
+            self.level = self.parent_comment.level + 1
         super().save(*args, **kwargs)
+        if is_new or not self.path:
+            # The path needs our own id, so it is written right after the insert
+            self.path = self.build_path()
+            type(self).objects.filter(pk=self.pk).update(path=self.path)
+
+    def build_path(self):
+        """Materialized path of this comment, built from its parent's path"""
+        parent = self.parent_comment
+        parent_path = ''
+        if parent is not None:
+            parent_path = parent.path or parent.build_path()
+        return f"{parent_path}{self.pk:0{COMMENT_PATH_DIGITS}d}/"
+
+    def subtree(self):
+        """This comment and all of its replies, at any depth."""
+        manager = type(self)._base_manager
+        query = Q(pk=self.pk) | Q(path__startswith=self.path or self.build_path())
+        # Rows from before the path column keep an empty path until backfill_comment_paths
+        # runs; they are reached through parent_comment instead
+        rows = list(
+            manager.filter(query | Q(post_id=self.post_id, path=''))
+            .values_list('pk', 'parent_comment_id', 'path')
+        )
+        if all(path for pk, _, path in rows if pk != self.pk):
+            return manager.filter(query)
+        replies = {}
+        for pk, parent_id, _ in rows:
+            replies.setdefault(parent_id, []).append(pk)
+        ids, pending = [self.pk], [self.pk]
+        while pending:
+            children = replies.get(pending.pop(), [])
+            ids.extend(children)
+            pending.extend(children)
+        return manager.filter(pk__in=ids)
+
+    def delete(self, using=None, keep_parents=False):
+        """Soft delete this comment, its replies and their votes."""
+        # Updated in bulk: saving would re-run the commentable checks of save()
+        self.deleted_on = timezone.now()
+        cascade.soft_delete_queryset(self.subtree(), stamp=self.deleted_on)
+
+    def restore(self):
+        """Bring back this comment and the replies deleted along with it."""
+        if self.deleted_on is None:
+            return
+        cascade.restore_queryset(self.subtree(), stamp=self.deleted_on)
+        self.deleted_on = None
 
     def __str__(self):
         return f"Comment by {self.author} on Post {self.post.id}"
@@ -9,7 +9,9 @@ class StandardPagination(PageNumberPagination):
 
     def paginate_queryset(self, queryset, request, view=None):
         # Ensure queryset is ordered explicitly to avoid the warning
-        if queryset and not queryset.query.order_by:
+        # Checked on the query itself so the queryset is not evaluated here;
+        # Meta.ordering does not count, as before
+        if hasattr(queryset, 'query') and not queryset.query.order_by:
             queryset = queryset.order_by('created_at')  # Add your desired ordering
         return super().paginate_queryset(queryset, request, view)
 
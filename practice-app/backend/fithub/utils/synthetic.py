@@ -0,0 +1,403 @@
+# utils/synthetic.py
+"""
+Deterministic, high-volume synthetic data written straight to the database.
+
+Rows are built in chunks of `chunk_size` parents (users, recipes, posts,
+questions) together with their children and written with bulk_create, so
+memory stays flat however many rows are generated. Primary keys are
+assigned here rather than by the database: children can reference parents
+without reading ids back and the same seed yields the same rows.
+
+Activity is skewed the way real traffic is: a few users write most recipes,
+posts and votes, a few accounts get most follows and a few recipes get most
+likes. Per-item counts (likes, comments, votes, ...) are drawn from a
+log-normal distribution around the requested mean.
+
+bulk_create sends no signals, so every denormalized counter is set here:
+like, vote and rating aggregates are written with their rows, and the
+per-user counters and analytics counters are rebuilt at the end with the
+same set-based helpers the rebuild commands use.
+"""
+import math
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, models, reset_queries, transaction
+from django.db.models.functions import Coalesce
+
+from analytics.metrics import backfill_daily, last_backfilled_date, reset_counters
+from api.follows import Follow, recount_follows
+from api.models import RecipeRating, RegisteredUser
+from api.summary import COUNTER_FIELDS, recount_content
+from forum.models import ForumPost, ForumPostComment, ForumPostCommentVote, ForumPostVote
+from ingredients import catalog
+from ingredients.models import Ingredient
+from qa.models import Answer, AnswerVote, Question, QuestionVote
+from recipes.models import Recipe, RecipeIngredient, RecipeLike
+from recipes.signals import TYPE_OF_COOK_THRESHOLDS
+from utils.models import COMMENT_PATH_DIGITS
+
+LikedRecipe = RegisteredUser.likedRecipes.through
+
+# Totals and per-item means used when the command is not told otherwise
+DEFAULTS = {
+    'users': 10000,
+    'recipes': 20000,
+    'posts': 10000,
+    'questions': 5000,
+    'ingredients': 200,  # only created when the catalog is empty
+    'follows_per_user': 15,
+    'ingredients_per_recipe': 7,
+    'likes_per_recipe': 8,
+    'ratings_per_recipe': 3,
+    'comments_per_post': 5,
+    'answers_per_question': 3,
+    'votes_per_post': 6,
+    'votes_per_comment': 1,
+}
+
+MARKETS = ('A101', 'SOK', 'BIM', 'MIGROS')
+NUTRIENTS = ('calories', 'protein', 'fat', 'carbs')
+CENT = Decimal('0.01')
+
+# Quantity ranges per unit, kept small enough for the recipe's DecimalField totals
+QUANTITY_RANGES = {
+    'g': (10, 500), 'ml': (10, 500), 'kg': (1, 2), 'l': (1, 2),
+    'cup': (1, 3), 'tbsp': (1, 4), 'tsp': (1, 4), 'pcs': (1, 6),
+}
+
+REPLY_PROBABILITY = 0.3  # chance that a comment answers an earlier comment of its post
+ACTIVITY_SKEW = 3  # larger is more skewed; 3 puts ~46% of picks in the first 10% of rows
+DISPERSION = 1.0  # sigma of the log-normal per-item counts
+
+
+class _USDUser:
+    # Recipes store their cost in USD, like the RecipeIngredient signals do
+    preferredCurrency = 'USD'
+
+
+def _add(totals, values):
+    # Missing prices or nutrients count as zero, as in Recipe.calculate_recipe_cost
+    return [total if value is None else total + value for total, value in zip(totals, values)]
+
+
+def next_id(model):
+    return (model._base_manager.aggregate(top=models.Max('pk'))['top'] or 0) + 1
+
+
+class SyntheticDataGenerator:
+    def __init__(self, seed=0, chunk_size=2000, prefix='synthetic', log=None):
+        self.rng = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.prefix = f'{prefix}{seed}'
+        self.log = log or (lambda message: None)
+        self.created = {}
+        self._line_totals = {}
+
+    # Distributions
+
+    def skewed_index(self, size):
+        """Index in [0, size) with low indexes much more likely (power law)"""
+        return min(size - 1, int(size * self.rng.random() ** ACTIVITY_SKEW))
+
+    def item_count(self, mean, cap):
+        """A heavy-tailed count around mean, at most cap"""
+        if mean <= 0 or cap <= 0:
+            return 0
+        mu = math.log(mean) - DISPERSION ** 2 / 2
+        return min(cap, int(round(self.rng.lognormvariate(mu, DISPERSION))))
+
+    def distinct_users(self, count, exclude=None):
+        """count different user ids, favouring the most active users"""
+        picked = set()
+        while len(picked) < count:
+            user_id = self.first_user_id + self.skewed_index(self.user_total)
+            if user_id != exclude:
+                picked.add(user_id)
+        return list(picked)
+
+    def active_user(self):
+        return self.first_user_id + self.skewed_index(self.user_total)
+
+    # Writing
+
+    def chunks(self, total):
+        for start in range(0, total, self.chunk_size):
+            yield start, min(total, start + self.chunk_size)
+
+    def write(self, *batches):
+        """bulk_create each (model, rows) batch in order, parents before children"""
+        with transaction.atomic():
+            for model, rows in batches:
+                if rows:
+                    model.objects.bulk_create(rows, batch_size=self.chunk_size)
+                    self.created[model.__name__] = self.created.get(model.__name__, 0) + len(rows)
+        # With DEBUG on, the connection would otherwise keep every INSERT statement
+        reset_queries()
+
+    def run(self, **options):
+        sizes = {**DEFAULTS, **{key: value for key, value in options.items() if value is not None}}
+        if sizes['users'] < 2:
+            raise ValueError('At least two users are needed to generate follows and votes')
+        self.sizes = sizes
+        self.load_ingredients()
+        self.generate_users()
+        self.generate_recipes()
+        self.generate_threads(
+            ForumPost, ForumPostComment, ForumPostVote, ForumPostCommentVote,
+            sizes['posts'], sizes['comments_per_post'],
+        )
+        self.generate_threads(
+            Question, Answer, QuestionVote, AnswerVote,
+            sizes['questions'], sizes['answers_per_question'],
+        )
+        self.rebuild_counters()
+        return self.created
+
+    # Ingredients
+
+    def load_ingredients(self):
+        self.ingredients = list(Ingredient.objects.filter(deleted_on__isnull=True).order_by('pk'))
+        if not self.ingredients:
+            self.generate_ingredients(self.sizes['ingredients'])
+        self.ingredient_units = [self.usable_units(ingredient) for ingredient in self.ingredients]
+
+    def generate_ingredients(self, total):
+        rng = self.rng
+        first_id = next_id(Ingredient)
+        rows = [
+            Ingredient(
+                id=first_id + i,
+                name=f'{self.prefix} ingredient {i}',
+                allergens=rng.sample(['gluten', 'nuts', 'dairy', 'eggs', 'soy'], rng.randint(0, 2)),
+                dietary_info=rng.sample(['vegan', 'vegetarian', 'gluten-free'], rng.randint(0, 2)),
+                calories=Decimal(rng.randint(10, 900)),
+                protein=Decimal(rng.randint(0, 40)),
+                fat=Decimal(rng.randint(0, 60)),
+                carbs=Decimal(rng.randint(0, 80)),
+                **{f'price_{market}': Decimal(rng.randint(50, 5000)) / 100 for market in MARKETS},
+                base_unit='g',
+                base_quantity=Decimal('100'),
+                allowed_units=['g', 'kg', 'pcs'],
+            )
+            for i in range(total)
+        ]
+        self.write((Ingredient, rows))
+        catalog.ingredient_changed()
+        self.ingredients = rows
+        self.log(f'Created {total} ingredients')
+
+    @staticmethod
+    def usable_units(ingredient):
+        convertible = Ingredient.UNIT_CONVERSIONS.get(ingredient.base_unit, {})
+        units = [
+            unit for unit in (ingredient.allowed_units or [])
+            if unit in QUANTITY_RANGES and (unit == ingredient.base_unit or unit in convertible)
+        ]
+        return units or [ingredient.base_unit]
+
+    def line_totals(self, index, quantity, unit):
+        """Cost per market and nutrients of one recipe line, computed once per distinct line"""
+        key = (index, quantity, unit)
+        totals = self._line_totals.get(key)
+        if totals is None:
+            ingredient = self.ingredients[index]
+            prices = ingredient.get_price_for_user(_USDUser(), quantity=quantity, unit=unit)
+            nutrition = ingredient.get_nutrion_info(quantity=quantity, unit=unit)
+            totals = self._line_totals[key] = (
+                [prices[market] for market in MARKETS],
+                [nutrition[nutrient] for nutrient in NUTRIENTS],
+            )
+        return totals
+
+    # Users and follows
+
+    def generate_users(self):
+        total = self.sizes['users']
+        self.first_user_id = next_id(RegisteredUser)
+        self.user_total = total
+        password = make_password('password')  # Hashed once: hashing per user would dominate the run
+        for start, end in self.chunks(total):
+            self.write((RegisteredUser, [
+                RegisteredUser(
+                    id=self.first_user_id + i,
+                    username=f'{self.prefix}_user{i}',
+                    email=f'{self.prefix}_user{i}@example.com',
+                    password=password,
+                    preferredCurrency=self.rng.choice(['USD', 'TRY']),
+                )
+                for i in range(start, end)
+            ]))
+        # Second pass: a user can follow anyone, including users of later chunks
+        follows_cap = min(total - 1, 1000)
+        for start, end in self.chunks(total):
+            follows = []
+            for user_id in range(self.first_user_id + start, self.first_user_id + end):
+                for target in self.distinct_users(
+                    self.item_count(self.sizes['follows_per_user'], follows_cap), exclude=user_id
+                ):
+                    follows.append(Follow(from_registereduser_id=user_id, to_registereduser_id=target))
+            self.write((Follow, follows))
+        self.log(f'Created {total} users and their follows')
+
+    # Recipes
+
+    def generate_recipes(self):
+        rng = self.rng
+        total = self.sizes['recipes']
+        first_id = next_id(Recipe)
+        like_cap = min(self.user_total, 1000)
+        per_recipe = min(int(round(self.sizes['ingredients_per_recipe'])), len(self.ingredients))
+        for start, end in self.chunks(total):
+            recipes, lines, likes, liked, ratings = [], [], [], [], []
+            for i in range(start, end):
+                recipe_id = first_id + i
+                recipe = Recipe(
+                    id=recipe_id,
+                    name=f'{self.prefix} recipe {i}',
+                    steps=[f'Step {step}' for step in range(1, rng.randint(2, 8))],
+                    prep_time=rng.randint(5, 60),
+                    cook_time=rng.randint(0, 180),
+                    meal_type=rng.choice(['breakfast', 'lunch', 'dinner']),
+                    creator_id=self.active_user(),
+                )
+
+                costs = [Decimal('0.0')] * len(MARKETS)
+                nutrition = [Decimal('0.0')] * len(NUTRIENTS)
+                for index in rng.sample(range(len(self.ingredients)), per_recipe):
+                    unit = rng.choice(self.ingredient_units[index])
+                    quantity = Decimal(rng.randint(*QUANTITY_RANGES[unit]))
+                    line_costs, line_nutrition = self.line_totals(index, quantity, unit)
+                    costs = _add(costs, line_costs)
+                    nutrition = _add(nutrition, line_nutrition)
+                    lines.append(RecipeIngredient(
+                        recipe_id=recipe_id, ingredient_id=self.ingredients[index].pk,
+                        quantity=quantity, unit=unit,
+                    ))
+                recipe.cost_per_serving = min(costs).quantize(CENT)
+                for nutrient, value in zip(NUTRIENTS, nutrition):
+                    setattr(recipe, nutrient, value.quantize(CENT))
+
+                likers = self.distinct_users(self.item_count(self.sizes['likes_per_recipe'], like_cap))
+                recipe.like_count = len(likers)
+                for user_id in likers:
+                    likes.append(RecipeLike(recipe_id=recipe_id, user_id=user_id))
+                    liked.append(LikedRecipe(registereduser_id=user_id, recipe_id=recipe_id))
+
+                raters = self.distinct_users(self.item_count(self.sizes['ratings_per_recipe'], like_cap))
+                tastes = [rng.randint(0, 10) / 2 for _ in raters]
+                difficulties = [rng.randint(0, 10) / 2 for _ in raters]
+                if raters:
+                    recipe.taste_rating = sum(tastes) / len(raters)
+                    recipe.difficulty_rating = sum(difficulties) / len(raters)
+                recipe.taste_rating_count = recipe.difficulty_rating_count = len(raters)
+                ratings.extend(
+                    RecipeRating(user_id=user_id, recipe_id=recipe_id, taste_rating=taste, difficulty_rating=difficulty)
+                    for user_id, taste, difficulty in zip(raters, tastes, difficulties)
+                )
+                recipes.append(recipe)
+            self.write(
+                (Recipe, recipes), (RecipeIngredient, lines),
+                (RecipeLike, likes), (LikedRecipe, liked), (RecipeRating, ratings),
+            )
+        self.log(f'Created {total} recipes')
+
+    # Forum posts and questions
+
+    def generate_threads(self, post_model, comment_model, post_vote_model, comment_vote_model, total, comments_mean):
+        rng = self.rng
+        tags = [choice for choice, _ in post_model.TagChoices.choices]
+        first_post_id = next_id(post_model)
+        comment_id = next_id(comment_model)
+        vote_cap = min(self.user_total, 1000)
+        for start, end in self.chunks(total):
+            posts, comments, post_votes, comment_votes = [], [], [], []
+            for i in range(start, end):
+                post_id = first_post_id + i
+                post = post_model(
+                    id=post_id,
+                    author_id=self.active_user(),
+                    title=f'{self.prefix} {post_model._meta.verbose_name} {i}',
+                    content=f'Synthetic content {i}',
+                    tags=rng.sample(tags, rng.randint(0, 3)),
+                    view_count=self.item_count(50, 100000),
+                )
+                post.upvote_count, post.downvote_count = self.votes(
+                    post_vote_model, 'post_id', post_id, self.item_count(self.sizes['votes_per_post'], vote_cap), post_votes
+                )
+                posts.append(post)
+
+                thread = []
+                for _ in range(self.item_count(comments_mean, 500)):
+                    parent = rng.choice(thread) if thread and rng.random() < REPLY_PROBABILITY else None
+                    path = f"{parent.path if parent else ''}{comment_id:0{COMMENT_PATH_DIGITS}d}/"
+                    comment = comment_model(
+                        id=comment_id, post_id=post_id, author_id=self.active_user(),
+                        content=f'Synthetic reply {comment_id}',
+                        parent_comment_id=parent.pk if parent else None,
+                        level=parent.level + 1 if parent else 0,
+                        path=path,
+                    )
+                    comment.upvote_count, comment.downvote_count = self.votes(
+                        comment_vote_model, 'comment_id', comment_id,
+                        self.item_count(self.sizes['votes_per_comment'], vote_cap), comment_votes,
+                    )
+                    thread.append(comment)
+                    comment_id += 1
+                comments.extend(thread)
+            self.write(
+                (post_model, posts), (comment_model, comments),
+                (post_vote_model, post_votes), (comment_vote_model, comment_votes),
+            )
+        self.log(f'Created {total} {post_model._meta.verbose_name_plural}')
+
+    def votes(self, vote_model, target_field, target_id, count, rows):
+        """Append count votes on one target to rows, returns (upvotes, downvotes)"""
+        up = 0
+        for user_id in self.distinct_users(count):
+            vote_type = 'up' if self.rng.random() < 0.8 else 'down'
+            up += vote_type == 'up'
+            rows.append(vote_model(user_id=user_id, vote_type=vote_type, **{target_field: target_id}))
+        return up, count - up
+
+    # Counters
+
+    def rebuild_counters(self):
+        with transaction.atomic():
+            recount_follows()
+            for model in COUNTER_FIELDS:
+                recount_content(model)
+            recount_recipes()
+            backfill_daily(last_backfilled_date())
+            reset_counters()
+        # Ids were assigned explicitly; backends with sequences must skip past them
+        models_with_ids = [
+            Ingredient, RegisteredUser, Recipe, ForumPost, ForumPostComment, Question, Answer,
+        ]
+        statements = connection.ops.sequence_reset_sql(no_style(), models_with_ids)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+        self.log('Rebuilt user, follow, recipe and analytics counters')
+
+
+def recount_recipes():
+    """Rebuild recipeCount and typeOfCook of every user in two UPDATEs"""
+    live = Coalesce(
+        models.Subquery(
+            Recipe.objects.filter(creator=models.OuterRef('pk'), deleted_on__isnull=True)
+            .order_by().values('creator').annotate(total=models.Count('pk')).values('total')[:1]
+        ),
+        models.Value(0),
+    )
+    RegisteredUser.objects.update(recipeCount=live)
+    return RegisteredUser.objects.update(typeOfCook=models.Case(
+        *[
+            models.When(recipeCount__gte=threshold, then=models.Value(type_of_cook))
+            for threshold, type_of_cook in TYPE_OF_COOK_THRESHOLDS
+        ],
+        default=models.Value('beginner'),
+    ))
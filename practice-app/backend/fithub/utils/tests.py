@@ -0,0 +1,119 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count, Q
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from analytics.models import SystemCounter
+from api.follows import Follow
+from api.models import RegisteredUser
+from forum.models import ForumPost, ForumPostComment
+from qa.models import Answer
+from recipes.models import Recipe, RecipeLike
+from reports.models import Report
+from utils.pagination import StandardPagination
+from utils.synthetic import SyntheticDataGenerator
+
+SIZES = {
+    'users': 40, 'recipes': 30, 'posts': 20, 'questions': 10, 'ingredients': 25,
+    'follows_per_user': 4, 'ingredients_per_recipe': 4, 'likes_per_recipe': 3,
+    'ratings_per_recipe': 2, 'comments_per_post': 4, 'answers_per_question': 2,
+    'votes_per_post': 3, 'votes_per_comment': 1,
+}
+
+
+class SyntheticDataGeneratorTests(TestCase):
+
+    def generate(self, seed=1):
+        return SyntheticDataGenerator(seed=seed, chunk_size=7).run(**SIZES)
+
+    def test_counters_match_rows(self):
+        created = self.generate()
+        self.assertEqual(created['RegisteredUser'], 40)
+        self.assertEqual(created['Recipe'], 30)
+
+        for user in RegisteredUser.objects.annotate(
+            follower_rows=Count('followers', distinct=True),
+            following_rows=Count('followedUsers', distinct=True),
+            recipe_rows=Count('recipes', distinct=True),
+            post_rows=Count('forumpost', distinct=True),
+        ):
+            self.assertEqual(user.followersCount, user.follower_rows)
+            self.assertEqual(user.followingCount, user.following_rows)
+            self.assertEqual(user.recipeCount, user.recipe_rows)
+            self.assertEqual(user.postCount, user.post_rows)
+        self.assertEqual(
+            sum(RegisteredUser.objects.values_list('commentCount', flat=True)), ForumPostComment.objects.count()
+        )
+
+        for recipe in Recipe.objects.annotate(
+            like_rows=Count('likes', distinct=True), liked_rows=Count('liked_by', distinct=True)
+        ):
+            self.assertEqual(recipe.like_count, recipe.like_rows)
+            self.assertEqual(recipe.like_count, recipe.liked_rows)
+            self.assertEqual(recipe.cost_per_serving, recipe.calculate_cost_per_serving())
+            nutrition = recipe.calculate_nutrition_info()
+            self.assertEqual(recipe.calories, nutrition['calories'])
+            self.assertEqual(recipe.carbs, nutrition['carbs'])
+
+        for post in ForumPost.objects.annotate(
+            up_rows=Count('votes', filter=Q(votes__vote_type='up')),
+            down_rows=Count('votes', filter=Q(votes__vote_type='down')),
+        ):
+            self.assertEqual((post.upvote_count, post.downvote_count), (post.up_rows, post.down_rows))
+
+        self.assertEqual(SystemCounter.objects.get(name='recipes').value, 30)
+
+    def test_comment_paths(self):
+        self.generate()
+        for model in (ForumPostComment, Answer):
+            comments = {comment.pk: comment for comment in model.objects.all()}
+            self.assertTrue(comments)
+            for comment in comments.values():
+                parent = comments.get(comment.parent_comment_id)
+                self.assertEqual(comment.path, comment.build_path() if parent is None else f"{parent.path}{comment.pk:010d}/")
+                self.assertEqual(comment.level, parent.level + 1 if parent else 0)
+                self.assertEqual(comment.post_id, parent.post_id if parent else comment.post_id)
+
+    def test_same_seed_same_data(self):
+        def snapshot():
+            with transaction.atomic():
+                self.generate(seed=7)
+                rows = (
+                    list(Recipe.objects.order_by('pk').values_list('pk', 'creator_id', 'like_count', 'calories')),
+                    list(Follow.objects.order_by('from_registereduser', 'to_registereduser')
+                         .values_list('from_registereduser', 'to_registereduser')),
+                    list(RecipeLike.objects.order_by('recipe', 'user').values_list('recipe', 'user')),
+                )
+                transaction.set_rollback(True)
+            return rows
+
+        self.assertEqual(snapshot(), snapshot())
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            'generate_synthetic_data', '--users', '5', '--recipes', '3', '--posts', '2', '--questions', '1',
+            '--likes-per-recipe', '1.5', '--seed', '3', stdout=out,
+        )
+        self.assertIn('Recipe: 3', out.getvalue())
+        self.assertEqual(RegisteredUser.objects.filter(username__startswith='synthetic3_').count(), 5)
+
+
+class StandardPaginationTests(TestCase):
+
+    def paginate(self, queryset):
+        request = Request(APIRequestFactory().get('/'))
+        paginator = StandardPagination()
+        paginator.paginate_queryset(queryset, request)
+        return paginator.page.paginator.object_list.query.order_by
+
+    def test_defaults_to_created_at(self):
+        # Meta.ordering is not an explicit ordering and is replaced
+        self.assertEqual(self.paginate(Report.objects.all()), ('created_at',))
+
+    def test_keeps_explicit_ordering(self):
+        self.assertEqual(self.paginate(Report.objects.order_by('-id')), ('-id',))
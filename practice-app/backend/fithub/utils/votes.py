@@ -0,0 +1,73 @@
+# utils/votes.py
+# Batch lookup of the current user's votes, shared by forum and q/a
+
+MAX_VOTE_LOOKUP_IDS = 100
+
+
+def parse_id_list(raw_value, limit=MAX_VOTE_LOOKUP_IDS):
+    """Parse "1,2,3" into a list of ints; raises ValueError on bad input"""
+    if not raw_value:
+        return []
+    try:
+        ids = [int(part) for part in raw_value.split(',') if part.strip()]
+    except ValueError:
+        raise ValueError("must be a comma-separated list of integers.")
+    if len(ids) > limit:
+        raise ValueError(f"accepts at most {limit} ids.")
+    return ids
+
+
+def get_user_votes(vote_model, target_field, user, target_ids):
+    """
+    Map target id -> vote type for the user's live votes on the given targets.
+    One query on the vote table, using its user and target foreign key indexes.
+    """
+    if not target_ids or user is None or not user.is_authenticated:
+        return {}
+    return dict(
+        vote_model.objects.filter(
+            user=user,
+            deleted_on__isnull=True,
+            **{f'{target_field}_id__in': target_ids}
+        ).values_list(f'{target_field}_id', 'vote_type')
+    )
+
+
+class MyVoteSerializerMixin:
+    """Adds "my_vote" to each item when the view put my_votes in the context"""
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        my_votes = self.context.get('my_votes')
+        if my_votes is not None:
+            data['my_vote'] = my_votes.get(instance.pk)
+        return data
+
+
+class MyVoteListMixin:
+    """
+    ViewSet mixin: with ?include_my_vote=true, the votes of the requesting user
+    for the current page are fetched in one query and embedded as "my_vote".
+    Views set vote_model and vote_target_field.
+    """
+    vote_model = None
+    vote_target_field = None
+
+    def wants_my_vote(self):
+        value = self.request.query_params.get('include_my_vote', '')
+        return value.lower() in ('1', 'true', 'yes') and self.request.user.is_authenticated
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and self.wants_my_vote():
+            self.my_votes = get_user_votes(
+                self.vote_model, self.vote_target_field, self.request.user,
+                [obj.pk for obj in page]
+            )
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if getattr(self, 'my_votes', None) is not None:
+            context['my_votes'] = self.my_votes
+        return context
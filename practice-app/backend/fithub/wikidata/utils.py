@@ -3,12 +3,15 @@ import requests
 from django.core.cache import cache
 from typing import Optional, Dict, Any
 
+from monitoring.prometheus import record_cache_lookup, time_wikidata_call
+
 def get_wikidata_id(ingredient_name: str) -> Optional[str]:
     """
     Retrieves the Wikidata ID (Q-number) for a given ingredient name, with caching.
     """
     cache_key = f"wikidata_id_{ingredient_name.lower().replace(' ', '_')}"
     wikidata_id = cache.get(cache_key)
+    record_cache_lookup('wikidata_id', wikidata_id is not None)
     if wikidata_id is None:
         url = "https://www.wikidata.org/w/api.php"
         params = {
@@ -19,7 +22,8 @@ def get_wikidata_id(ingredient_name: str) -> Optional[str]:
             'search': ingredient_name,
         }
         try:
-            response = requests.get(url, params=params)
+            with time_wikidata_call('wbsearchentities'):
+                response = requests.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             if data and 'search' in data and data['search']:
@@ -43,6 +47,7 @@ def get_wikidata_details(wikidata_id: str, properties: tuple = ('labels', 'descr
     """
     cache_key = f"wikidata_details_{wikidata_id}"
     details = cache.get(cache_key)
+    record_cache_lookup('wikidata_details', details is not None)
     if details is None:
         url = "https://www.wikidata.org/w/api.php"
         params = {
@@ -53,7 +58,8 @@ def get_wikidata_details(wikidata_id: str, properties: tuple = ('labels', 'descr
             'languages': 'en',  # Specify preferred languages
         }
         try:
-            response = requests.get(url, params=params)
+            with time_wikidata_call('wbgetentities'):
+                response = requests.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             if data and 'entities' in data and wikidata_id in data['entities']:
@@ -40,74 +40,39 @@ export const toggleFollow = async (userId) => {
 /**
  * Get user's followers list
  * @param {number|string} userId - User ID (required)
- * @returns {Promise} Array of follower users (IDs or user objects)
- * 
- * Note: Backend serializer doesn't expose 'followers' field, so we need to
- * find followers by checking all users' followedUsers lists
+ * @returns {Promise} Array of follower users (id, username, profilePhoto, typeOfCook, usertype)
+ *
+ * Reads the paginated /api/users/{id}/followers/ endpoint page by page
  */
 export const getFollowers = async (userId) => {
   try {
     if (!userId) {
       throw new Error("User ID is required");
     }
-    
-    // First check if backend returns followers field (in case it's added later)
-    const userResponse = await api.get(`/api/users/${userId}/`);
-    if (userResponse.data.followers && Array.isArray(userResponse.data.followers)) {
-      // Backend returns followers field
-      return userResponse.data.followers.map(follower => {
-      if (typeof follower === 'number' || typeof follower === 'string') {
-        return { id: Number(follower) };
-      }
-      return follower;
-    });
-    }
-    
-    // Backend doesn't return followers, so we need to find them manually
-    // Get all users and check which ones have this user in their followedUsers list
+
     const followers = [];
     let page = 1;
     let hasMore = true;
-    const targetUserId = Number(userId);
-    
+
     while (hasMore) {
-      try {
-        const response = await api.get(`/api/users/?page=${page}&page_size=100`);
-        const users = response.data.results || [];
-        
-        // Check each user's followedUsers list
-        for (const user of users) {
-          if (user.followedUsers && Array.isArray(user.followedUsers)) {
-            const isFollowing = user.followedUsers.some(followedId => {
-              const id = typeof followedId === 'object' ? followedId.id : followedId;
-              return Number(id) === targetUserId;
-            });
-            
-            if (isFollowing) {
-              // Get typeOfCook from user data already fetched
-              followers.push({
-                id: user.id,
-                username: user.username,
-                profilePhoto: user.profilePhoto,
-                typeOfCook: user.typeOfCook || null,
-                usertype: user.usertype || null
-              });
-            }
-          }
-        }
-        
-        // Check if there are more pages
-        hasMore = response.data.next !== null && users.length > 0;
-        page++;
-        
-        // Safety limit to prevent infinite loops
-        if (page > 100) break;
-      } catch (error) {
-        console.error(`Error fetching users page ${page}:`, error);
-        hasMore = false;
+      const response = await api.get(`/api/users/${userId}/followers/?page=${page}&page_size=100`);
+      const users = response.data.results || [];
+
+      for (const user of users) {
+        followers.push({
+          id: user.id,
+          username: user.username,
+          profilePhoto: user.profilePhoto,
+          typeOfCook: user.typeOfCook || null,
+          usertype: user.usertype || null
+        });
       }
+
+      // Stop once every follower has been read
+      hasMore = users.length > 0 && followers.length < (response.data.total || 0);
+      page++;
     }
-    
+
     return followers;
   } catch (error) {
     console.error('Error fetching followers:', error);